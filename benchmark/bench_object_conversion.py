@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+#
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+#
+"""
+Compares value conversion (qconf output to python values and back) done by
+compiled per-key converters with the original conversion, which scanned
+keyword and key maps for every value. Objects are generated locally, so no
+cluster is needed.
+
+Usage:
+    PYTHONPATH=. python benchmark/bench_object_conversion.py [--rounds=N] [--repeat=N] [--uge-version=VERSION]
+"""
+from __future__ import print_function
+import time
+from optparse import OptionParser
+
+from uge.objects.qconf_object_factory import QconfObjectFactory
+
+
+def legacy_uge_to_py(qconf_object, key, value):
+    """ Conversion from UGE string, as done before converters were compiled. """
+    uppercase_value = value.upper()
+    for (uge_value, py_value) in list(qconf_object.UGE_PYTHON_OBJECT_MAP.items()):
+        if uge_value == uppercase_value:
+            return py_value
+    if key in qconf_object.LIST_KEY_MAP:
+        delimiter = qconf_object.LIST_KEY_MAP.get(key)
+        if value.find(delimiter) > 0:
+            return value.split(delimiter)
+        return [value]
+    elif key in qconf_object.DICT_KEY_MAP:
+        return qconf_object.parse_value_as_dict(key, value)
+    elif key in qconf_object.INT_KEY_MAP:
+        try:
+            return int(value)
+        except:
+            pass
+    elif key in qconf_object.FLOAT_KEY_MAP:
+        try:
+            return float(value)
+        except:
+            pass
+    elif value.find(qconf_object.DEFAULT_LIST_DELIMITER) > 0:
+        return value.split(qconf_object.DEFAULT_LIST_DELIMITER)
+    return value
+
+
+def legacy_py_to_uge(qconf_object, key, value):
+    """ Conversion to UGE string, as done before converters were compiled. """
+    for (uge_value, py_value) in list(qconf_object.UGE_PYTHON_OBJECT_MAP.items()):
+        if value == py_value and type(value) == type(py_value):
+            if key in qconf_object.UGE_CASE_SENSITIVE_KEYS:
+                return qconf_object.UGE_CASE_SENSITIVE_KEYS[key](uge_value)
+            return uge_value
+    if type(value) == list:
+        delimiter = qconf_object.LIST_KEY_MAP.get(key, qconf_object.DEFAULT_LIST_DELIMITER)
+        return delimiter.join(value)
+    elif type(value) == dict:
+        delimiter = qconf_object.DICT_KEY_MAP.get(key, qconf_object.DEFAULT_DICT_DELIMITER)
+        dict_tokens = []
+        for (item_key, item_value) in list(value.items()):
+            dict_tokens.append('%s%s%s' % (item_key, qconf_object.DICT_VALUE_DELIMITER, item_value))
+        return delimiter.join(dict_tokens)
+    return value
+
+
+def get_queue_items(uge_version):
+    queue = QconfObjectFactory.generate_cluster_queue(uge_version, name='all.q')
+    queue.data['hostlist'] = ['@allhosts']
+    queue.data['slots'] = ['32']
+    queue.data['complex_values'] = ['mem=4G', 'gpu=2']
+    queue.data['user_lists'] = ['arusers', 'staff']
+    lines = queue.to_uge().rstrip('\n').split('\n')
+    return (queue, [tuple(line.split(' ', 1)) for line in lines], list(queue.data.items()))
+
+
+def best_time(function, n_rounds, n_repeat):
+    best = None
+    for _ in range(n_repeat):
+        start = time.time()
+        for _ in range(n_rounds):
+            function()
+        elapsed = (time.time() - start) / n_rounds
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def run():
+    parser = OptionParser()
+    parser.add_option('', '--rounds', dest='rounds', type='int', default=1000,
+                      help='Number of objects converted per measurement (default: 1000).')
+    parser.add_option('', '--repeat', dest='repeat', type='int', default=5,
+                      help='Number of measurements; the best one is reported (default: 5).')
+    parser.add_option('', '--uge-version', dest='uge_version', default='8.5.4',
+                      help='UGE version (default: 8.5.4).')
+    (options, _) = parser.parse_args()
+
+    (queue, uge_items, py_items) = get_queue_items(options.uge_version)
+    for (key, value) in uge_items:
+        assert legacy_uge_to_py(queue, key, value) == queue.uge_to_py(key, value), key
+    for (key, value) in py_items:
+        assert legacy_py_to_uge(queue, key, value) == queue.py_to_uge(key, value), key
+
+    benchmarks = [
+        ('parse (uge_to_py)',
+         lambda: [legacy_uge_to_py(queue, key, value) for (key, value) in uge_items],
+         lambda: [queue.uge_to_py(key, value) for (key, value) in uge_items]),
+        ('format (py_to_uge)',
+         lambda: [legacy_py_to_uge(queue, key, value) for (key, value) in py_items],
+         lambda: [queue.py_to_uge(key, value) for (key, value) in py_items]),
+        ('to_uge',
+         lambda: ''.join(['%s %s\n' % (key, legacy_py_to_uge(queue, key, value)) for (key, value) in py_items]),
+         queue.to_uge),
+    ]
+    print('ClusterQueue with %s keys, best of %s x %s rounds' % (len(py_items), options.repeat, options.rounds))
+    for (name, legacy_function, compiled_function) in benchmarks:
+        legacy_time = best_time(legacy_function, options.rounds, options.repeat)
+        compiled_time = best_time(compiled_function, options.rounds, options.repeat)
+        print('  %-20s: %7.1f us/object before, %7.1f us/object after (%.1fx)' % (
+            name, legacy_time * 1e6, compiled_time * 1e6, legacy_time / compiled_time))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+#
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+#
+"""
+Measures memory used by parsed objects kept in memory, e.g. by long-running
+services that hold all execution hosts, queues and users of a large cluster.
+Objects are parsed from generated qconf output, so no cluster is needed.
+
+Usage:
+    PYTHONPATH=. python benchmark/bench_object_memory.py [--objects=N] [--uge-version=VERSION]
+"""
+from __future__ import print_function
+import gc
+import time
+import tracemalloc
+from optparse import OptionParser
+
+from uge.objects.qconf_object_factory import QconfObjectFactory
+
+EXECUTION_HOST_TEMPLATE = """hostname node%(i)05d.cluster.example.com
+load_scaling NONE
+complex_values slots=32,mem_total=256G,gpu=4
+load_values arch=lx-amd64,num_proc=32,mem_total=257842.000000M,swap_total=8191.996094M,virtual_total=266034.000000M,load_avg=%(i)s.000000,np_load_avg=0.%(i)02d,cpu=%(i)s.000000
+processors 32
+user_lists NONE
+xuser_lists NONE
+projects NONE
+xprojects NONE
+usage_scaling NONE
+report_variables NONE
+license_constraints NONE
+license_oversubscription NONE
+"""
+
+USER_TEMPLATE = """name user%(i)05d
+oticket 0
+fshare 0
+delete_time 0
+default_project NONE
+"""
+
+
+def get_queue_template(uge_version):
+    queue = QconfObjectFactory.generate_cluster_queue(uge_version, name='queue%(i)05d.q')
+    queue.data['hostlist'] = ['@allhosts']
+    queue.data['slots'] = ['32']
+    return queue.to_uge().replace('%', '%%').replace('%%(i)05d', '%(i)05d')
+
+
+def measure(generate_object, template, n_objects):
+    texts = [template % {'i': i} for i in range(n_objects)]
+    gc.collect()
+    tracemalloc.start()
+    start = time.time()
+    object_list = []
+    for text in texts:
+        pycl_object = generate_object()
+        pycl_object.set_data_dict_from_qconf_output(text)
+        object_list.append(pycl_object)
+    parse_time = time.time() - start
+    gc.collect()
+    (used, _) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (used, parse_time, object_list)
+
+
+def run():
+    parser = OptionParser()
+    parser.add_option('', '--objects', dest='objects', type='int', default=10000,
+                      help='Number of objects of each class (default: 10000).')
+    parser.add_option('', '--uge-version', dest='uge_version', default='8.5.4',
+                      help='UGE version (default: 8.5.4).')
+    (options, _) = parser.parse_args()
+
+    uge_version = options.uge_version
+    benchmarks = [
+        ('ExecutionHost', QconfObjectFactory.generate_execution_host, EXECUTION_HOST_TEMPLATE),
+        ('ClusterQueue', QconfObjectFactory.generate_cluster_queue, get_queue_template(uge_version)),
+        ('User', QconfObjectFactory.generate_user, USER_TEMPLATE),
+    ]
+    print('%s objects of each class' % options.objects)
+    for (class_name, factory_method, template) in benchmarks:
+        (used, parse_time, _) = measure(lambda: factory_method(uge_version, add_required_data=False),
+                                        template, options.objects)
+        print('  %-14s: %8.1f MB, %6d bytes/object, %6.1f us/object' % (
+            class_name, used / 1048576.0, used / options.objects, parse_time * 1e6 / options.objects))
+
+
+if __name__ == '__main__':
+    run()
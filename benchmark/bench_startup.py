@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+#
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+#
+"""
+Reports time needed to import uge.api.qconf_api and to construct QconfApi
+object, measured in a fresh interpreter for every round, together with the
+number of uge modules loaded at that point and the slowest uge imports (as
+reported by python -X importtime). If SGE_ROOT is not set, a fake cell whose
+qconf only reports UGE version is created with the test helpers (see
+test/utils.py), so no cluster is needed.
+
+Usage:
+    PYTHONPATH=. python benchmark/bench_startup.py [--rounds=N] [--top=N]
+"""
+from __future__ import print_function
+import json
+import os
+import subprocess
+import sys
+from optparse import OptionParser
+
+from test.utils import create_fake_sge_root
+from test.utils import create_qconf_script
+from test.utils import remove_fake_sge_root
+
+STARTUP_SCRIPT = """
+import json
+import sys
+import time
+
+t0 = time.time()
+from uge.api.qconf_api import QconfApi
+t1 = time.time()
+api = QconfApi(sge_root=sys.argv[1], sge_cell=sys.argv[2])
+t2 = time.time()
+print(json.dumps({
+    'import_ms': (t1 - t0) * 1000,
+    'construction_ms': (t2 - t1) * 1000,
+    'n_modules': len([m for m in sys.modules if m == 'uge' or m.startswith('uge.')]),
+}))
+"""
+
+
+def run_startup_script(sge_root, sge_cell, python_args=[]):
+    process = subprocess.Popen([sys.executable] + python_args + ['-c', STARTUP_SCRIPT, sge_root, sge_cell],
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    (stdout, stderr) = process.communicate()
+    if process.returncode != 0:
+        raise Exception('Startup script failed: %s' % stderr.decode())
+    return (json.loads(stdout.decode().strip().split('\n')[-1]), stderr.decode())
+
+
+def get_slowest_imports(importtime_output, n_imports):
+    """ Parse python -X importtime output, and return slowest uge modules by cumulative time. """
+    import_dict = {}
+    for line in importtime_output.split('\n'):
+        tokens = line.split('|')
+        if len(tokens) != 3 or not tokens[1].strip().isdigit():
+            continue
+        module_name = tokens[2].strip()
+        if module_name == 'uge' or module_name.startswith('uge.'):
+            import_dict[module_name] = max(import_dict.get(module_name, 0), int(tokens[1]) / 1000.0)
+    return sorted([(t, m) for (m, t) in import_dict.items()], reverse=True)[:n_imports]
+
+
+def median(value_list):
+    value_list = sorted(value_list)
+    return value_list[len(value_list) // 2]
+
+
+def run():
+    parser = OptionParser()
+    parser.add_option('', '--rounds', dest='rounds', type='int', default=10,
+                      help='Number of measured interpreter starts (default: 10).')
+    parser.add_option('', '--top', dest='top', type='int', default=10,
+                      help='Number of slowest uge imports reported (default: 10).')
+    (options, _) = parser.parse_args()
+
+    sge_root = os.environ.get('SGE_ROOT')
+    sge_cell = os.environ.get('SGE_CELL', 'default')
+    fake_sge_root = None
+    if not sge_root:
+        # Same fake cell as used by test_startup
+        fake_sge_root = sge_root = create_fake_sge_root(create_qconf_script({}))
+    try:
+        # The first start populates version cache and byte code
+        run_startup_script(sge_root, sge_cell)
+        result_list = [run_startup_script(sge_root, sge_cell)[0] for _ in range(options.rounds)]
+        slowest_imports = []
+        if sys.version_info >= (3, 7):
+            (_, importtime_output) = run_startup_script(sge_root, sge_cell, python_args=['-X', 'importtime'])
+            slowest_imports = get_slowest_imports(importtime_output, options.top)
+    finally:
+        if fake_sge_root:
+            remove_fake_sge_root(fake_sge_root)
+
+    print('QconfApi startup, median of %s rounds' % options.rounds)
+    print('  import       : %8.2f ms' % median([r['import_ms'] for r in result_list]))
+    print('  construction : %8.2f ms' % median([r['construction_ms'] for r in result_list]))
+    print('  uge modules  : %8d' % result_list[0]['n_modules'])
+    if slowest_imports:
+        print('Slowest uge imports (cumulative):')
+        for (import_ms, module_name) in slowest_imports:
+            print('  %8.2f ms  %s' % (import_ms, module_name))
+
+
+if __name__ == '__main__':
+    run()
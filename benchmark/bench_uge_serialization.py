@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+#
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+#
+"""
+Compares serialization of large objects into qconf input format done by
+streaming lines (to_uge(), write_uge()) with the original serialization,
+which built the whole string with repeated concatenation. A complex
+configuration with many attributes and a share tree with many nodes are
+generated locally, so no cluster is needed.
+
+Usage:
+    PYTHONPATH=. python benchmark/bench_uge_serialization.py [--size=N] [--repeat=N] [--uge-version=VERSION]
+"""
+from __future__ import print_function
+import os
+import tempfile
+import time
+from optparse import OptionParser
+
+from uge.objects.qconf_object_factory import QconfObjectFactory
+
+COMPLEX_KEYS = ['shortcut', 'type', 'relop', 'requestable', 'consumable', 'default', 'urgency', 'aapre',
+                'affinity', 'do_report', 'is_static']
+
+
+def legacy_complex_to_uge(cconf):
+    """ Serialization of complex configuration, as done before lines were streamed. """
+    lines = ''
+    lines += '#name               shortcut   type        relop requestable consumable default  urgency aapre affinity do_report is_static\n'
+    lines += '#------------------------------------------------------------------------------------------------------\n'
+    for (key, value_dict) in list(cconf.data.items()):
+        lines += '%s' % (key)
+        for key2 in COMPLEX_KEYS:
+            lines += ' %s' % (cconf.py_to_uge(key2, value_dict[key2], value_dict.get('default_is_bool', False)))
+        lines += '\n'
+    return lines
+
+
+def legacy_stree_to_uge(stree):
+    """ Serialization of share tree, as done before lines were streamed. """
+    lines = ''
+    for d in stree.data:
+        for key in ['id', 'name', 'type', 'shares', 'childnodes']:
+            value = d.get(key)
+            lines += '%s%s%s\n' % (key, stree.KEY_VALUE_DELIMITER, stree.py_to_uge(key, value))
+    return lines
+
+
+def generate_complex(uge_version, size):
+    data = {}
+    for i in range(size):
+        data['attr%05d' % i] = {
+            'shortcut': 'a%05d' % i, 'type': 'INT', 'relop': '<=', 'requestable': True, 'consumable': i % 2 == 0,
+            'default': '0', 'urgency': 0, 'aapre': False, 'affinity': '0.000000', 'do_report': False,
+            'is_static': False}
+    return QconfObjectFactory.generate_complex_configuration(uge_version, data=data, add_required_data=False)
+
+
+def generate_share_tree(uge_version, size):
+    # Root with 100 projects, users evenly distributed among projects
+    n_projects = 100
+    data = [{'id': 0, 'name': 'Root', 'type': 0, 'shares': 1,
+             'childnodes': ['%s' % (i + 1) for i in range(n_projects)]}]
+    for i in range(n_projects):
+        user_ids = range(n_projects + 1 + i, size, n_projects)
+        data.append({'id': i + 1, 'name': 'P%s' % i, 'type': 1, 'shares': 10,
+                     'childnodes': ['%s' % user_id for user_id in user_ids] or None})
+    for user_id in range(n_projects + 1, size):
+        data.append({'id': user_id, 'name': 'user%s' % user_id, 'type': 0, 'shares': 1, 'childnodes': None})
+    return QconfObjectFactory.generate_share_tree(uge_version, data=data, add_required_data=False)
+
+
+def best_time(function, n_repeat):
+    best = None
+    for _ in range(n_repeat):
+        start = time.time()
+        function()
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def write_string(filename, get_string):
+    with open(filename, 'w') as f:
+        f.write(get_string())
+
+
+def write_lines(filename, pycl_object):
+    with open(filename, 'w') as f:
+        pycl_object.write_uge(f)
+
+
+def run():
+    parser = OptionParser()
+    parser.add_option('', '--size', dest='size', type='int', default=10000,
+                      help='Number of complex attributes and share tree nodes (default: 10000).')
+    parser.add_option('', '--repeat', dest='repeat', type='int', default=5,
+                      help='Number of measurements; the best one is reported (default: 5).')
+    parser.add_option('', '--uge-version', dest='uge_version', default='8.5.4',
+                      help='UGE version (default: 8.5.4).')
+    (options, _) = parser.parse_args()
+
+    benchmarks = [
+        ('ComplexConfiguration', generate_complex(options.uge_version, options.size), legacy_complex_to_uge),
+        ('ShareTree', generate_share_tree(options.uge_version, options.size), legacy_stree_to_uge),
+    ]
+    (fd, filename) = tempfile.mkstemp(prefix='bench_uge_serialization_')
+    os.close(fd)
+    try:
+        print('%s complex attributes / share tree nodes, best of %s' % (options.size, options.repeat))
+        for (class_name, pycl_object, legacy_to_uge) in benchmarks:
+            assert legacy_to_uge(pycl_object) == pycl_object.to_uge()
+            timings = [
+                ('to_uge', best_time(lambda: legacy_to_uge(pycl_object), options.repeat),
+                 best_time(pycl_object.to_uge, options.repeat)),
+                ('write to file', best_time(lambda: write_string(filename, lambda: legacy_to_uge(pycl_object)),
+                                            options.repeat),
+                 best_time(lambda: write_lines(filename, pycl_object), options.repeat)),
+            ]
+            for (name, legacy_time, streamed_time) in timings:
+                print('  %-20s %-14s: %7.1f ms before, %7.1f ms after' % (
+                    class_name, name, legacy_time * 1e3, streamed_time * 1e3))
+    finally:
+        os.remove(filename)
+
+
+if __name__ == '__main__':
+    run()
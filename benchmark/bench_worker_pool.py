@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+#
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+#
+"""
+Compares per-call latency of qconf commands run in a new shell for every
+call with latency of the same commands run by persistent shell workers.
+
+Usage (SGE_ROOT must point to a running UGE cluster):
+    PYTHONPATH=. python benchmark/bench_worker_pool.py [--calls=N] [--workers=N] [--command=QCONF_ARGS]
+"""
+from __future__ import print_function
+import os
+import time
+from optparse import OptionParser
+
+from uge.api.impl.qconf_executor import QconfExecutor
+
+
+def time_calls(executor, command, n_calls):
+    start = time.time()
+    for _ in range(n_calls):
+        executor.execute_qconf(command)
+    return (time.time() - start) / n_calls
+
+
+def run():
+    parser = OptionParser()
+    parser.add_option('', '--calls', dest='calls', type='int', default=100,
+                      help='Number of qconf calls (default: 100).')
+    parser.add_option('', '--workers', dest='workers', type='int', default=1,
+                      help='Number of persistent workers (default: 1).')
+    parser.add_option('', '--command', dest='command', default='-sh',
+                      help='Qconf arguments (default: -sh).')
+    (options, _) = parser.parse_args()
+
+    sge_root = os.environ['SGE_ROOT']
+    sge_cell = os.environ.get('SGE_CELL', 'default')
+    sge_qmaster_port = os.environ.get('SGE_QMASTER_PORT', 6444)
+    sge_execd_port = os.environ.get('SGE_EXECD_PORT', 6445)
+
+    executor = QconfExecutor(sge_root, sge_cell, sge_qmaster_port, sge_execd_port)
+    pooled_executor = QconfExecutor(sge_root, sge_cell, sge_qmaster_port, sge_execd_port,
+                                    worker_pool_size=options.workers)
+    try:
+        shell_time = time_calls(executor, options.command, options.calls)
+        pool_time = time_calls(pooled_executor, options.command, options.calls)
+    finally:
+        pooled_executor.close()
+
+    print('qconf %s, %s calls' % (options.command, options.calls))
+    print('  new shell per call : %8.2f ms/call' % (shell_time * 1000))
+    print('  worker pool        : %8.2f ms/call' % (pool_time * 1000))
+    print('  saving             : %8.2f ms/call (%.1f%%)' % (
+        (shell_time - pool_time) * 1000, 100 * (shell_time - pool_time) / shell_time))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# 
+# ___INFO__MARK_BEGIN__ 
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__ 
+# 
+# 
+import asyncio
+import os
+import re
+import shutil
+import tempfile
+
+from .utils import create_config_file
+
+from uge.api.impl.async_executor import AsyncExecutor
+from uge.utility.uge_environment import UgeEnvironment
+from uge.exceptions.command_failed import CommandFailed
+from uge.exceptions.invalid_argument import InvalidArgument
+from uge.exceptions.object_not_found import ObjectNotFound
+
+create_config_file()
+SGE_ROOT = tempfile.mkdtemp(prefix='async_executor_')
+SGE_CELL = 'default'
+BIN_DIR = os.path.join(SGE_ROOT, 'bin')
+ENV_DICT = {'SGE_ROOT': SGE_ROOT, 'SGE_CELL': SGE_CELL}
+ERROR_REGEX_LIST = [(re.compile('.*does not exist.*'), ObjectNotFound)]
+
+
+def setup_module():
+    os.makedirs(os.path.join(SGE_ROOT, SGE_CELL, 'common'))
+    os.makedirs(BIN_DIR)
+    with open(UgeEnvironment.get_settings_file(SGE_ROOT, SGE_CELL), 'w') as f:
+        f.write('PATH=%s:$PATH; export PATH\n' % BIN_DIR)
+    command_path = os.path.join(BIN_DIR, 'qconf')
+    with open(command_path, 'w') as f:
+        f.write('#!/bin/sh\n'
+                'if [ "$1" = "-sq" -a "$2" = "missing.q" ]; then echo "$2 does not exist" >&2; exit 1; fi\n'
+                'if [ "$1" = "-fail" ]; then echo "failed" >&2; exit 2; fi\n'
+                'for arg in "$@"; do echo "[$arg]"; done\n')
+    os.chmod(command_path, 0o755)
+    UgeEnvironment.clear_cache()
+
+
+def teardown_module():
+    UgeEnvironment.clear_cache()
+    shutil.rmtree(SGE_ROOT)
+
+
+def check_error(error, exit_status, error_regex_list=[], error_details=None, failure_regex_list=[]):
+    # Same classification as QconfExecutor.check_qconf_error(), without the generic qconf patterns
+    if exit_status != 0:
+        for (pattern, exClass) in error_regex_list:
+            if pattern.match(error):
+                raise exClass(error, error_details=error_details)
+        raise CommandFailed(error, command_stderr=error, command_exit_status=exit_status)
+
+
+def run(coroutine):
+    return asyncio.get_event_loop().run_until_complete(coroutine)
+
+
+def test_execute():
+    executor = AsyncExecutor(ENV_DICT, 'qconf', check_error)
+    assert (run(executor.execute(['-sq', 'my queue'])) == '[-sq]\n[my queue]\n')
+    assert (run(executor.execute('-sq "my queue"')) == '[-sq]\n[my queue]\n')
+
+
+def test_concurrent_execution():
+    executor = AsyncExecutor(ENV_DICT, 'qconf', check_error, max_processes=4)
+
+    async def execute_all():
+        return await asyncio.gather(*[executor.execute(['-sq', 'q%s' % i]) for i in range(20)])
+
+    results = run(execute_all())
+    assert (results == ['[-sq]\n[q%s]\n' % i for i in range(20)])
+
+
+def test_error_classification():
+    executor = AsyncExecutor(ENV_DICT, 'qconf', check_error)
+    try:
+        run(executor.execute(['-sq', 'missing.q'], ERROR_REGEX_LIST))
+        assert (False)
+    except ObjectNotFound as ex:
+        pass
+    try:
+        run(executor.execute(['-fail'], ERROR_REGEX_LIST))
+        assert (False)
+    except CommandFailed as ex:
+        assert (ex.get_command_exit_status() == 2)
+
+
+def test_invalid_max_processes():
+    try:
+        AsyncExecutor(ENV_DICT, 'qconf', check_error, max_processes=0)
+        assert (False)
+    except InvalidArgument as ex:
+        pass
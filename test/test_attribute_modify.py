@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# 
+# ___INFO__MARK_BEGIN__ 
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__ 
+# 
+# 
+import os
+import tempfile
+
+from .utils import create_config_file
+from .utils import create_fake_sge_root
+from .utils import remove_fake_sge_root
+
+from uge.api.qconf_api import QconfApi
+
+create_config_file()
+SGE_ROOT = tempfile.mkdtemp(prefix='attribute_modify_')
+SGE_CELL = 'default'
+LOG_FILE = os.path.join(SGE_ROOT, 'qconf.log')
+HGRP_FILE = os.path.join(SGE_ROOT, 'hgrp')
+HOST_LIST = ['host%s' % i for i in range(5000)]
+
+# Fake qconf: logs its arguments, and prints stored objects
+QCONF_SCRIPT = """#!/bin/sh
+echo "$@" >> %s
+case "$1" in
+    -help) echo "UGE 8.5.4";;
+    -shgrp) cat %s;;
+    -se) printf 'hostname h1\\ncomplex_values slots=4,gpu=2\\nload_values arch=lx-amd64,np_load_avg=0.5\\n';;
+    -sq) printf 'qname all.q\\nslots 1,[h1=4]\\ntmpdir /tmp,[@gpu=/scratch]\\nprolog NONE\\n';;
+esac
+"""
+
+
+def write_host_group(host_list):
+    with open(HGRP_FILE, 'w') as f:
+        f.write('group_name @allhosts\nhostlist %s\n' % ' '.join(host_list))
+
+
+def setup_module():
+    create_fake_sge_root(QCONF_SCRIPT % (LOG_FILE, HGRP_FILE), sge_root=SGE_ROOT)
+    write_host_group(HOST_LIST)
+
+
+def teardown_module():
+    remove_fake_sge_root(SGE_ROOT)
+
+
+def get_write_commands(modify_method, **kwargs):
+    if os.path.exists(LOG_FILE):
+        os.remove(LOG_FILE)
+    modify_method(**kwargs)
+    with open(LOG_FILE) as f:
+        return [line.strip() for line in f if not line.startswith('-s') and not line.startswith('-help')]
+
+
+def get_api():
+    return QconfApi(sge_root=SGE_ROOT, sge_cell=SGE_CELL)
+
+
+def test_add_host_to_host_group():
+    commands = get_write_commands(get_api().modify_hgrp, name='@allhosts', data={'hostlist': HOST_LIST + ['new_host']})
+    assert (commands == ['-aattr hostgroup hostlist new_host @allhosts'])
+
+
+def test_remove_host_from_host_group():
+    commands = get_write_commands(get_api().modify_hgrp, name='@allhosts', data={'hostlist': HOST_LIST[1:]})
+    assert (commands == ['-dattr hostgroup hostlist host0 @allhosts'])
+
+
+def test_unchanged_object_is_not_written():
+    api = get_api()
+    commands = get_write_commands(api.modify_hgrp, name='@allhosts', data={'hostlist': HOST_LIST})
+    assert (commands == [])
+    assert ('modified_on' in api.modify_hgrp(name='@allhosts', data={'hostlist': HOST_LIST}).metadata)
+
+
+def test_modify_ignores_cached_object():
+    api = QconfApi(sge_root=SGE_ROOT, sge_cell=SGE_CELL, cache_ttl=300)
+    try:
+        write_host_group(['h1', 'h2'])
+        assert (api.get_hgrp('@allhosts').data['hostlist'] == ['h1', 'h2'])
+        # Host is removed outside of this API instance
+        write_host_group(['h1'])
+        commands = get_write_commands(api.modify_hgrp, name='@allhosts', data={'hostlist': ['h1', 'h2']})
+        assert (commands == ['-aattr hostgroup hostlist h2 @allhosts'])
+    finally:
+        write_host_group(HOST_LIST)
+
+
+def test_modify_complex_values():
+    commands = get_write_commands(get_api().modify_ehost, name='h1',
+                                  data={'complex_values': ['slots=8', 'mem=16G'],
+                                        'load_values': ['arch=lx-amd64', 'np_load_avg=0.9']})
+    assert (len(commands) == 1)
+    assert (commands[0].startswith('-Me '))
+
+
+def test_modify_single_complex_value():
+    commands = get_write_commands(get_api().modify_ehost, name='h1', data={'complex_values': ['slots=8', 'gpu=2']})
+    assert (commands == ['-mattr exechost complex_values slots=8 h1'])
+
+
+def test_host_specific_values_replace_object():
+    commands = get_write_commands(get_api().modify_queue, name='all.q', data={'slots': ['2', '[h1=4]']})
+    assert (len(commands) == 1)
+    assert (commands[0].startswith('-Mq '))
+
+
+def test_host_specific_scalar_values_replace_object():
+    commands = get_write_commands(get_api().modify_queue, name='all.q', data={'tmpdir': '/tmp2'})
+    assert (len(commands) == 1)
+    assert (commands[0].startswith('-Mq '))
+    commands = get_write_commands(get_api().modify_queue, name='all.q', data={'prolog': '/bin/true,[@gpu=/bin/false]'})
+    assert (len(commands) == 1)
+    assert (commands[0].startswith('-Mq '))
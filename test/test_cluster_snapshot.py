@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# 
+# ___INFO__MARK_BEGIN__ 
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__ 
+# 
+# 
+import os
+import tempfile
+
+from .utils import create_config_file
+from .utils import create_fake_sge_root
+from .utils import remove_fake_sge_root
+
+from uge.api.qconf_api import QconfApi
+from uge.api.impl.cluster_snapshot import ClusterSnapshot
+from uge.exceptions.invalid_argument import InvalidArgument
+
+create_config_file()
+SGE_ROOT = tempfile.mkdtemp(prefix='cluster_snapshot_')
+SGE_CELL = 'default'
+LOG_FILE = os.path.join(SGE_ROOT, 'qconf.log')
+
+# Fake qconf: host group changes after it is read for the first time,
+# and host load values change every time hosts are read
+QCONF_SCRIPT = """#!/bin/sh
+echo "$@" >> %s
+n=$(grep -c -- "^$1" %s)
+case "$1" in
+    -help) echo "UGE 8.5.4";;
+    -shgrpld) if [ $n -eq 1 ]; then printf 'group_name @a\\nhostlist h1\\n';
+              else printf 'group_name @a\\nhostlist h1 h2\\n'; fi;;
+    -seld) printf 'hostname h1\\nload_scaling NONE\\ncomplex_values NONE\\nload_values np_load_avg=0.%%s\\n' $n;;
+    -sm) echo root; echo admin;;
+esac
+"""
+SNAPSHOT_CLASSES = ['ExecutionHost', 'HostGroup', 'Manager']
+
+
+def setup_module():
+    create_fake_sge_root(QCONF_SCRIPT % (LOG_FILE, LOG_FILE), sge_root=SGE_ROOT)
+
+
+def teardown_module():
+    remove_fake_sge_root(SGE_ROOT)
+
+
+def get_read_counts():
+    with open(LOG_FILE) as f:
+        commands = [line.strip() for line in f]
+    return dict([(command, commands.count(command)) for command in ['-shgrpld', '-seld', '-sm']])
+
+
+def test_snapshot_rereads_changed_classes():
+    if os.path.exists(LOG_FILE):
+        os.remove(LOG_FILE)
+    api = QconfApi(sge_root=SGE_ROOT, sge_cell=SGE_CELL)
+    snapshot = api.snapshot(classes=SNAPSHOT_CLASSES)
+    assert (snapshot.get_summary() == {'ExecutionHost': 1, 'HostGroup': 1, 'Manager': 1})
+    assert (snapshot.get_objects('HostGroup')[0].data['hostlist'] == ['h1', 'h2'])
+    assert (snapshot.get_objects('Manager')[0].data == ['root', 'admin'])
+    # Changing load values do not cause host to be read again
+    assert (get_read_counts() == {'-shgrpld': 3, '-seld': 2, '-sm': 2})
+
+
+def test_write_and_read_snapshot():
+    api = QconfApi(sge_root=SGE_ROOT, sge_cell=SGE_CELL)
+    snapshot = api.snapshot(classes=SNAPSHOT_CLASSES, verify=False)
+    for filename in ['snapshot.json', 'snapshot.json.gz']:
+        path = os.path.join(SGE_ROOT, filename)
+        snapshot.write(path)
+        snapshot2 = api.read_snapshot(path)
+        assert (snapshot2.uge_version == snapshot.uge_version)
+        assert (snapshot2.metadata['created_by'] == snapshot.metadata['created_by'])
+        for class_name in SNAPSHOT_CLASSES:
+            assert (ClusterSnapshot.get_fingerprint(snapshot2.get_objects(class_name)) ==
+                    ClusterSnapshot.get_fingerprint(snapshot.get_objects(class_name)))
+    assert (snapshot2.get_objects('Manager')[0].__class__.__name__ == 'QconfNameList')
+
+
+def test_read_invalid_snapshot():
+    path = os.path.join(SGE_ROOT, 'invalid.json')
+    with open(path, 'w') as f:
+        f.write('{"object_class": "HostGroup"}\n')
+    try:
+        ClusterSnapshot.read(path)
+        assert (False)
+    except InvalidArgument as ex:
+        pass
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# 
+# ___INFO__MARK_BEGIN__ 
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__ 
+# 
+# 
+import os
+import tempfile
+
+from .utils import create_config_file
+from .utils import create_fake_sge_root
+from .utils import create_qconf_script
+from .utils import remove_fake_sge_root
+from .utils import write_bulk_objects
+
+from uge.api.qconf_api import QconfApi
+from uge.api.impl.drift_detector import DriftDetector
+from uge.exceptions.invalid_argument import InvalidArgument
+
+create_config_file()
+SGE_ROOT = tempfile.mkdtemp(prefix='drift_detector_')
+SGE_CELL = 'default'
+HGRP_FILE = os.path.join(SGE_ROOT, 'hgrp')
+EHOST_FILE = os.path.join(SGE_ROOT, 'ehost')
+
+
+def setup_module():
+    create_fake_sge_root(create_qconf_script({'-shgrpld': HGRP_FILE, '-seld': EHOST_FILE}), sge_root=SGE_ROOT)
+
+
+def teardown_module():
+    remove_fake_sge_root(SGE_ROOT)
+
+
+def test_detect_drift():
+    write_bulk_objects(HGRP_FILE, ['group_name @a\nhostlist h1\n', 'group_name @b\nhostlist h2\n'])
+    write_bulk_objects(EHOST_FILE, ['hostname h1\ncomplex_values NONE\nload_values np_load_avg=0.1\n'])
+    api = QconfApi(sge_root=SGE_ROOT, sge_cell=SGE_CELL)
+    baseline = api.get_fingerprints(classes=['HostGroup', 'ExecutionHost'])
+    assert (sorted(baseline.keys()) == [('ExecutionHost', 'h1'), ('HostGroup', '@a'), ('HostGroup', '@b')])
+
+    # Load values are not configuration
+    write_bulk_objects(EHOST_FILE, ['hostname h1\ncomplex_values NONE\nload_values np_load_avg=0.9\n'])
+    assert (api.detect_drift(baseline).is_empty())
+
+    write_bulk_objects(HGRP_FILE, ['group_name @a\nhostlist h1 h3\n', 'group_name @c\nhostlist h2\n'])
+    write_bulk_objects(EHOST_FILE, ['hostname h1\ncomplex_values slots=4\nload_values np_load_avg=0.9\n'])
+    report = api.detect_drift(baseline)
+    assert (report.added == [('HostGroup', '@c')])
+    assert (report.removed == [('HostGroup', '@b')])
+    assert (report.changed == [('ExecutionHost', 'h1'), ('HostGroup', '@a')])
+    assert (api.detect_drift(report.fingerprint_dict).is_empty())
+
+
+def test_snapshot_baseline():
+    write_bulk_objects(HGRP_FILE, ['group_name @a\nhostlist h1\n'])
+    api = QconfApi(sge_root=SGE_ROOT, sge_cell=SGE_CELL)
+    snapshot_file = os.path.join(SGE_ROOT, 'snapshot.json')
+    api.snapshot(snapshot_file, classes=['HostGroup'])
+    detector = DriftDetector(api, classes=['HostGroup'])
+    detector.set_baseline(api.read_snapshot(snapshot_file))
+    assert (detector.check().is_empty())
+    write_bulk_objects(HGRP_FILE, ['group_name @a\nhostlist h1 h2\n'])
+    report = detector.check()
+    assert (report.changed == [('HostGroup', '@a')])
+    assert (detector.check().is_empty())
+    assert (api.detect_drift(report.fingerprint_dict).is_empty())
+
+
+def test_fingerprints_do_not_parse_objects():
+    write_bulk_objects(HGRP_FILE, ['group_name @a\nhostlist h1\n', 'group_name @b\nhostlist h2\n'])
+    api = QconfApi(sge_root=SGE_ROOT, sge_cell=SGE_CELL)
+    manager = api.host_group_manager
+    parsed_blocks = []
+    iter_bulk_output = manager.iter_bulk_output
+    manager.iter_bulk_output = lambda lines: parsed_blocks.append(lines) or iter_bulk_output(lines)
+    baseline = api.get_fingerprints(classes=['HostGroup'])
+    assert (sorted(baseline.keys()) == [('HostGroup', '@a'), ('HostGroup', '@b')])
+    assert (api.detect_drift(baseline).is_empty())
+    assert (parsed_blocks == [])
+
+
+def test_unsupported_class():
+    try:
+        DriftDetector(None, classes=['NoSuchClass'])
+        assert (False)
+    except InvalidArgument as ex:
+        pass
@@ -104,6 +104,29 @@ def test_get_ehosts():
         assert (eh.data['hostname'] in ehl)
 
 
+def test_iter_ehosts():
+    ehosts = API.get_ehosts()
+    n_ehosts = 0
+    for eh in API.iter_objects('ExecutionHost'):
+        assert (eh.data == ehosts[n_ehosts].data)
+        n_ehosts += 1
+    assert (n_ehosts == len(ehosts))
+
+
+def test_prefetch_ehosts():
+    ehl = [eh.data['hostname'] for eh in API.get_ehosts()]
+    if not len(ehl):
+        raise SkipTest('There are no configured UGE execution hosts.')
+    cached_api = QconfApi(cache_ttl=60, cache_size=len(ehl))
+    n_cached_dict = cached_api.prefetch(classes=['ExecutionHost'])
+    assert (n_cached_dict['ExecutionHost'] == len(ehl))
+    for name in ehl:
+        eh = cached_api.get_ehost(name)
+        assert (eh.data == API.get_ehost(name).data)
+    assert (cached_api.get_cache_stats()['hits'] == len(ehl))
+    assert (cached_api.get_cache_stats()['misses'] == 0)
+
+
 def test_write_ehosts():
     try:
         tdir = tempfile.mkdtemp()
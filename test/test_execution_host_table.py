@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# 
+# ___INFO__MARK_BEGIN__ 
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__ 
+# 
+# 
+import math
+import os
+import tempfile
+from array import array
+
+from .utils import create_config_file
+from .utils import create_fake_sge_root
+from .utils import create_qconf_script
+from .utils import remove_fake_sge_root
+from .utils import write_bulk_objects
+
+from uge.api.qconf_api import QconfApi
+from uge.api.impl.execution_host_table import ExecutionHostTable
+from uge.exceptions.invalid_argument import InvalidArgument
+from uge.exceptions.object_not_found import ObjectNotFound
+
+create_config_file()
+SGE_ROOT = tempfile.mkdtemp(prefix='execution_host_table_')
+SGE_CELL = 'default'
+EHOST_FILE = os.path.join(SGE_ROOT, 'ehost')
+
+EHOST_LIST = [
+    'hostname h1\nload_scaling NONE\ncomplex_values slots=8,ssd=TRUE\n'
+    'load_values arch=lx-amd64,mem_free=2.5G,np_load_avg=2.0\nprocessors 8\n',
+    'hostname h2\nload_scaling NONE\ncomplex_values slots=32,mem_free=64G\n'
+    'load_values arch=lx-amd64,mem_free=31.2G,np_load_avg=1.7\nprocessors 32\n',
+    'hostname h3\nload_scaling NONE\ncomplex_values NONE\n'
+    'load_values arch=lx-arm64,mem_free=512M,np_load_avg=0.1\nprocessors 4\n',
+    'hostname h4\nload_scaling NONE\ncomplex_values NONE\nload_values NONE\nprocessors 0\n',
+]
+
+
+def setup_module():
+    create_fake_sge_root(create_qconf_script({'-seld': EHOST_FILE}, {'-seld': 'no execution host defined'}),
+                         sge_root=SGE_ROOT)
+
+
+def teardown_module():
+    remove_fake_sge_root(SGE_ROOT)
+
+
+def test_parse_value():
+    assert (ExecutionHostTable.parse_value('4G') == 4 * 1024 ** 3)
+    assert (ExecutionHostTable.parse_value('1.5k') == 1500)
+    assert (ExecutionHostTable.parse_value('TRUE') == 1)
+    assert (ExecutionHostTable.parse_value('infinity') == float('inf'))
+    assert (ExecutionHostTable.parse_value('lx-amd64') is None)
+
+
+def test_get_ehost_table():
+    write_bulk_objects(EHOST_FILE, EHOST_LIST)
+    api = QconfApi(sge_root=SGE_ROOT, sge_cell=SGE_CELL)
+    table = api.get_ehost_table()
+    assert (len(table) == 4)
+    assert (table.host_index['h3'] == 2)
+    mem_free = table.get_column('mem_free')
+    assert (type(mem_free) == array)
+    assert (mem_free[2] == 512 * 1024 ** 2)
+    assert (math.isnan(mem_free[3]))
+    assert (table.get_column('complex_values.mem_free')[1] == 64 * 1024 ** 3)
+    assert (table.get_column('arch') == ['lx-amd64', 'lx-amd64', 'lx-arm64', None])
+    assert (list(table.get_column('processors')) == [8, 32, 4, 0])
+    assert (table.get_column_names('complex_values') == ['mem_free', 'slots', 'ssd'])
+    assert (table.get_row('h1')[('complex_values', 'ssd')] == 1)
+
+    assert (table.select('mem_free < 4G and np_load_avg > 1.5') == ['h1'])
+    assert (table.select([('np_load_avg', '>', 1.5)]) == ['h1', 'h2'])
+    assert (table.select([('arch', '==', 'lx-amd64'), ('slots', '>=', '16')]) == ['h2'])
+    assert (table.select('mem_free != 0') == ['h1', 'h2', 'h3'])
+
+
+def test_select_errors():
+    table = ExecutionHostTable.from_objects([])
+    assert (len(table) == 0)
+    write_bulk_objects(EHOST_FILE, EHOST_LIST)
+    table = QconfApi(sge_root=SGE_ROOT, sge_cell=SGE_CELL).get_ehost_table()
+    for conditions in ['mem_free <', 'mem_free < lots', [('mem_free', '~', '1G')]]:
+        try:
+            table.select(conditions)
+            assert (False)
+        except InvalidArgument as ex:
+            pass
+    try:
+        table.select('no_such_value > 1')
+        assert (False)
+    except ObjectNotFound as ex:
+        pass
+
+
+def test_empty_table():
+    write_bulk_objects(EHOST_FILE, [])
+    api = QconfApi(sge_root=SGE_ROOT, sge_cell=SGE_CELL)
+    table = api.get_ehost_table()
+    assert (len(table) == 0)
+    assert (table.select([]) == [])
+
+
+def test_from_objects():
+    write_bulk_objects(EHOST_FILE, EHOST_LIST)
+    api = QconfApi(sge_root=SGE_ROOT, sge_cell=SGE_CELL)
+    table = ExecutionHostTable.from_objects(api.iter_objects('ExecutionHost'))
+    assert (table.host_names == ['h1', 'h2', 'h3', 'h4'])
+    assert (table.select('mem_free < 4G and np_load_avg > 1.5') == ['h1'])
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# 
+# ___INFO__MARK_BEGIN__ 
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__ 
+# 
+# 
+import os
+import tempfile
+
+from .utils import create_config_file
+from .utils import create_fake_sge_root
+from .utils import create_qconf_script
+from .utils import remove_fake_sge_root
+from .utils import write_bulk_objects
+
+from uge.api.qconf_api import QconfApi
+from uge.api.impl.host_group_index import HostGroupIndex
+from uge.api.impl.qconf_watcher import WatchEvent
+from uge.exceptions.invalid_argument import InvalidArgument
+from uge.exceptions.object_not_found import ObjectNotFound
+from uge.objects.qconf_object_factory import QconfObjectFactory
+
+create_config_file()
+SGE_ROOT = tempfile.mkdtemp(prefix='host_group_index_')
+SGE_CELL = 'default'
+HGRP_FILE = os.path.join(SGE_ROOT, 'hgrp')
+
+
+def generate_hgrp(name, hostlist):
+    return QconfObjectFactory.generate_host_group(
+        '8.5.4', data={'group_name': name, 'hostlist': hostlist})
+
+
+def setup_module():
+    create_fake_sge_root(create_qconf_script({'-shgrpld': HGRP_FILE}, {'-shgrpld': 'no host group list defined'}),
+                         sge_root=SGE_ROOT)
+
+
+def teardown_module():
+    remove_fake_sge_root(SGE_ROOT)
+
+
+def test_get_hgrp_index():
+    write_bulk_objects(HGRP_FILE, [
+        'group_name @allhosts\nhostlist @rack1 @rack2 login1\n',
+        'group_name @rack1\nhostlist node1 node2\n',
+        'group_name @rack2\nhostlist @gpu node3\n',
+        'group_name @gpu\nhostlist node4\n',
+        'group_name @empty\nhostlist NONE\n',
+    ])
+    api = QconfApi(sge_root=SGE_ROOT, sge_cell=SGE_CELL)
+    index = api.get_hgrp_index()
+    assert (len(index) == 5)
+    assert (index.get_hosts('@allhosts') == set(['node1', 'node2', 'node3', 'node4', 'login1']))
+    assert (index.get_hosts('@empty') == set())
+    assert (index.get_groups('node4') == set(['@gpu', '@rack2', '@allhosts']))
+    assert (index.get_groups('unknown') == set())
+    assert (index.contains('@rack2', 'node4'))
+    assert (not index.contains('@rack1', 'node4'))
+    assert (index.get_members('@rack2') == ['@gpu', 'node3'])
+
+
+def test_update_group():
+    index = HostGroupIndex([
+        generate_hgrp('@allhosts', ['@rack1', '@rack2']),
+        generate_hgrp('@rack1', ['node1', 'node2']),
+        generate_hgrp('@rack2', ['node3']),
+    ])
+    index.update_group(generate_hgrp('@rack1', ['node2', 'node5']))
+    assert (index.get_hosts('@allhosts') == set(['node2', 'node3', 'node5']))
+    assert (index.get_groups('node1') == set())
+    assert (index.get_groups('node5') == set(['@rack1', '@allhosts']))
+
+    # Dangling reference is resolved once group is added
+    index.update_group(generate_hgrp('@rack2', ['node3', '@gpu']))
+    index.update_group(generate_hgrp('@gpu', ['node9']))
+    assert (index.get_groups('node9') == set(['@gpu', '@rack2', '@allhosts']))
+
+    index.delete_group('@rack1')
+    assert (index.get_hosts('@allhosts') == set(['node3', 'node9']))
+    assert (index.get_groups('node2') == set())
+    index.apply_event(WatchEvent(WatchEvent.DELETED, 'HostGroup', '@gpu'))
+    index.apply_event(WatchEvent(WatchEvent.ADDED, 'HostGroup', '@rack1', generate_hgrp('@rack1', ['node1'])))
+    assert (index.get_hosts('@allhosts') == set(['node1', 'node3']))
+    try:
+        index.get_hosts('@gpu')
+        assert (False)
+    except ObjectNotFound as ex:
+        pass
+
+
+def test_cycle():
+    try:
+        HostGroupIndex([generate_hgrp('@a', ['@b']), generate_hgrp('@b', ['h1', '@a'])])
+        assert (False)
+    except InvalidArgument as ex:
+        pass
+    index = HostGroupIndex([generate_hgrp('@a', ['@b']), generate_hgrp('@b', ['h1'])])
+    try:
+        index.update_group(generate_hgrp('@b', ['h2', '@a']))
+        assert (False)
+    except InvalidArgument as ex:
+        pass
+    # Index is not changed by rejected update
+    assert (index.get_members('@b') == ['h1'])
+    assert (index.get_groups('h1') == set(['@a', '@b']))
+    index.update_group(generate_hgrp('@b', ['h2']))
+    assert (index.get_hosts('@a') == set(['h2']))
+
+
+def test_empty_index():
+    write_bulk_objects(HGRP_FILE, [])
+    api = QconfApi(sge_root=SGE_ROOT, sge_cell=SGE_CELL)
+    assert (len(api.get_hgrp_index()) == 0)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# 
+# ___INFO__MARK_BEGIN__ 
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__ 
+# 
+# 
+import time
+
+from .utils import create_config_file
+
+from uge.api.impl.qconf_object_cache import QconfObjectCache
+from uge.exceptions.invalid_argument import InvalidArgument
+
+create_config_file()
+
+
+def test_get_returns_copy():
+    cache = QconfObjectCache(60)
+    data = {'qname': 'all.q', 'slots': [1, 2]}
+    cache.put('q', 'all.q', data)
+    data['slots'].append(3)
+    cached_data = cache.get('q', 'all.q')
+    assert (cached_data == {'qname': 'all.q', 'slots': [1, 2]})
+    cached_data['slots'].append(4)
+    assert (cache.get('q', 'all.q')['slots'] == [1, 2])
+
+
+def test_hit_and_miss_counters():
+    cache = QconfObjectCache(60)
+    assert (cache.get('q', 'all.q') is None)
+    cache.put('q', 'all.q', {})
+    cache.get('q', 'all.q')
+    cache.get('q', 'all.q')
+    stats = cache.get_stats()
+    assert (stats['hits'] == 2)
+    assert (stats['misses'] == 1)
+
+
+def test_ttl_expiration():
+    cache = QconfObjectCache(0.05)
+    cache.put('q', 'all.q', {})
+    assert (cache.get('q', 'all.q') is not None)
+    time.sleep(0.1)
+    assert (cache.get('q', 'all.q') is None)
+    assert (cache.get_stats()['size'] == 0)
+
+
+def test_lru_eviction():
+    cache = QconfObjectCache(60, size=2)
+    cache.put('q', 'a.q', {})
+    cache.put('q', 'b.q', {})
+    cache.get('q', 'a.q')
+    cache.put('q', 'c.q', {})
+    assert (cache.get('q', 'b.q') is None)
+    assert (cache.get('q', 'a.q') is not None)
+    assert (cache.get('q', 'c.q') is not None)
+    assert (cache.get_stats()['evictions'] == 1)
+
+
+def test_invalidation():
+    cache = QconfObjectCache(60)
+    cache.put('q', 'a.q', {})
+    cache.put('q', 'b.q', {})
+    cache.put('hgrp', '@allhosts', {})
+    cache.invalidate('q', 'a.q')
+    assert (cache.get('q', 'a.q') is None)
+    cache.invalidate_class('q')
+    assert (cache.get('q', 'b.q') is None)
+    assert (cache.get('hgrp', '@allhosts') is not None)
+    cache.clear()
+    assert (cache.get('hgrp', '@allhosts') is None)
+    assert (cache.get_stats()['invalidations'] == 3)
+
+
+def test_invalid_arguments():
+    for (ttl, size) in [(0, 10), (-1, 10), (60, 0)]:
+        try:
+            QconfObjectCache(ttl, size=size)
+            assert (False)
+        except InvalidArgument as ex:
+            pass
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# 
+# ___INFO__MARK_BEGIN__ 
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__ 
+# 
+# 
+import json
+
+from .utils import create_config_file
+
+from uge.objects.qconf_object_factory import QconfObjectFactory
+from uge.objects.cluster_queue_v1_0 import ClusterQueue
+from uge.exceptions.qconf_exception import QconfException
+from uge.exceptions.invalid_request import InvalidRequest
+
+create_config_file()
+
+
+def test_object_class_is_resolved_once():
+    queue1 = QconfObjectFactory.generate_cluster_queue('8.4.0', name='q1')
+    queue2 = QconfObjectFactory.generate_cluster_queue('8.4.0', name='q2', add_required_data=False)
+    assert (queue1.__class__ is queue2.__class__)
+    assert (queue1.__class__ is ClusterQueue)
+
+
+def test_object_class_from_object_version():
+    cconf = QconfObjectFactory.generate_complex_configuration('8.4.0')
+    generated_object = QconfObjectFactory.generate_object(cconf.to_json())
+    assert (generated_object.__class__ is cconf.__class__)
+    assert (generated_object.VERSION == '2.0')
+
+
+def test_unsupported_uge_version():
+    try:
+        QconfObjectFactory.generate_cluster_queue('1.0.0')
+        assert (False)
+    except QconfException as ex:
+        pass
+    try:
+        QconfObjectFactory.generate_cluster_queue(None)
+        assert (False)
+    except InvalidRequest as ex:
+        pass
+
+
+def test_migrate_object():
+    job_class = QconfObjectFactory.generate_job_class('8.4.0', name='jc1')
+    job_class.data['masterl'] = 'arch=lx-amd64'
+    migrated = QconfObjectFactory.migrate_object(job_class, '8.9.1')
+    assert (migrated.VERSION == '4.0')
+    assert (migrated.metadata['object_version'] == '4.0')
+    assert (migrated.data['jcname'] == 'jc1')
+    assert ('masterl' not in migrated.data)
+    assert (migrated.data['umask'] == '{+}UNSPECIFIED')
+
+
+def test_migrate_renamed_keys():
+    sconf = QconfObjectFactory.generate_scheduler_configuration('8.4.0')
+    sconf.data['load_formula'] = 'np_load_avg+slots'
+    migrated = QconfObjectFactory.migrate_object(sconf, '8.9.1')
+    assert (migrated.VERSION == '3.0')
+    assert (migrated.data['host_sort_formula'] == 'np_load_avg+slots')
+    assert ('load_formula' not in migrated.data)
+    assert ('queue_sort_method' not in migrated.data)
+    downgraded = QconfObjectFactory.migrate_object(migrated, '8.4.0')
+    assert (downgraded.data['load_formula'] == 'np_load_avg+slots')
+    assert ('host_sort_formula' not in downgraded.data)
+
+
+def test_migrate_complex_attributes():
+    cconf = QconfObjectFactory.generate_complex_configuration('8.4.0')
+    cconf.data['my_attr'] = dict(cconf.data['cpu'])
+    migrated = QconfObjectFactory.migrate_object(cconf, '8.9.1')
+    assert (migrated.VERSION == '4.0')
+    assert (migrated.data['arch']['do_report'] is True)
+    assert (migrated.data['my_attr']['affinity'] == 0.0)
+    assert (migrated.data['my_attr']['is_static'] is False)
+    # Class defaults must not be modified by migration
+    cconf = QconfObjectFactory.generate_complex_configuration('8.4.0')
+    assert ('affinity' not in cconf.data['arch'])
+    assert (migrated.to_uge().find('my_attr cpu DOUBLE') > 0)
+
+
+def test_migrate_objects():
+    pe = QconfObjectFactory.generate_parallel_environment('8.4.0', name='pe1')
+    jc = QconfObjectFactory.generate_job_class('8.4.0', name='jc1')
+    object_list = list(QconfObjectFactory.migrate_objects([pe, jc.to_json(), json.loads(pe.to_json())], '8.6.0'))
+    assert ([o.VERSION for o in object_list] == ['2.0', '3.0', '2.0'])
+    assert (object_list[2].data['per_pe_task_prolog'] is None)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# 
+# ___INFO__MARK_BEGIN__ 
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__ 
+# 
+# 
+import threading
+import time
+
+from .utils import create_config_file
+
+from uge.api.impl.parallel_executor import ParallelExecutor
+from uge.exceptions.invalid_argument import InvalidArgument
+from uge.exceptions.object_not_found import ObjectNotFound
+
+create_config_file()
+
+
+def test_results_in_input_order():
+    executor = ParallelExecutor(max_workers=4)
+    results = executor.execute(lambda x: x * x, range(20))
+    assert ([r.item for r in results] == list(range(20)))
+    assert ([r.result for r in results] == [x * x for x in range(20)])
+
+
+def test_exceptions_are_collected():
+    def get_object(name):
+        if name.startswith('bad'):
+            raise ObjectNotFound('%s does not exist' % name)
+        return name.upper()
+
+    executor = ParallelExecutor(max_workers=2)
+    results = executor.execute(get_object, ['a', 'bad1', 'b', 'bad2'])
+    assert ([r.is_successful() for r in results] == [True, False, True, False])
+    assert (results[2].result == 'B')
+    assert (isinstance(results[1].exception, ObjectNotFound))
+
+
+def test_max_workers():
+    lock = threading.Lock()
+    counters = {'running': 0, 'max_running': 0}
+
+    def operation(x):
+        with lock:
+            counters['running'] += 1
+            counters['max_running'] = max(counters['max_running'], counters['running'])
+        time.sleep(0.01)
+        with lock:
+            counters['running'] -= 1
+
+    ParallelExecutor(max_workers=3).execute(operation, range(30))
+    assert (counters['max_running'] <= 3)
+    assert (counters['max_running'] > 1)
+
+
+def test_backpressure():
+    consumed = []
+    processed = []
+    lock = threading.Lock()
+    event = threading.Event()
+
+    def generate_items():
+        for i in range(20):
+            consumed.append(i)
+            yield i
+
+    def operation(x):
+        event.wait()
+        with lock:
+            processed.append(x)
+
+    thread = threading.Thread(target=ParallelExecutor(max_workers=2, max_pending=3).execute,
+                              args=(operation, generate_items()))
+    thread.start()
+    time.sleep(0.1)
+    # 2 items being processed, 3 items queued, 1 item waiting to be queued
+    assert (len(consumed) <= 6)
+    event.set()
+    thread.join()
+    assert (sorted(processed) == list(range(20)))
+
+
+def test_empty_input():
+    assert (ParallelExecutor().execute(lambda x: x, []) == [])
+
+
+def test_invalid_arguments():
+    for (max_workers, max_pending) in [(0, None), (2, 0)]:
+        try:
+            ParallelExecutor(max_workers=max_workers, max_pending=max_pending)
+            assert (False)
+        except InvalidArgument as ex:
+            pass
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# 
+# ___INFO__MARK_BEGIN__ 
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__ 
+# 
+# 
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from .utils import create_config_file
+from .utils import CONFIG_FILE
+
+from uge.cli.qconf_convert import convert_object
+from uge.objects.qconf_object_factory import QconfObjectFactory
+from uge.objects.uge_release_object_map import UGE_RELEASE_OBJECT_MAP
+
+create_config_file()
+INPUT_DIR = tempfile.mkdtemp(prefix='qconf_convert_')
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_UGE_VERSION = '8.4.0'
+TARGET_UGE_VERSION = '8.6.0'
+N_PES = 50
+
+
+def setup_module():
+    job_class = QconfObjectFactory.generate_job_class(SOURCE_UGE_VERSION, name='jc0')
+    with open(os.path.join(INPUT_DIR, 'job_class.json'), 'w') as f:
+        f.write(json.dumps(json.loads(job_class.to_json()), indent=4))
+    with open(os.path.join(INPUT_DIR, 'pes.jsonl'), 'w') as f:
+        for i in range(N_PES):
+            pe = QconfObjectFactory.generate_parallel_environment(SOURCE_UGE_VERSION, name='pe%s' % i)
+            f.write('%s\n' % pe.to_json())
+
+
+def teardown_module():
+    shutil.rmtree(INPUT_DIR)
+
+
+def run_qconf_convert(*args):
+    # No SGE_ROOT in the environment: conversion must not need qmaster
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([PACKAGE_DIR] + [p for p in [env.get('PYTHONPATH')] if p])
+    env['UGE_CONFIG_FILE'] = CONFIG_FILE
+    env.pop('SGE_ROOT', None)
+    output = subprocess.check_output([sys.executable, '-m', 'uge.cli.qconf_convert'] + list(args), env=env)
+    return [json.loads(line) for line in output.decode().split('\n') if line.startswith('{')]
+
+
+def test_convert_object():
+    pe = QconfObjectFactory.generate_parallel_environment(SOURCE_UGE_VERSION, name='pe0')
+    uge_string = convert_object(pe.to_json(), TARGET_UGE_VERSION, 'uge')
+    assert (uge_string.startswith('pe_name'))
+    assert (uge_string.find('pe0') > 0)
+
+
+def test_convert_directory_in_parallel():
+    object_list = run_qconf_convert('--input-file', INPUT_DIR, '--to-uge', TARGET_UGE_VERSION, '--processes', '2')
+    assert (len(object_list) == N_PES + 1)
+    assert (object_list[0]['object_class'] == 'JobClass')
+    assert ([o['data']['pe_name'] for o in object_list[1:]] == ['pe%s' % i for i in range(N_PES)])
+    release_map = UGE_RELEASE_OBJECT_MAP[TARGET_UGE_VERSION]
+    for o in object_list:
+        assert (o['object_version'] == release_map[o['object_class']])
+
+
+def test_convert_glob():
+    object_list = run_qconf_convert('--input-file', os.path.join(INPUT_DIR, '*.jsonl'), '--to-uge', TARGET_UGE_VERSION)
+    assert (len(object_list) == N_PES)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# 
+# ___INFO__MARK_BEGIN__ 
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__ 
+# 
+# 
+import io
+
+from .utils import create_config_file
+
+from uge.objects.qconf_object import QconfObject
+from uge.objects.share_tree_v1_0 import ShareTree
+
+create_config_file()
+
+
+class ConverterTestObject(QconfObject):
+    INT_KEY_MAP = {'seq_no': 0, 'slots': 1}
+    FLOAT_KEY_MAP = {'weight': 0.5}
+    LIST_KEY_MAP = {'slots': ',', 'hostlist': ' '}
+    DICT_KEY_MAP = {'complex_values': ','}
+    UGE_CASE_SENSITIVE_KEYS = {'flag': lambda x: x.lower()}
+
+
+class SubclassTestObject(ConverterTestObject):
+    LIST_KEY_MAP = {'seq_no': ';'}
+
+
+def test_uge_to_py():
+    qconf_object = ConverterTestObject()
+    assert (qconf_object.uge_to_py('seq_no', '3') == 3)
+    assert (qconf_object.uge_to_py('seq_no', 'abc') == 'abc')
+    assert (qconf_object.uge_to_py('weight', '0.25') == 0.25)
+    assert (qconf_object.uge_to_py('slots', '1,[h1=2]') == ['1', '[h1=2]'])
+    assert (qconf_object.uge_to_py('slots', '4') == ['4'])
+    assert (qconf_object.uge_to_py('hostlist', 'h1 h2') == ['h1', 'h2'])
+    assert (qconf_object.uge_to_py('complex_values', 'a=1,b=TRUE') == {'a': '1', 'b': True})
+    assert (qconf_object.uge_to_py('other', 'x,y') == ['x', 'y'])
+    assert (qconf_object.uge_to_py('other', 'x') == 'x')
+    assert (qconf_object.uge_to_py('other', 'none') is None)
+    assert (qconf_object.uge_to_py('seq_no', 'INFINITY') == float('inf'))
+
+
+def test_py_to_uge():
+    qconf_object = ConverterTestObject()
+    assert (qconf_object.py_to_uge('other', None) == 'NONE')
+    assert (qconf_object.py_to_uge('other', True) == 'TRUE')
+    assert (qconf_object.py_to_uge('other', 1) == 1)
+    assert (qconf_object.py_to_uge('other', 0) == 0)
+    assert (qconf_object.py_to_uge('flag', False) == 'false')
+    assert (qconf_object.py_to_uge('hostlist', ['h1', 'h2']) == 'h1 h2')
+    assert (qconf_object.py_to_uge('other', ['h1', 'h2']) == 'h1,h2')
+    assert (qconf_object.py_to_uge('complex_values', {'a': 1}) == 'a=1')
+    assert (qconf_object.py_to_uge('other', 'x') == 'x')
+
+
+def test_converters_are_compiled_per_class():
+    assert (SubclassTestObject().uge_to_py('seq_no', '1;2') == ['1', '2'])
+    assert (ConverterTestObject().uge_to_py('seq_no', '12') == 12)
+
+
+def test_write_uge():
+    qconf_object = ConverterTestObject(data={'hostlist': ['h1', 'h2'], 'seq_no': 0})
+    writer = io.StringIO()
+    qconf_object.write_uge(writer)
+    assert (writer.getvalue() == qconf_object.to_uge())
+    assert (sorted(writer.getvalue().split('\n')) == ['', 'hostlist h1 h2', 'seq_no 0'])
+    stree = ShareTree(data=[{'id': 0, 'name': 'Root', 'type': 0, 'shares': 1, 'childnodes': None}])
+    writer = io.StringIO()
+    stree.write_uge(writer)
+    assert (writer.getvalue() == 'id=0\nname=Root\ntype=0\nshares=1\nchildnodes=NONE\n')
+
+
+def test_fingerprint():
+    qconf_object = ConverterTestObject(data={'seq_no': 0, 'hostlist': ['h1', 'h2'], 'load_values': {'a': 1}},
+                                       metadata={'description': 'first'})
+    qconf_object2 = ConverterTestObject(data={'load_values': {'a': 2}, 'hostlist': ['h1', 'h2'], 'seq_no': 0},
+                                        metadata={'description': 'second'})
+    assert (qconf_object.get_fingerprint() != qconf_object2.get_fingerprint())
+    assert (qconf_object.get_fingerprint(['load_values']) == qconf_object2.get_fingerprint(['load_values']))
+    qconf_object2.data['hostlist'].append('h3')
+    assert (qconf_object.get_fingerprint(['load_values']) != qconf_object2.get_fingerprint(['load_values']))
+
+
+def test_compact_representation():
+    from uge.objects.qconf_object_factory import QconfObjectFactory
+    hosts = []
+    for i in range(2):
+        host = QconfObjectFactory.generate_execution_host('8.5.4', add_required_data=False)
+        host.set_data_dict_from_qconf_output('hostname h%s\nuser_lists acl1,acl2\nload_scaling NONE\n' % i)
+        hosts.append(host)
+    assert (not hasattr(hosts[0], '__dict__'))
+    # Metadata is created on first access
+    assert (hosts[0]._metadata is None)
+    assert (hosts[0].metadata['object_class'] == 'ExecutionHost')
+    # Key names and list items are shared by all objects
+    (keys0, keys1) = [sorted(host.data.keys()) for host in hosts]
+    assert (all([key0 is key1 for (key0, key1) in zip(keys0, keys1)]))
+    assert (hosts[0].data['user_lists'][1] is hosts[1].data['user_lists'][1])
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# 
+# ___INFO__MARK_BEGIN__ 
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__ 
+# 
+# 
+import asyncio
+import os
+import tempfile
+
+from .utils import create_config_file
+from .utils import create_fake_sge_root
+from .utils import create_qconf_script
+from .utils import remove_fake_sge_root
+from .utils import write_bulk_objects
+
+from uge.api.qconf_api import QconfApi
+from uge.api.async_qconf_api import AsyncQconfApi
+from uge.api.impl.qconf_watcher import WatchEvent
+from uge.exceptions.invalid_argument import InvalidArgument
+
+create_config_file()
+SGE_ROOT = tempfile.mkdtemp(prefix='qconf_watcher_')
+SGE_CELL = 'default'
+HGRP_FILE = os.path.join(SGE_ROOT, 'hgrp')
+EHOST_FILE = os.path.join(SGE_ROOT, 'ehost')
+
+
+def setup_module():
+    create_fake_sge_root(create_qconf_script({'-shgrpld': HGRP_FILE, '-seld': EHOST_FILE}), sge_root=SGE_ROOT)
+
+
+def teardown_module():
+    remove_fake_sge_root(SGE_ROOT)
+
+
+def get_event_tuples(event_list):
+    return [(e.event_type, e.class_name, e.name) for e in event_list]
+
+
+def test_poll_events():
+    write_bulk_objects(HGRP_FILE, ['group_name @a\nhostlist h1\n', 'group_name @b\nhostlist h2\n'])
+    write_bulk_objects(EHOST_FILE, ['hostname h1\ncomplex_values NONE\nload_values np_load_avg=0.1\n'])
+    api = QconfApi(sge_root=SGE_ROOT, sge_cell=SGE_CELL)
+    watcher = api.create_watcher(classes=['HostGroup', 'ExecutionHost'], initial_events=True)
+    assert (get_event_tuples(watcher.poll()) == [
+        ('added', 'HostGroup', '@a'), ('added', 'HostGroup', '@b'), ('added', 'ExecutionHost', 'h1')])
+    hgrp_a = watcher.state_dict['HostGroup']['@a'][1]
+
+    write_bulk_objects(HGRP_FILE, ['group_name @a\nhostlist h1\n', 'group_name @c\nhostlist h3\n'])
+    write_bulk_objects(EHOST_FILE, ['hostname h1\ncomplex_values NONE\nload_values np_load_avg=0.9\n'])
+    event_list = watcher.poll()
+    assert (get_event_tuples(event_list) == [('added', 'HostGroup', '@c'), ('deleted', 'HostGroup', '@b')])
+    assert (event_list[0].pycl_object.data['hostlist'] == ['h3'])
+    # Unchanged object is not parsed again
+    assert (watcher.state_dict['HostGroup']['@a'][1] is hgrp_a)
+
+    write_bulk_objects(HGRP_FILE, ['group_name @a\nhostlist h1 h2\n', 'group_name @c\nhostlist h3\n'])
+    event_list = watcher.poll()
+    assert (get_event_tuples(event_list) == [(WatchEvent.MODIFIED, 'HostGroup', '@a')])
+    assert (event_list[0].pycl_object.data['hostlist'] == ['h1', 'h2'])
+
+
+def test_shared_subscriptions():
+    write_bulk_objects(HGRP_FILE, ['group_name @a\nhostlist h1\n'])
+    api = QconfApi(sge_root=SGE_ROOT, sge_cell=SGE_CELL)
+    watcher = api.create_watcher(classes=['HostGroup'], interval=0.05, initial_events=True)
+    subscription_list = [watcher.subscribe(), watcher.subscribe()]
+    for subscription in subscription_list:
+        assert (get_event_tuples([subscription.get(timeout=5)]) == [('added', 'HostGroup', '@a')])
+    write_bulk_objects(HGRP_FILE, ['group_name @a\nhostlist h2\n'])
+    for subscription in subscription_list:
+        assert (get_event_tuples([subscription.get(timeout=5)]) == [('modified', 'HostGroup', '@a')])
+    watcher.stop()
+    for subscription in subscription_list:
+        assert (list(subscription) == [])
+
+
+def test_async_watch():
+    write_bulk_objects(HGRP_FILE, ['group_name @a\nhostlist h1\n', 'group_name @b\nhostlist h2\n'])
+    api = AsyncQconfApi(sge_root=SGE_ROOT, sge_cell=SGE_CELL)
+
+    async def get_events():
+        event_list = []
+        async for event in api.watch(classes=['HostGroup'], interval=0.01, initial_events=True):
+            event_list.append(event)
+            if len(event_list) == 2:
+                break
+        return event_list
+
+    event_list = asyncio.get_event_loop().run_until_complete(get_events())
+    assert (get_event_tuples(event_list) == [('added', 'HostGroup', '@a'), ('added', 'HostGroup', '@b')])
+
+
+def test_unsupported_class():
+    try:
+        QconfApi(sge_root=SGE_ROOT, sge_cell=SGE_CELL).create_watcher(classes=['ShareTree'])
+        assert (False)
+    except InvalidArgument as ex:
+        pass
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# 
+# ___INFO__MARK_BEGIN__ 
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__ 
+# 
+# 
+import os
+import tempfile
+
+from .utils import create_config_file
+from .utils import create_fake_sge_root
+from .utils import create_qconf_script
+from .utils import remove_fake_sge_root
+from .utils import write_bulk_objects
+
+from uge.api.qconf_api import QconfApi
+from uge.api.impl.host_group_index import HostGroupIndex
+from uge.api.impl.queue_configuration_resolver import QueueAttributeValue
+from uge.api.impl.queue_configuration_resolver import QueueConfigurationResolver
+from uge.exceptions.invalid_argument import InvalidArgument
+from uge.exceptions.object_not_found import ObjectNotFound
+from uge.objects.qconf_object_factory import QconfObjectFactory
+
+create_config_file()
+SGE_ROOT = tempfile.mkdtemp(prefix='queue_configuration_resolver_')
+SGE_CELL = 'default'
+HGRP_FILE = os.path.join(SGE_ROOT, 'hgrp')
+QUEUE_FILE = os.path.join(SGE_ROOT, 'queue')
+
+
+def generate_hgrp(name, hostlist):
+    return QconfObjectFactory.generate_host_group('8.5.4', data={'group_name': name, 'hostlist': hostlist})
+
+
+def setup_module():
+    create_fake_sge_root(create_qconf_script({'-shgrpld': HGRP_FILE, '-sqld': QUEUE_FILE}), sge_root=SGE_ROOT)
+
+
+def teardown_module():
+    remove_fake_sge_root(SGE_ROOT)
+
+
+def test_parse():
+    value = QueueAttributeValue.parse('mem=4G,[@gpu=gpu=2,mem=8G],[node7=mem=16G]')
+    assert (value.default == 'mem=4G')
+    assert (value.override_list == [('@gpu', 'gpu=2,mem=8G'), ('node7', 'mem=16G')])
+    assert (value.to_uge() == 'mem=4G,[@gpu=gpu=2,mem=8G],[node7=mem=16G]')
+    # Values split on commas by ClusterQueue are restored
+    assert (QueueAttributeValue.parse(['mem=4G', '[@gpu=gpu=2', 'mem=8G]']).override_list == [('@gpu', 'gpu=2,mem=8G')])
+    assert (QueueAttributeValue.parse(4).to_uge() == '4')
+    assert (QueueAttributeValue.parse(None).to_uge() == 'NONE')
+    assert (QueueAttributeValue.parse(float('inf')).default == 'INFINITY')
+    for invalid_value in ['1,[@gpu=8', '1,[@gpu]']:
+        try:
+            QueueAttributeValue.parse(invalid_value)
+            assert (False)
+        except InvalidArgument as ex:
+            pass
+
+
+def test_get_value():
+    value = QueueAttributeValue.parse('1,[@gpu=8],[@big=16],[node7=32]')
+    assert (value.get_value('node1') == '1')
+    assert (value.get_value('node1', set(['@gpu'])) == '8')
+    assert (value.get_value('node7', set(['@gpu'])) == '32')
+    # Ambiguous host group overrides
+    assert (value.get_value('node2', set(['@gpu', '@big'])) == '1')
+
+
+def test_get_queue_resolver():
+    write_bulk_objects(HGRP_FILE, [
+        'group_name @allhosts\nhostlist @gpu node1 node2 node7\n',
+        'group_name @gpu\nhostlist gpu1 gpu2\n',
+    ])
+    write_bulk_objects(QUEUE_FILE, [
+        'qname all.q\nhostlist @allhosts\nslots 1,[@gpu=8],[node7=16]\ntmpdir /tmp,[gpu1=/scratch]\n'
+        'complex_values mem=4G,[@gpu=gpu=2,mem=8G]\n',
+        'qname gpu.q\nhostlist @gpu\nslots 4\ntmpdir /tmp\ncomplex_values NONE\n',
+        'qname idle.q\nhostlist NONE\nslots 1\ntmpdir /tmp\ncomplex_values NONE\n',
+    ])
+    api = QconfApi(sge_root=SGE_ROOT, sge_cell=SGE_CELL)
+    resolver = api.get_queue_resolver()
+    assert (resolver.get_queue_names() == ['all.q', 'gpu.q', 'idle.q'])
+    assert (resolver.get_hosts('all.q') == ['gpu1', 'gpu2', 'node1', 'node2', 'node7'])
+    assert (resolver.get_hosts('idle.q') == [])
+    assert (resolver.get_slots('all.q', 'gpu2') == 8)
+    assert (resolver.get_slots('all.q', 'node7') == 16)
+    assert (resolver.get_value('all.q', 'gpu1', 'tmpdir') == '/scratch')
+    assert (resolver.get_value('all.q', 'gpu2', 'tmpdir') == '/tmp')
+    assert (resolver.get_value('all.q', 'gpu2', 'complex_values') == 'gpu=2,mem=8G')
+    assert (resolver.get_total_slots() == {'all.q': 34, 'gpu.q': 8, 'idle.q': 0})
+    try:
+        resolver.get_slots('no_such.q', 'node1')
+        assert (False)
+    except ObjectNotFound as ex:
+        pass
+
+    queue = resolver.get_queue('gpu.q')
+    queue.data['slots'] = ['2', '[gpu1=6]']
+    resolver.update_queue(queue)
+    assert (resolver.get_total_slots(['gpu.q']) == {'gpu.q': 8})
+    assert (not resolver.is_ambiguous('all.q', 'gpu1', 'slots'))
+
+
+def test_total_slots():
+    n_hosts = 10000
+    host_names = ['node%s' % i for i in range(n_hosts)]
+    host_group_index = HostGroupIndex([
+        generate_hgrp('@allhosts', ['@big'] + host_names[1000:]),
+        generate_hgrp('@big', host_names[:1000]),
+    ])
+    queue = QconfObjectFactory.generate_cluster_queue('8.5.4', data={
+        'qname': 'all.q', 'hostlist': '@allhosts', 'slots': ['1', '[@big=64]', '[node5000=32]']})
+    resolver = QueueConfigurationResolver([queue], host_group_index)
+    assert (resolver.get_total_slots() == {'all.q': 1000 * 64 + 8999 + 32})
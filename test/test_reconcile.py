@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# 
+# ___INFO__MARK_BEGIN__ 
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__ 
+# 
+# 
+import os
+import tempfile
+
+from .utils import create_config_file
+from .utils import create_fake_sge_root
+from .utils import remove_fake_sge_root
+
+from uge.api.qconf_api import QconfApi
+from uge.api.impl.qconf_reconciler import QconfReconciler
+from uge.api.impl.qconf_reconciler import ReconcileAction
+from uge.objects.qconf_object_factory import QconfObjectFactory
+
+create_config_file()
+SGE_ROOT = tempfile.mkdtemp(prefix='reconcile_')
+SGE_CELL = 'default'
+LOG_FILE = os.path.join(SGE_ROOT, 'qconf.log')
+UGE_VERSION = '8.5.4'
+
+# Fake qconf: logs its arguments, and prints current host groups and access lists
+QCONF_SCRIPT = """#!/bin/sh
+echo "$@" >> %s
+case "$1" in
+    -help) echo "UGE %s";;
+    -shgrpld) printf 'group_name @a\\nhostlist h1\\n==================\\ngroup_name @old\\nhostlist h9\\n';;
+    -suld) printf 'name arusers\\ntype ACL\\nfshare 0\\noticket 0\\nentries NONE\\n==================\\n';
+           printf 'name acl1\\ntype ACL\\nfshare 0\\noticket 0\\nentries u1\\n';;
+esac
+"""
+
+
+def setup_module():
+    create_fake_sge_root(QCONF_SCRIPT % (LOG_FILE, UGE_VERSION), sge_root=SGE_ROOT)
+
+
+def teardown_module():
+    remove_fake_sge_root(SGE_ROOT)
+
+
+def get_api():
+    return QconfApi(sge_root=SGE_ROOT, sge_cell=SGE_CELL)
+
+
+def get_desired_objects():
+    return [
+        QconfObjectFactory.generate_project(UGE_VERSION, data={'name': 'p1', 'acl': ['acl1']}),
+        QconfObjectFactory.generate_host_group(UGE_VERSION, data={'group_name': '@a', 'hostlist': ['h1', 'h2']}),
+        QconfObjectFactory.generate_host_group(UGE_VERSION, data={'group_name': '@b', 'hostlist': ['h3']}),
+        QconfObjectFactory.generate_access_list(UGE_VERSION, data={'name': 'acl1', 'entries': ['u1']}),
+    ]
+
+
+def test_class_levels():
+    levels = QconfReconciler.get_class_levels(['ResourceQuotaSet', 'ClusterQueue', 'Project', 'HostGroup',
+                                               'AccessList'])
+    assert (levels == [['AccessList', 'HostGroup'], ['Project'], ['ClusterQueue'], ['ResourceQuotaSet']])
+
+
+def test_create_plan():
+    plan = get_api().create_reconcile_plan(get_desired_objects())
+    assert ([(a.action, a.class_name, a.name) for a in plan] == [
+        ('update', 'HostGroup', '@a'), ('create', 'HostGroup', '@b'), ('create', 'Project', 'p1')])
+    assert (plan.get_actions(action=ReconcileAction.UPDATE)[0].changed_keys == ['hostlist'])
+
+
+def test_prune_keeps_builtin_objects():
+    plan = get_api().create_reconcile_plan(get_desired_objects(), prune=True)
+    assert ([(a.class_name, a.name) for a in plan.get_actions(action=ReconcileAction.DELETE)] == [
+        ('HostGroup', '@old')])
+    assert ('AccessList' not in plan.get_summary())
+
+
+def test_apply_plan_in_reference_order():
+    api = get_api()
+    plan = api.create_reconcile_plan(get_desired_objects(), prune=True)
+    if os.path.exists(LOG_FILE):
+        os.remove(LOG_FILE)
+    api.apply_reconcile_plan(plan)
+    with open(LOG_FILE) as f:
+        commands = [line.split()[0] for line in f if not line.startswith('-s') and not line.startswith('-help')]
+    assert (commands == ['-Ahgrp', '-Mhgrp', '-Aprj', '-dhgrp'])
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# 
+# ___INFO__MARK_BEGIN__ 
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__ 
+# 
+# 
+import os
+import tempfile
+
+from .utils import create_config_file
+from .utils import create_fake_sge_root
+from .utils import create_qconf_script
+from .utils import remove_fake_sge_root
+from .utils import write_bulk_objects
+
+from uge.api.qconf_api import QconfApi
+from uge.api.impl.resource_quota_matcher import ResourceQuotaMatcher
+from uge.api.impl.resource_quota_matcher import ResourceQuotaRule
+from uge.exceptions.invalid_argument import InvalidArgument
+from uge.objects.qconf_object_factory import QconfObjectFactory
+
+create_config_file()
+SGE_ROOT = tempfile.mkdtemp(prefix='resource_quota_matcher_')
+SGE_CELL = 'default'
+RQS_FILE = os.path.join(SGE_ROOT, 'rqs')
+HGRP_FILE = os.path.join(SGE_ROOT, 'hgrp')
+ACL_FILE = os.path.join(SGE_ROOT, 'acl')
+
+RQS_OUTPUT = """{
+name max_slots
+description NONE
+enabled TRUE
+limit users bob to slots=2
+limit name gpu_users users @gpu_users hosts @gpu to slots=8,h_vmem=32G
+limit users {*} projects !p_low queues all.q to slots=10
+}
+{
+name disabled
+description NONE
+enabled FALSE
+limit to slots=0
+}
+{
+name per_host
+description NONE
+enabled TRUE
+limit pes mpi* hosts {*} to slots=$num_proc
+limit hosts node1 to h_vmem=64G
+}
+"""
+
+
+def generate_rqs(name, limits, enabled=True):
+    return QconfObjectFactory.generate_resource_quota_set(
+        '8.5.4', data={'name': name, 'enabled': enabled, 'limit': limits})
+
+
+def setup_module():
+    create_fake_sge_root(create_qconf_script({'-srqs': RQS_FILE, '-shgrpld': HGRP_FILE, '-suld': ACL_FILE}),
+                         sge_root=SGE_ROOT)
+
+
+def teardown_module():
+    remove_fake_sge_root(SGE_ROOT)
+
+
+def test_parse_rule():
+    rule = ResourceQuotaRule('rqs', 2, 'name r users {*,!bob} hosts @gpu to slots=8, h_vmem=4G')
+    assert (rule.name == 'r')
+    assert (rule.filter_dict['users'].per_entry)
+    assert (rule.limit_dict == {'slots': '8', 'h_vmem': '4G'})
+    assert (ResourceQuotaRule('rqs', 2, 'to slots=1').name == '3')
+    for invalid_rule in ['users bob', 'users', 'owners bob to slots=1', 'to slots']:
+        try:
+            ResourceQuotaRule('rqs', 0, invalid_rule)
+            assert (False)
+        except InvalidArgument as ex:
+            pass
+
+
+def test_get_rqs_matcher():
+    write_bulk_objects(RQS_FILE, [RQS_OUTPUT])
+    write_bulk_objects(HGRP_FILE, ['group_name @gpu\nhostlist gpu1 gpu2\n'])
+    write_bulk_objects(ACL_FILE, ['name gpu_users\ntype ACL\nfshare 0\noticket 0\nentries alice,carol,@unix\n'])
+    api = QconfApi(sge_root=SGE_ROOT, sge_cell=SGE_CELL)
+    matcher = api.get_rqs_matcher()
+    assert (matcher.set_name_list == ['max_slots', 'per_host'])
+
+    rule_list = matcher.match(user='bob', queue='all.q', host='gpu1')
+    assert ([(rule.set_name, rule.name) for rule in rule_list] == [('max_slots', '1')])
+    rule_list = matcher.match(user='alice', queue='all.q', host='gpu1')
+    assert ([(rule.set_name, rule.name) for rule in rule_list] == [('max_slots', 'gpu_users')])
+    rule_list = matcher.match(user='alice', queue='all.q', host='node1')
+    assert ([(rule.set_name, rule.name) for rule in rule_list] == [('max_slots', '3'), ('per_host', '2')])
+    # Negated project; job without project is not excluded, but does not match positive filter
+    assert (matcher.match(user='dave', project='p_low', queue='all.q', host='node2') == [])
+    assert (len(matcher.match(user='dave', queue='all.q', host='node2')) == 1)
+    assert ([rule.set_name for rule in matcher.match(user='dave', pe='mpi', queue='all.q', host='node2')] ==
+            ['max_slots', 'per_host'])
+    assert ([rule.set_name for rule in matcher.match(user='dave', queue='all.q', host='node2')] == ['max_slots'])
+    assert (len(matcher.match(user='dave', project='p1', queue='all.q', host='node2')) == 1)
+    # Unix groups are not resolved
+    assert (matcher.match(user='unix', queue='all.q', host='gpu2')[0].name == '3')
+
+    limit_list = matcher.get_limits('slots', user='alice', pe='mpi_rr', queue='all.q', host='node1')
+    assert ([(rule.name, limit) for (rule, limit) in limit_list] == [('3', '10'), ('1', '$num_proc')])
+    assert (matcher.get_limits('h_vmem', user='eve', queue='other.q', host='node1')[0][1] == '64G')
+    assert (matcher.match_all([('bob', None, None, 'all.q', 'gpu1'), ('eve', None, None, 'other.q', 'node9')]) ==
+            [matcher.match(user='bob', queue='all.q', host='gpu1'), []])
+
+
+def test_include_disabled():
+    rqs_list = [generate_rqs('off', ['to slots=0'], enabled=False), generate_rqs('on', ['users b* to slots=4'])]
+    assert (ResourceQuotaMatcher(rqs_list).match(user='ann') == [])
+    matcher = ResourceQuotaMatcher(rqs_list, include_disabled=True)
+    assert ([rule.set_name for rule in matcher.match(user='bill')] == ['off', 'on'])
+
+
+def test_many_rules():
+    limits = ['users user%s to slots=%s' % (i, i) for i in range(1000)] + ['users {*} to slots=1']
+    matcher = ResourceQuotaMatcher([generate_rqs('per_user', limits)])
+    assert (matcher.get_limits('slots', user='user999')[0][1] == '999')
+    assert (matcher.get_limits('slots', user='nobody')[0][0].name == '1001')
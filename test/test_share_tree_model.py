@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# 
+# ___INFO__MARK_BEGIN__ 
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__ 
+# 
+# 
+import os
+import tempfile
+
+from .utils import create_config_file
+from .utils import create_fake_sge_root
+from .utils import remove_fake_sge_root
+
+from uge.api.qconf_api import QconfApi
+from uge.api.impl.share_tree_model import ShareTreeModel
+from uge.exceptions.invalid_argument import InvalidArgument
+from uge.exceptions.invalid_request import InvalidRequest
+from uge.exceptions.object_already_exists import ObjectAlreadyExists
+from uge.exceptions.object_not_found import ObjectNotFound
+from uge.objects.qconf_object_factory import QconfObjectFactory
+
+create_config_file()
+SGE_ROOT = tempfile.mkdtemp(prefix='share_tree_model_')
+SGE_CELL = 'default'
+STREE_FILE = os.path.join(SGE_ROOT, 'stree')
+CALL_FILE = os.path.join(SGE_ROOT, 'calls')
+
+# Fake qconf: prints share tree stored in a file, and replaces it on modify
+QCONF_SCRIPT = """#!/bin/sh
+case "$1" in
+    -help) echo "UGE 8.5.4"; exit 0;;
+esac
+echo "$1" >> %s
+case "$1" in
+    -sstree) if [ -s %s ]; then cat %s; else echo "no sharetree element" >&2; exit 1; fi;;
+    -Mstree|-Astree) cp "$2" %s;;
+esac
+"""
+
+STREE = 'id=0\nname=Root\ntype=0\nshares=1\nchildnodes=1,2\n' \
+        'id=1\nname=P1\ntype=1\nshares=10\nchildnodes=3\n' \
+        'id=2\nname=P2\ntype=1\nshares=20\nchildnodes=NONE\n' \
+        'id=3\nname=user1\ntype=0\nshares=5\nchildnodes=NONE\n'
+
+
+def write_file(filename, content):
+    with open(filename, 'w') as f:
+        f.write(content)
+
+
+def read_calls():
+    with open(CALL_FILE) as f:
+        return f.read().split()
+
+
+def setup_module():
+    create_fake_sge_root(QCONF_SCRIPT % (CALL_FILE, STREE_FILE, STREE_FILE, STREE_FILE), sge_root=SGE_ROOT)
+
+
+def teardown_module():
+    remove_fake_sge_root(SGE_ROOT)
+
+
+def test_commit_stree_model():
+    write_file(STREE_FILE, STREE)
+    write_file(CALL_FILE, '')
+    api = QconfApi(sge_root=SGE_ROOT, sge_cell=SGE_CELL)
+    model = api.get_stree_model()
+    assert (len(model) == 4)
+    assert (model.get_node('/P1/user1').parent is model.get_node('P1'))
+    assert (model.get_node_by_id(2).get_path() == '/P2')
+    assert (model.get_paths() == ['/', '/P1', '/P1/user1', '/P2'])
+
+    for i in range(100):
+        model.add_node('/P2/user%s' % (i + 2), i)
+    model.move_node('/P1/user1', '/P2')
+    model.set_shares('/P2', 40)
+    model.delete_node('/P1')
+    model.add_node('/P3', 5, node_type=ShareTreeModel.PROJECT_NODE)
+    assert (model.has_changes())
+    stree = api.commit_stree_model(model)
+    assert (not model.has_changes())
+    assert (read_calls() == ['-sstree', '-Mstree'])
+
+    model = api.get_stree_model()
+    assert (len(model) == 104)
+    assert (model.get_node('/P2').shares == 40)
+    assert (model.get_node('/P2/user1').shares == 5)
+    assert (model.get_node('/P2/user101').shares == 99)
+    assert (model.get_node('/P3').type == ShareTreeModel.PROJECT_NODE)
+    assert ([node.name for node in model.root.children] == ['P2', 'P3'])
+    try:
+        model.get_node('/P1')
+        assert (False)
+    except ObjectNotFound as ex:
+        pass
+
+
+def test_new_stree():
+    write_file(STREE_FILE, '')
+    write_file(CALL_FILE, '')
+    api = QconfApi(sge_root=SGE_ROOT, sge_cell=SGE_CELL)
+    model = api.get_stree_model()
+    assert (model.get_paths() == ['/'])
+    model.add_node('/P1', 10, node_type=ShareTreeModel.PROJECT_NODE)
+    api.commit_stree_model(model)
+    assert (read_calls() == ['-sstree', '-Astree'])
+    assert (api.get_stree_model().get_node('/P1').shares == 10)
+
+
+def test_invalid_changes():
+    stree = QconfObjectFactory.generate_share_tree('8.5.4', add_required_data=False)
+    stree.set_data_dict_list_from_qconf_output(STREE)
+    model = ShareTreeModel(stree)
+    for (method, args, exception_class) in [
+            (model.add_node, ('/P1/user1', 1), ObjectAlreadyExists),
+            (model.add_node, ('/P4/user1', 1), ObjectNotFound),
+            (model.add_node, ('/P1/user2', -1), InvalidArgument),
+            (model.set_shares, ('/P1', 'many'), InvalidArgument),
+            (model.delete_node, ('/',), InvalidRequest),
+            (model.move_node, ('/P1', '/P1/user1'), InvalidRequest),
+            (model.move_node, ('/P2', '/P4'), ObjectNotFound)]:
+        try:
+            method(*args)
+            assert (False)
+        except exception_class as ex:
+            pass
+    assert (not model.has_changes())
+
+    stree.data[2]['childnodes'] = ['1']
+    try:
+        ShareTreeModel(stree)
+        assert (False)
+    except InvalidArgument as ex:
+        pass
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# 
+# ___INFO__MARK_BEGIN__ 
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__ 
+# 
+# 
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from .utils import create_config_file
+from .utils import create_fake_sge_root
+from .utils import create_qconf_script
+from .utils import remove_fake_sge_root
+from .utils import CONFIG_FILE
+
+create_config_file()
+SGE_ROOT = tempfile.mkdtemp(prefix='startup_')
+SGE_CELL = 'default'
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generous budget for import plus construction; exceeding it indicates
+# that startup again blocks on something slow (e.g., DNS lookups)
+STARTUP_BUDGET_MS = 2000
+
+# Measures import and construction time in a fresh interpreter, with
+# host name lookups disabled, and reports which managers were loaded
+STARTUP_SCRIPT = """
+import json
+import socket
+import sys
+import time
+
+def getfqdn(*args):
+    raise Exception('Host name lookup during startup')
+socket.getfqdn = getfqdn
+
+t0 = time.time()
+from uge.api.qconf_api import QconfApi
+t1 = time.time()
+api = QconfApi(sge_root=sys.argv[1], sge_cell=sys.argv[2])
+t2 = time.time()
+manager_modules = ['uge.api.impl.%s' % m for (m, _) in QconfApi.MANAGER_CLASS_DICT.values()]
+managers_after_construction = sorted([m for m in manager_modules if m in sys.modules])
+api.cluster_queue_manager
+print(json.dumps({
+    'import_ms': (t1 - t0) * 1000,
+    'construction_ms': (t2 - t1) * 1000,
+    'managers_after_construction': managers_after_construction,
+    'queue_manager_loaded': 'uge.api.impl.cluster_queue_manager' in sys.modules,
+}))
+"""
+
+
+def setup_module():
+    create_fake_sge_root(create_qconf_script({}), sge_root=SGE_ROOT)
+
+
+def teardown_module():
+    remove_fake_sge_root(SGE_ROOT)
+
+
+def run_startup_script():
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([PACKAGE_DIR] + [p for p in [env.get('PYTHONPATH')] if p])
+    env['UGE_CONFIG_FILE'] = CONFIG_FILE
+    env.pop('UGE_VERSION_CACHE_FILE', None)
+    output = subprocess.check_output([sys.executable, '-c', STARTUP_SCRIPT, SGE_ROOT, SGE_CELL], env=env)
+    return json.loads(output.decode().strip().split('\n')[-1])
+
+
+def test_startup():
+    result = run_startup_script()
+    print('Import: %.1f ms, construction: %.1f ms' % (result['import_ms'], result['construction_ms']))
+    assert (result['managers_after_construction'] == [])
+    assert (result['queue_manager_loaded'])
+    assert (result['import_ms'] + result['construction_ms'] < STARTUP_BUDGET_MS)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# 
+# ___INFO__MARK_BEGIN__ 
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__ 
+# 
+# 
+import os
+import shutil
+import tempfile
+
+from .utils import create_config_file
+
+from uge.utility.uge_environment import UgeEnvironment
+from uge.utility.uge_subprocess import UgeSubprocess
+from uge.exceptions.configuration_error import ConfigurationError
+
+create_config_file()
+SGE_ROOT = tempfile.mkdtemp(prefix='uge_environment_')
+SGE_CELL = 'default'
+BIN_DIR = os.path.join(SGE_ROOT, 'bin')
+COUNTER_FILE = os.path.join(SGE_ROOT, 'counter')
+
+
+def setup_module():
+    os.makedirs(os.path.join(SGE_ROOT, SGE_CELL, 'common'))
+    os.makedirs(BIN_DIR)
+    with open(UgeEnvironment.get_settings_file(SGE_ROOT, SGE_CELL), 'w') as f:
+        f.write('echo sourced >> %s\n' % COUNTER_FILE)
+        f.write('PATH=%s:$PATH; export PATH\n' % BIN_DIR)
+        f.write('MY_ARCH=lx-test; export MY_ARCH\n')
+    command_path = os.path.join(BIN_DIR, 'qconf')
+    with open(command_path, 'w') as f:
+        f.write('#!/bin/sh\nfor arg in "$@"; do echo "[$arg]"; done\necho $MY_ARCH\n')
+    os.chmod(command_path, 0o755)
+    UgeEnvironment.clear_cache()
+
+
+def teardown_module():
+    UgeEnvironment.clear_cache()
+    shutil.rmtree(SGE_ROOT)
+
+
+def test_resolve_once():
+    env_dict = {'SGE_ROOT': SGE_ROOT, 'SGE_CELL': SGE_CELL}
+    command_env = UgeEnvironment.get_command_env(env_dict)
+    UgeEnvironment.get_command_env(env_dict)
+    assert (command_env['MY_ARCH'] == 'lx-test')
+    assert (command_env['PATH'].startswith(BIN_DIR))
+    assert (command_env['SGE_ROOT'] == SGE_ROOT)
+    with open(COUNTER_FILE) as f:
+        assert (f.read() == 'sourced\n')
+
+
+def test_command_argv():
+    argv = UgeEnvironment.get_command_argv(SGE_ROOT, SGE_CELL, 'qconf', '-sq "my queue"')
+    assert (argv == [os.path.join(BIN_DIR, 'qconf'), '-sq', 'my queue'])
+    argv = UgeEnvironment.get_command_argv(SGE_ROOT, SGE_CELL, 'qconf', ['-dq', "it's"])
+    assert (argv[1:] == ['-dq', "it's"])
+
+
+def test_execute_without_shell():
+    env_dict = UgeEnvironment.get_command_env({'SGE_ROOT': SGE_ROOT, 'SGE_CELL': SGE_CELL})
+    argv = UgeEnvironment.get_command_argv(SGE_ROOT, SGE_CELL, 'qconf', ['-sq', '$HOME; ls'])
+    p = UgeSubprocess(argv, env=env_dict, shell=False)
+    p.run()
+    assert (p.get_stdout() == '[-sq]\n[$HOME; ls]\nlx-test\n')
+
+
+def test_command_not_found():
+    try:
+        UgeEnvironment.get_command_path(SGE_ROOT, SGE_CELL, 'no_such_command')
+        assert (False)
+    except ConfigurationError as ex:
+        pass
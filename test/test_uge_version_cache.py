@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# 
+# ___INFO__MARK_BEGIN__ 
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__ 
+# 
+# 
+import os
+import shutil
+import tempfile
+import time
+
+from .utils import create_config_file
+
+from uge.api.impl.qconf_executor import QconfExecutor
+from uge.config.config_manager import ConfigManager
+from uge.utility.uge_environment import UgeEnvironment
+from uge.utility.uge_version_cache import UgeVersionCache
+
+create_config_file()
+SGE_ROOT = tempfile.mkdtemp(prefix='uge_version_cache_')
+SGE_CELL = 'default'
+BIN_DIR = os.path.join(SGE_ROOT, 'bin')
+COUNTER_FILE = os.path.join(SGE_ROOT, 'counter')
+SETTINGS_COUNTER_FILE = os.path.join(SGE_ROOT, 'settings_counter')
+COMMAND_PATH = os.path.join(BIN_DIR, 'qconf')
+VERSION_CACHE_FILE = os.path.join(SGE_ROOT, 'version_cache.json')
+
+
+def write_qconf(version):
+    with open(COMMAND_PATH, 'w') as f:
+        f.write('#!/bin/sh\necho probed >> %s\necho "UGE %s"\n' % (COUNTER_FILE, version))
+    os.chmod(COMMAND_PATH, 0o755)
+
+
+def get_count(counter_file):
+    if not os.path.exists(counter_file):
+        return 0
+    with open(counter_file) as f:
+        return len(f.readlines())
+
+
+def get_probe_count():
+    return get_count(COUNTER_FILE)
+
+
+def create_executor():
+    return QconfExecutor(SGE_ROOT, SGE_CELL, 6444, 6445)
+
+
+def setup_module():
+    os.makedirs(os.path.join(SGE_ROOT, SGE_CELL, 'common'))
+    os.makedirs(BIN_DIR)
+    with open(UgeEnvironment.get_settings_file(SGE_ROOT, SGE_CELL), 'w') as f:
+        f.write('echo sourced >> %s\n' % SETTINGS_COUNTER_FILE)
+        f.write('PATH=%s:$PATH; export PATH\n' % BIN_DIR)
+    write_qconf('8.5.4')
+    UgeEnvironment.clear_cache()
+    UgeVersionCache.clear_cache()
+
+
+def teardown_module():
+    ConfigManager.get_instance().set_version_cache_file(None)
+    UgeEnvironment.clear_cache()
+    UgeVersionCache.clear_cache()
+    shutil.rmtree(SGE_ROOT)
+
+
+def test_version_shared_in_memory():
+    probe_count = get_probe_count()
+    assert (create_executor().get_uge_version() == '8.5.4')
+    assert (create_executor().get_uge_version() == '8.5.4')
+    assert (get_probe_count() == probe_count + 1)
+
+
+def test_version_persisted():
+    ConfigManager.get_instance().set_version_cache_file(VERSION_CACHE_FILE)
+    try:
+        UgeEnvironment.clear_cache()
+        UgeVersionCache.clear_cache()
+        probe_count = get_probe_count()
+        settings_count = get_count(SETTINGS_COUNTER_FILE)
+        create_executor()
+        assert (os.path.exists(VERSION_CACHE_FILE))
+        assert (get_probe_count() == probe_count + 1)
+        assert (get_count(SETTINGS_COUNTER_FILE) == settings_count + 1)
+        # Simulate new process: neither settings file nor qconf are executed
+        UgeEnvironment.clear_cache()
+        UgeVersionCache.clear_cache()
+        executor = create_executor()
+        assert (executor.get_uge_version() == '8.5.4')
+        assert (executor.command_env_dict['PATH'].startswith(BIN_DIR))
+        assert (get_probe_count() == probe_count + 1)
+        assert (get_count(SETTINGS_COUNTER_FILE) == settings_count + 1)
+    finally:
+        ConfigManager.get_instance().set_version_cache_file(None)
+
+
+def test_changed_binary_is_probed_again():
+    create_executor()
+    probe_count = get_probe_count()
+    write_qconf('8.6.0')
+    # Make sure modification time changes
+    os.utime(COMMAND_PATH, (time.time() + 10, time.time() + 10))
+    assert (create_executor().get_uge_version() == '8.6.0')
+    assert (get_probe_count() == probe_count + 1)
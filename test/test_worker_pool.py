@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# 
+# ___INFO__MARK_BEGIN__ 
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__ 
+# 
+import gc
+import threading
+import weakref
+
+from .utils import create_config_file
+
+from uge.utility.uge_worker_pool import UgeWorkerPool
+from uge.exceptions.command_failed import CommandFailed
+
+create_config_file()
+POOL = UgeWorkerPool(2, init_command='MY_VAR=initialized; export MY_VAR')
+
+
+def test_execute():
+    p = POOL.create_process('echo hello')
+    p.run()
+    assert (p.get_stdout() == 'hello\n')
+    assert (p.get_stderr() == '')
+    assert (p.get_exit_status() == 0)
+
+
+def test_init_command_environment():
+    p = POOL.create_process('echo $MY_VAR')
+    p.run()
+    assert (p.get_stdout() == 'initialized\n')
+
+
+def test_stderr_and_exit_status():
+    p = POOL.create_process('echo out; echo err >&2; exit 3', use_exceptions=False)
+    p.run()
+    assert (p.get_stdout() == 'out\n')
+    assert (p.get_stderr() == 'err\n')
+    assert (p.get_exit_status() == 3)
+
+
+def test_command_failed():
+    try:
+        POOL.create_process('echo failure >&2; false').run()
+        assert (False)
+    except CommandFailed as ex:
+        assert (ex.get_command_stderr() == 'failure\n')
+        assert (ex.get_command_exit_status() == 1)
+
+
+def test_worker_survives_bad_command():
+    p = POOL.create_process("echo 'unterminated", use_exceptions=False)
+    p.run()
+    assert (p.get_exit_status() != 0)
+    p = POOL.create_process('echo still alive')
+    p.run()
+    assert (p.get_stdout() == 'still alive\n')
+
+
+def test_output_without_trailing_newline():
+    p = POOL.create_process('printf abc')
+    p.run()
+    assert (p.get_stdout() == 'abc')
+
+
+def test_concurrent_execution():
+    results = {}
+
+    def worker(i):
+        p = POOL.create_process('echo %s' % i)
+        p.run()
+        results[i] = p.get_stdout().strip()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for i in range(20):
+        assert (results[i] == str(i))
+    assert (POOL.n_workers <= 2)
+
+
+def test_closed_pool_is_released():
+    pool = UgeWorkerPool(1)
+    pool.create_process('true').run()
+    pool.close()
+    pool_ref = weakref.ref(pool)
+    del pool
+    gc.collect()
+    assert (pool_ref() is None)
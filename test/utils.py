@@ -24,6 +24,8 @@ import random
 import os
 import os.path
 import json
+import shutil
+import tempfile
 from tempfile import NamedTemporaryFile
 
 from nose import SkipTest
@@ -111,6 +113,57 @@ def create_config_manager():
     cm.set_file_log_level('trace')
 
 
+def create_fake_sge_root(qconf_script, sge_root=None, sge_cell='default'):
+    # Fake cell: settings.sh puts bin directory on the PATH, and
+    # bin/qconf is the given shell script
+    from uge.utility.uge_environment import UgeEnvironment
+    from uge.utility.uge_version_cache import UgeVersionCache
+    if not sge_root:
+        sge_root = tempfile.mkdtemp(prefix='sge_root_')
+    bin_dir = os.path.join(sge_root, 'bin')
+    os.makedirs(os.path.join(sge_root, sge_cell, 'common'))
+    os.makedirs(bin_dir)
+    with open(os.path.join(sge_root, sge_cell, 'common', 'settings.sh'), 'w') as f:
+        f.write('PATH=%s:$PATH; export PATH\n' % bin_dir)
+    command_path = os.path.join(bin_dir, 'qconf')
+    with open(command_path, 'w') as f:
+        f.write(qconf_script)
+    os.chmod(command_path, 0o755)
+    UgeEnvironment.clear_cache()
+    UgeVersionCache.clear_cache()
+    return sge_root
+
+
+def create_qconf_script(option_file_dict, empty_file_error_dict=None, uge_version='8.5.4'):
+    # Fake qconf script that prints content of the given file for each
+    # option (e.g., {'-shgrpld': hgrp_file}); for options listed in
+    # empty_file_error_dict, empty or missing file results in the given error
+    empty_file_error_dict = empty_file_error_dict or {}
+    case_list = ['    -help) echo "UGE %s";;' % uge_version]
+    for option in sorted(option_file_dict.keys()):
+        filename = option_file_dict[option]
+        if option in empty_file_error_dict:
+            case_list.append('    %s) if [ -s %s ]; then cat %s; else echo "%s" >&2; exit 1; fi;;' % (
+                option, filename, filename, empty_file_error_dict[option]))
+        else:
+            case_list.append('    %s) cat %s;;' % (option, filename))
+    return '#!/bin/sh\ncase "$1" in\n%s\nesac\n' % '\n'.join(case_list)
+
+
+def write_bulk_objects(filename, object_list):
+    # Objects are written as bulk qconf output (e.g., qconf -shgrpld)
+    with open(filename, 'w') as f:
+        f.write('==================\n'.join(object_list))
+
+
+def remove_fake_sge_root(sge_root):
+    from uge.utility.uge_environment import UgeEnvironment
+    from uge.utility.uge_version_cache import UgeVersionCache
+    UgeEnvironment.clear_cache()
+    UgeVersionCache.clear_cache()
+    shutil.rmtree(sge_root)
+
+
 def generate_random_string(size, chars=string.ascii_lowercase + string.ascii_uppercase + string.digits):
     return ''.join(random.choice(chars) for _ in range(size))
 
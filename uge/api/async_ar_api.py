@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+#
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+#
+__docformat__ = 'reStructuredText'
+
+import asyncio
+import json
+from functools import wraps
+from uge.log.log_manager import LogManager
+from uge.exceptions.ar_exception import AdvanceReservationException
+from uge.api.ar_api import AdvanceReservationApi
+from uge.api.impl.async_executor import AsyncExecutor
+
+
+# Make sure only ar specific exceptions are raised
+def async_api_call(func):
+    @wraps(func)
+    async def wrapped_call(*args, **kwargs):
+        try:
+            return await func(*args, **kwargs)
+        except AdvanceReservationException:
+            raise
+        except Exception as ex:
+            raise AdvanceReservationException(exception=ex)
+
+    return wrapped_call
+
+
+class AsyncAdvanceReservationApi(object):
+    """
+    Asynchronous (asyncio) advance reservation API class.
+
+    All methods that execute qrstat, qrsub or qrdel are coroutines that run
+    those commands as asyncio subprocesses, and use the same command
+    construction, error classification and output parsing as the
+    corresponding AdvanceReservationApi methods.
+
+    >>> api = AsyncAdvanceReservationApi(sge_root='/opt/uge')
+    >>> ar_id = await api.request_ar('-d 3600 -fr y')
+    """
+
+    logger = None
+
+    def __init__(self, sge_root=None, sge_cell=None,
+                 sge_qmaster_port=None, sge_execd_port=None,
+                 max_processes=AsyncExecutor.DEFAULT_MAX_PROCESSES):
+        """
+        Class constructor. Constructor retrieves UGE version synchronously.
+
+        :param sge_root: SGE root directory. It can be set via environment variable SGE_ROOT.
+        :type sge_root: str
+
+        :param sge_cell: SGE cell name. It can be set via environment variable SGE_CELL. Default cell name is 'default'.
+        :type sge_cell: str
+
+        :param sge_qmaster_port: SGE Qmaster port. It can be set via environment variable SGE_QMASTER_PORT. Default port is 6444.
+        :type sge_qmaster_port: int
+
+        :param sge_execd_port: SGE Execd port. It can be set via environment variable SGE_EXECD_PORT. Default port is 6445.
+        :type sge_execd_port: int
+
+        :param max_processes: Maximum number of processes per command (qrstat, qrsub, qrdel) running at the same time. Default is 64.
+        :type max_processes: int
+
+        :raises ConfigurationError: in case sge_root is not provided, and environment variable SGE_ROOT is not defined.
+        :raises QmasterUnreachable: in case UGE Qmaster cannot be reached.
+        :raises AdvanceReservationException: for any other errors.
+
+        >>> api = AsyncAdvanceReservationApi(sge_root='/opt/uge')
+        """
+        self.get_logger()
+        self.ar_api = AdvanceReservationApi(sge_root=sge_root, sge_cell=sge_cell,
+                                            sge_qmaster_port=sge_qmaster_port, sge_execd_port=sge_execd_port)
+        qrstat_executor = self.ar_api.qrstat_executor
+        qrsub_executor = self.ar_api.qrsub_executor
+        qrdel_executor = self.ar_api.qrdel_executor
+        self.async_qrstat_executor = AsyncExecutor(qrstat_executor.env_dict, 'qrstat',
+                                                   qrstat_executor.check_qrstat_error, max_processes=max_processes)
+        self.async_qrsub_executor = AsyncExecutor(qrsub_executor.env_dict, 'qrsub',
+                                                  qrsub_executor.check_qrsub_error, max_processes=max_processes)
+        self.async_qrdel_executor = AsyncExecutor(qrdel_executor.env_dict, 'qrdel',
+                                                  qrdel_executor.check_qrdel_error, max_processes=max_processes)
+
+    @classmethod
+    def get_logger(cls):
+        if not cls.logger:
+            cls.logger = LogManager.get_instance().get_logger(cls.__name__)
+        return cls.logger
+
+    def get_uge_version(self):
+        """ Same as AdvanceReservationApi.get_uge_version(). """
+        return self.ar_api.get_uge_version()
+
+    def generate_object(self, json_string, target_uge_version=None):
+        """ Same as AdvanceReservationApi.generate_object(). """
+        return self.ar_api.generate_object(json_string, target_uge_version)
+
+    @async_api_call
+    async def get_ar(self, name):
+        """ Asynchronous version of AdvanceReservationApi.get_ar(). """
+        qrstat_executor = self.ar_api.qrstat_executor
+        qrstat_output = await self.async_qrstat_executor.execute(qrstat_executor.get_ar_args(name))
+        return json.loads(qrstat_output)
+
+    @async_api_call
+    async def get_ar_summary(self):
+        """ Asynchronous version of AdvanceReservationApi.get_ar_summary(). """
+        qrstat_executor = self.ar_api.qrstat_executor
+        qrstat_output = await self.async_qrstat_executor.execute(qrstat_executor.AR_SUMMARY_ARGS)
+        return json.loads(qrstat_output)
+
+    @async_api_call
+    async def get_ar_list(self):
+        """ Asynchronous version of AdvanceReservationApi.get_ar_list(). """
+        qrstat_executor = self.ar_api.qrstat_executor
+        qrstat_output = await self.async_qrstat_executor.execute(qrstat_executor.AR_LIST_ARGS)
+        return qrstat_executor.create_ar_list_from_qrstat_output(qrstat_output)
+
+    @async_api_call
+    async def request_ar(self, argstr):
+        """ Asynchronous version of AdvanceReservationApi.request_ar(). """
+        qrsub_output = await self.async_qrsub_executor.execute(argstr)
+        return self.ar_api.qrsub_executor.get_ar_id_from_qrsub_output(qrsub_output)
+
+    @async_api_call
+    async def delete_ar(self, name):
+        """ Asynchronous version of AdvanceReservationApi.delete_ar(). """
+        return await self.async_qrdel_executor.execute([name])
+
+
+#############################################################################
+# Testing.
+if __name__ == '__main__':
+    async def main():
+        api = AsyncAdvanceReservationApi()
+        print(api.get_uge_version())
+        ar_id = await api.request_ar('-d 3600 -fr y')
+        print('AR: ', await api.get_ar(ar_id))
+        print('AR LIST: ', await api.get_ar_list())
+        print(await api.delete_ar(ar_id))
+
+    asyncio.get_event_loop().run_until_complete(main())
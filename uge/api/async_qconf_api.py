@@ -0,0 +1,413 @@
+#!/usr/bin/env python
+#
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+#
+__docformat__ = 'reStructuredText'
+
+import asyncio
+import functools
+from functools import wraps
+from uge.log.log_manager import LogManager
+from uge.exceptions.qconf_exception import QconfException
+from uge.exceptions.object_not_found import ObjectNotFound
+from uge.api.qconf_api import QconfApi
+from uge.api.impl.qconf_object_cache import QconfObjectCache
+from uge.api.impl.async_executor import AsyncExecutor
+from uge.api.impl.qconf_watcher import QconfWatcher
+
+
+# Make sure only qconf exceptions are raised
+def async_api_call(func):
+    @wraps(func)
+    async def wrapped_call(*args, **kwargs):
+        try:
+            return await func(*args, **kwargs)
+        except QconfException:
+            raise
+        except Exception as ex:
+            raise QconfException(exception=ex)
+
+    return wrapped_call
+
+
+class AsyncQconfApi(object):
+    """
+    Asynchronous (asyncio) qconf API class.
+
+    Retrieval methods (get_*, list_*) are coroutines that run qconf as
+    asyncio subprocesses, and use the same command construction, error
+    classification and object parsing as the corresponding QconfApi
+    methods. All other QconfApi methods are available as well:
+    generate_* methods and methods that do not execute qconf are
+    regular methods, while methods that modify UGE configuration are
+    coroutines executed in the event loop's default thread pool executor.
+
+    >>> api = AsyncQconfApi(sge_root='/opt/uge')
+    >>> queues = await asyncio.gather(*[api.get_queue(name) for name in (await api.list_queues())])
+    """
+
+    # QconfApi methods that do not execute qconf
+    SYNC_METHOD_NAMES = ['get_uge_version', 'get_logger', 'generate_object',
+                         'get_cache_stats', 'clear_cache', 'close', 'create_watcher']
+
+    logger = None
+
+    def __init__(self, sge_root=None, sge_cell=None,
+                 sge_qmaster_port=None, sge_execd_port=None,
+                 max_processes=AsyncExecutor.DEFAULT_MAX_PROCESSES,
+                 cache_ttl=None, cache_size=QconfObjectCache.DEFAULT_SIZE):
+        """
+        Class constructor. Constructor retrieves UGE version synchronously.
+
+        :param sge_root: SGE root directory. It can be set via environment variable SGE_ROOT.
+        :type sge_root: str
+
+        :param sge_cell: SGE cell name. It can be set via environment variable SGE_CELL. Default cell name is 'default'.
+        :type sge_cell: str
+
+        :param sge_qmaster_port: SGE Qmaster port. It can be set via environment variable SGE_QMASTER_PORT. Default port is 6444.
+        :type sge_qmaster_port: int
+
+        :param sge_execd_port: SGE Execd port. It can be set via environment variable SGE_EXECD_PORT. Default port is 6445.
+        :type sge_execd_port: int
+
+        :param max_processes: Maximum number of qconf processes running at the same time; additional requests wait for a running process to complete. Default is 64.
+        :type max_processes: int
+
+        :param cache_ttl: Time-to-live (in seconds) for objects kept in the read-through object cache. If not provided, objects are not cached.
+        :type cache_ttl: float
+
+        :param cache_size: Maximum number of objects kept in the object cache. Default cache size is 1000.
+        :type cache_size: int
+
+        :raises ConfigurationError: in case sge_root is not provided, and environment variable SGE_ROOT is not defined.
+        :raises QmasterUnreachable: in case UGE Qmaster cannot be reached.
+        :raises QconfException: for any other errors.
+
+        >>> api = AsyncQconfApi(sge_root='/opt/uge', max_processes=32)
+        """
+        self.get_logger()
+        self.qconf_api = QconfApi(sge_root=sge_root, sge_cell=sge_cell,
+                                  sge_qmaster_port=sge_qmaster_port, sge_execd_port=sge_execd_port,
+                                  cache_ttl=cache_ttl, cache_size=cache_size)
+        qconf_executor = self.qconf_api.qconf_executor
+        self.async_executor = AsyncExecutor(qconf_executor.env_dict, 'qconf', qconf_executor.check_qconf_error,
+                                            max_processes=max_processes)
+
+    @classmethod
+    def get_logger(cls):
+        if not cls.logger:
+            cls.logger = LogManager.get_instance().get_logger(cls.__name__)
+        return cls.logger
+
+    def __getattr__(self, name):
+        # Delegate remaining methods to synchronous API
+        attr = getattr(self.__dict__.get('qconf_api'), name)
+        if not callable(attr) or name.startswith('generate_') or name in self.SYNC_METHOD_NAMES:
+            return attr
+
+        @wraps(attr)
+        async def run_in_executor(*args, **kwargs):
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(None, functools.partial(attr, *args, **kwargs))
+
+        return run_in_executor
+
+    async def __execute_qconf(self, manager, cmd):
+        return await self.async_executor.execute(cmd, manager.QCONF_ERROR_REGEX_LIST,
+                                                 failure_regex_list=manager.QCONF_FAILURE_REGEX_LIST)
+
+    async def __get_object(self, manager, name):
+        retrieved_object = manager.get_cached_object(name)
+        if retrieved_object is not None:
+            return retrieved_object
+        qconf_output = await self.__execute_qconf(manager, manager.get_object_args(name))
+        retrieved_object = manager.create_object_from_qconf_output(name, qconf_output)
+        manager.cache_object(name, retrieved_object)
+        return retrieved_object
+
+    async def __get_objects(self, manager):
+        qconf_output = await self.__execute_qconf(manager, manager.get_objects_args())
+        return manager.parse_bulk_output(qconf_output)
+
+    async def __list_objects(self, manager):
+        try:
+            qconf_output = await self.__execute_qconf(manager, manager.get_list_objects_args())
+        except ObjectNotFound:
+            qconf_output = ''
+        return manager.create_object_list_from_qconf_output(qconf_output)
+
+    async def __list_names(self, manager):
+        try:
+            qconf_output = await self.__execute_qconf(manager, manager.get_list_names_args())
+        except ObjectNotFound:
+            qconf_output = ''
+        return manager.create_name_list_from_qconf_output(qconf_output)
+
+    async def __get_bulk_output(self, manager):
+        try:
+            return await self.__execute_qconf(manager, manager.get_objects_args())
+        except ObjectNotFound:
+            return ''
+
+    async def watch(self, classes=None, interval=QconfWatcher.DEFAULT_INTERVAL, initial_events=False):
+        """ Asynchronous version of QconfApi.watch(); classes are polled concurrently, and events are yielded by an asynchronous generator.
+
+        >>> async for event in api.watch(classes=['ClusterQueue'], interval=10):
+        ...     print(event.event_type, event.name)
+        """
+        watcher = QconfWatcher(self.qconf_api, classes=classes, interval=interval, initial_events=initial_events)
+        loop = asyncio.get_event_loop()
+        while True:
+            start_time = loop.time()
+            outputs = await asyncio.gather(*[self.__get_bulk_output(watcher.get_manager(class_name))
+                                             for class_name in watcher.classes])
+            for (class_name, output) in zip(watcher.classes, outputs):
+                for event in watcher.process_output(class_name, output.split('\n')):
+                    yield event
+            await asyncio.sleep(max(0, interval - (loop.time() - start_time)))
+
+    @async_api_call
+    async def get_queue(self, name):
+        """ Asynchronous version of QconfApi.get_queue(). """
+        return await self.__get_object(self.qconf_api.cluster_queue_manager, name)
+
+    @async_api_call
+    async def get_queues(self):
+        """ Asynchronous version of QconfApi.get_queues(). """
+        return await self.__get_objects(self.qconf_api.cluster_queue_manager)
+
+    @async_api_call
+    async def list_queues(self):
+        """ Asynchronous version of QconfApi.list_queues(). """
+        return await self.__list_objects(self.qconf_api.cluster_queue_manager)
+
+    @async_api_call
+    async def get_pe(self, name):
+        """ Asynchronous version of QconfApi.get_pe(). """
+        return await self.__get_object(self.qconf_api.parallel_environment_manager, name)
+
+    @async_api_call
+    async def get_pes(self):
+        """ Asynchronous version of QconfApi.get_pes(). """
+        return await self.__get_objects(self.qconf_api.parallel_environment_manager)
+
+    @async_api_call
+    async def list_pes(self):
+        """ Asynchronous version of QconfApi.list_pes(). """
+        return await self.__list_objects(self.qconf_api.parallel_environment_manager)
+
+    @async_api_call
+    async def get_ehost(self, name):
+        """ Asynchronous version of QconfApi.get_ehost(). """
+        return await self.__get_object(self.qconf_api.execution_host_manager, name)
+
+    @async_api_call
+    async def get_ehosts(self):
+        """ Asynchronous version of QconfApi.get_ehosts(). """
+        return await self.__get_objects(self.qconf_api.execution_host_manager)
+
+    @async_api_call
+    async def list_ehosts(self):
+        """ Asynchronous version of QconfApi.list_ehosts(). """
+        return await self.__list_objects(self.qconf_api.execution_host_manager)
+
+    @async_api_call
+    async def get_hgrp(self, name):
+        """ Asynchronous version of QconfApi.get_hgrp(). """
+        return await self.__get_object(self.qconf_api.host_group_manager, name)
+
+    @async_api_call
+    async def get_hgrps(self):
+        """ Asynchronous version of QconfApi.get_hgrps(). """
+        return await self.__get_objects(self.qconf_api.host_group_manager)
+
+    @async_api_call
+    async def list_hgrps(self):
+        """ Asynchronous version of QconfApi.list_hgrps(). """
+        return await self.__list_objects(self.qconf_api.host_group_manager)
+
+    @async_api_call
+    async def list_shosts(self):
+        """ Asynchronous version of QconfApi.list_shosts(). """
+        return await self.__list_names(self.qconf_api.submit_host_manager)
+
+    @async_api_call
+    async def list_ahosts(self):
+        """ Asynchronous version of QconfApi.list_ahosts(). """
+        return await self.__list_names(self.qconf_api.admin_host_manager)
+
+    @async_api_call
+    async def list_operators(self):
+        """ Asynchronous version of QconfApi.list_operators(). """
+        return await self.__list_names(self.qconf_api.operator_manager)
+
+    @async_api_call
+    async def list_managers(self):
+        """ Asynchronous version of QconfApi.list_managers(). """
+        return await self.__list_names(self.qconf_api.manager_manager)
+
+    @async_api_call
+    async def get_user(self, name):
+        """ Asynchronous version of QconfApi.get_user(). """
+        return await self.__get_object(self.qconf_api.user_manager, name)
+
+    @async_api_call
+    async def get_users(self):
+        """ Asynchronous version of QconfApi.get_users(). """
+        return await self.__get_objects(self.qconf_api.user_manager)
+
+    @async_api_call
+    async def list_users(self):
+        """ Asynchronous version of QconfApi.list_users(). """
+        return await self.__list_objects(self.qconf_api.user_manager)
+
+    @async_api_call
+    async def get_prj(self, name):
+        """ Asynchronous version of QconfApi.get_prj(). """
+        return await self.__get_object(self.qconf_api.project_manager, name)
+
+    @async_api_call
+    async def get_prjs(self):
+        """ Asynchronous version of QconfApi.get_prjs(). """
+        return await self.__get_objects(self.qconf_api.project_manager)
+
+    @async_api_call
+    async def list_prjs(self):
+        """ Asynchronous version of QconfApi.list_prjs(). """
+        return await self.__list_objects(self.qconf_api.project_manager)
+
+    @async_api_call
+    async def get_cal(self, name):
+        """ Asynchronous version of QconfApi.get_cal(). """
+        return await self.__get_object(self.qconf_api.calendar_manager, name)
+
+    @async_api_call
+    async def get_cals(self):
+        """ Asynchronous version of QconfApi.get_cals(). """
+        return await self.__get_objects(self.qconf_api.calendar_manager)
+
+    @async_api_call
+    async def list_cals(self):
+        """ Asynchronous version of QconfApi.list_cals(). """
+        return await self.__list_objects(self.qconf_api.calendar_manager)
+
+    @async_api_call
+    async def get_ckpt(self, name):
+        """ Asynchronous version of QconfApi.get_ckpt(). """
+        return await self.__get_object(self.qconf_api.checkpointing_environment_manager, name)
+
+    @async_api_call
+    async def get_ckpts(self):
+        """ Asynchronous version of QconfApi.get_ckpts(). """
+        return await self.__get_objects(self.qconf_api.checkpointing_environment_manager)
+
+    @async_api_call
+    async def list_ckpts(self):
+        """ Asynchronous version of QconfApi.list_ckpts(). """
+        return await self.__list_objects(self.qconf_api.checkpointing_environment_manager)
+
+    @async_api_call
+    async def get_acl(self, name):
+        """ Asynchronous version of QconfApi.get_acl(). """
+        return await self.__get_object(self.qconf_api.access_list_manager, name)
+
+    @async_api_call
+    async def get_acls(self):
+        """ Asynchronous version of QconfApi.get_acls(). """
+        return await self.__get_objects(self.qconf_api.access_list_manager)
+
+    @async_api_call
+    async def list_acls(self):
+        """ Asynchronous version of QconfApi.list_acls(). """
+        return await self.__list_objects(self.qconf_api.access_list_manager)
+
+    @async_api_call
+    async def get_sconf(self):
+        """ Asynchronous version of QconfApi.get_sconf(). """
+        return await self.__get_object(self.qconf_api.scheduler_configuration_manager, '')
+
+    @async_api_call
+    async def get_jc(self, name):
+        """ Asynchronous version of QconfApi.get_jc(). """
+        return await self.__get_object(self.qconf_api.job_class_manager, name)
+
+    @async_api_call
+    async def list_jcs(self):
+        """ Asynchronous version of QconfApi.list_jcs(). """
+        return await self.__list_objects(self.qconf_api.job_class_manager)
+
+    @async_api_call
+    async def get_conf(self, name='global'):
+        """ Asynchronous version of QconfApi.get_conf(). """
+        return await self.__get_object(self.qconf_api.cluster_configuration_manager, name)
+
+    @async_api_call
+    async def list_confs(self):
+        """ Asynchronous version of QconfApi.list_confs(). """
+        return await self.__list_objects(self.qconf_api.cluster_configuration_manager)
+
+    @async_api_call
+    async def get_cconf(self):
+        """ Asynchronous version of QconfApi.get_cconf(). """
+        return await self.__get_object(self.qconf_api.complex_configuration_manager, '')
+
+    @async_api_call
+    async def get_rqs(self, name):
+        """ Asynchronous version of QconfApi.get_rqs(). """
+        return await self.__get_object(self.qconf_api.resource_quota_set_manager, name)
+
+    @async_api_call
+    async def list_rqss(self):
+        """ Asynchronous version of QconfApi.list_rqss(). """
+        return await self.__list_objects(self.qconf_api.resource_quota_set_manager)
+
+    @async_api_call
+    async def get_stree(self):
+        """ Asynchronous version of QconfApi.get_stree(). """
+        manager = self.qconf_api.share_tree_manager
+        retrieved_object = manager.get_cached_object()
+        if retrieved_object is not None:
+            return retrieved_object
+        qconf_output = await self.__execute_qconf(manager, manager.get_object_args())
+        retrieved_object = manager.create_object_from_qconf_output(qconf_output)
+        manager.cache_object(retrieved_object)
+        return retrieved_object
+
+    @async_api_call
+    async def get_stree_if_exists(self):
+        """ Asynchronous version of QconfApi.get_stree_if_exists(). """
+        try:
+            return await self.get_stree()
+        except ObjectNotFound:
+            return self.qconf_api.share_tree_manager.generate_object(data=[], add_required_data=False)
+
+
+#############################################################################
+# Testing.
+if __name__ == '__main__':
+    async def main():
+        api = AsyncQconfApi()
+        print(api.get_uge_version())
+        queue_names = await api.list_queues()
+        for queue in await asyncio.gather(*[api.get_queue(name) for name in queue_names]):
+            print(queue.to_uge())
+
+    asyncio.get_event_loop().run_until_complete(main())
@@ -54,7 +54,14 @@ class AccessListManager(DictBasedObjectManager):
 
     def delete_object(self, name):
         deleted_object = self.get_object(name)
-        self.qconf_executor.execute_qconf('-dul %s' % (name), self.QCONF_ERROR_REGEX_LIST)
+        self.qconf_executor.execute_qconf(['-dul', name], self.QCONF_ERROR_REGEX_LIST)
+        self.invalidate_cached_object(name)
+
+    def delete_objects(self, name_list):
+        # Unlike for other objects, qconf -du removes users from access lists
+        self.qconf_executor.execute_qconf(['-dul', ','.join(name_list)], self.QCONF_ERROR_REGEX_LIST)
+        for name in name_list:
+            self.invalidate_cached_object(name)
 
     def __check_and_prepare_input(self, input_value, input_arg_name):
         if type(input_value) == bytes or type(input_value) == str:
@@ -74,9 +81,10 @@ class AccessListManager(DictBasedObjectManager):
     def add_users_to_acls(self, user_names, access_list_names):
         user_name_list = self.__check_and_prepare_input(user_names, 'user_names')
         acl_name_list = self.__check_and_prepare_input(access_list_names, 'access_list_names')
-        self.qconf_executor.execute_qconf('-au %s %s' % (user_name_list, acl_name_list), self.QCONF_ERROR_REGEX_LIST)
+        self.qconf_executor.execute_qconf(['-au', user_name_list, acl_name_list], self.QCONF_ERROR_REGEX_LIST)
         acl_list = []
         for acl_name in acl_name_list.split(','):
+            self.invalidate_cached_object(acl_name)
             acl = self.get_object(acl_name)
             acl_list.append(acl)
         return acl_list
@@ -84,9 +92,10 @@ class AccessListManager(DictBasedObjectManager):
     def delete_users_from_acls(self, user_names, access_list_names):
         user_name_list = self.__check_and_prepare_input(user_names, 'user_names')
         acl_name_list = self.__check_and_prepare_input(access_list_names, 'access_list_names')
-        self.qconf_executor.execute_qconf('-du %s %s' % (user_name_list, acl_name_list), self.QCONF_ERROR_REGEX_LIST)
+        self.qconf_executor.execute_qconf(['-du', user_name_list, acl_name_list], self.QCONF_ERROR_REGEX_LIST)
         acl_list = []
         for acl_name in acl_name_list.split(','):
+            self.invalidate_cached_object(acl_name)
             acl = self.get_object(acl_name)
             acl_list.append(acl)
         return acl_list
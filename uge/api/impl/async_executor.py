@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+#
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+#
+import asyncio
+
+from uge.log.log_manager import LogManager
+from uge.utility.uge_environment import UgeEnvironment
+from uge.exceptions.invalid_argument import InvalidArgument
+
+
+class AsyncExecutor(object):
+    """
+    Executes UGE commands (qconf, qrstat, etc.) as asyncio subprocesses.
+
+    Command outcome is classified by the corresponding synchronous
+    executor (e.g., QconfExecutor.check_qconf_error()), so that
+    asynchronous API calls raise the same exceptions as synchronous ones.
+    The number of commands running at the same time is bounded.
+
+    Usage:
+        executor = AsyncExecutor(qconf_executor.env_dict, 'qconf', qconf_executor.check_qconf_error)
+        qconf_output = await executor.execute(['-sq', 'all.q'])
+    """
+
+    DEFAULT_MAX_PROCESSES = 64
+
+    def __init__(self, env_dict, command, check_error, max_processes=DEFAULT_MAX_PROCESSES):
+        """
+        :param env_dict: Base environment; must contain SGE_ROOT and SGE_CELL.
+        :type env_dict: dict
+
+        :param command: Command name (e.g., 'qconf').
+        :type command: str
+
+        :param check_error: Function invoked as check_error(stderr, exit_status, error_regex_list=..., error_details=..., failure_regex_list=...), that raises exception in case command failed.
+        :type check_error: callable
+
+        :param max_processes: Maximum number of commands running at the same time.
+        :type max_processes: int
+        """
+        self.logger = LogManager.get_instance().get_logger(self.__class__.__name__)
+        if not max_processes or max_processes < 1:
+            raise InvalidArgument('Maximum number of processes must be a positive number.')
+        self.env_dict = env_dict
+        self.command_env_dict = UgeEnvironment.get_command_env(env_dict)
+        self.command = command
+        self.check_error = check_error
+        self.max_processes = max_processes
+        # Semaphores cannot be shared between event loops
+        self.semaphore_loop = None
+        self.semaphore = None
+
+    def __get_semaphore(self):
+        loop = asyncio.get_event_loop()
+        if self.semaphore_loop is not loop:
+            self.semaphore = asyncio.Semaphore(self.max_processes)
+            self.semaphore_loop = loop
+        return self.semaphore
+
+    async def execute(self, cmd, error_regex_list=[], error_details=None, failure_regex_list=[]):
+        """
+        :param cmd: Command arguments, either as a list, or as a string using shell quoting rules.
+        :type cmd: list or str
+
+        :returns: Command standard output.
+        """
+        argv = UgeEnvironment.get_command_argv(self.env_dict['SGE_ROOT'], self.env_dict['SGE_CELL'],
+                                               self.command, cmd)
+        async with self.__get_semaphore():
+            self.logger.debug('Invoking asynchronously: [%s]' % argv)
+            p = await asyncio.create_subprocess_exec(*argv, stdout=asyncio.subprocess.PIPE,
+                                                     stderr=asyncio.subprocess.PIPE, env=self.command_env_dict)
+            (stdout, stderr) = await p.communicate()
+        self.logger.debug('Exit status: %s' % p.returncode)
+        self.check_error(stderr.decode(), p.returncode, error_regex_list=error_regex_list,
+                         error_details=error_details, failure_regex_list=failure_regex_list)
+        return stdout.decode()
+
+
+#############################################################################
+# Testing.
+if __name__ == '__main__':
+    pass
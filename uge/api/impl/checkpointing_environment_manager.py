@@ -39,6 +39,7 @@ class CheckpointingEnvironmentManager(DictBasedObjectManager):
     OBJECT_CLASS_NAME = 'CheckpointingEnvironment'
     OBJECT_CLASS_UGE_NAME = 'ckpt'
     OBJECT_CLASS_UGE_LIST_DETAILS_NAME = 'ld'
+    OBJECT_CLASS_UGE_ATTRIBUTE_NAME = 'ckpt'
 
     def __init__(self, qconf_executor):
         DictBasedObjectManager.__init__(self, qconf_executor)
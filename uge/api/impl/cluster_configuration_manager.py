@@ -57,14 +57,17 @@ class ClusterConfigurationManager(DictBasedObjectManager):
         if pycl_object.name == 'global':
             raise InvalidRequest('Global cluster configuration cannot be deleted.')
 
-    def get_object(self, name):
+    def get_object_args(self, name):
         if name == 'global':
             # This avoids name resolution for 'global'
-            pycl_object = DictBasedObjectManager.get_object(self, '')
-            pycl_object.name = name
-        else:
-            pycl_object = DictBasedObjectManager.get_object(self, name)
-        return pycl_object
+            return DictBasedObjectManager.get_object_args(self, '')
+        return DictBasedObjectManager.get_object_args(self, name)
+
+    def get_cache_name(self, name):
+        # Global configuration is retrieved without name
+        if name == 'global':
+            return ''
+        return name
 
     def get_bulk_dump_filename(self, object):
         return 'conf_api_dump_' + object.data['hostname']
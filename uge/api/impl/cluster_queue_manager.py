@@ -24,6 +24,7 @@ from uge.exceptions.object_not_found import ObjectNotFound
 from uge.exceptions.invalid_request import InvalidRequest
 from uge.objects.qconf_object_factory import QconfObjectFactory
 from .dict_based_object_manager import DictBasedObjectManager
+from .queue_configuration_resolver import QueueConfigurationResolver
 
 
 class ClusterQueueManager(DictBasedObjectManager):
@@ -40,6 +41,7 @@ class ClusterQueueManager(DictBasedObjectManager):
     OBJECT_CLASS_NAME = 'ClusterQueue'
     OBJECT_CLASS_UGE_NAME = 'q'
     OBJECT_CLASS_UGE_LIST_DETAILS_NAME = 'ld'
+    OBJECT_CLASS_UGE_ATTRIBUTE_NAME = 'queue'
 
     def __init__(self, qconf_executor):
         DictBasedObjectManager.__init__(self, qconf_executor)
@@ -47,6 +49,22 @@ class ClusterQueueManager(DictBasedObjectManager):
     def get_bulk_dump_filename(self, object):
         return 'conf_api_dump_' + object.data['qname']
 
+    def get_resolver(self, host_group_index):
+        """
+        Retrieve all queues with a single bulk qconf call, and create
+        resolver for configuration of their instances.
+
+        :param host_group_index: Host group index used for resolving host group membership.
+        :type host_group_index: HostGroupIndex
+
+        :returns: QueueConfigurationResolver object.
+        """
+        try:
+            queue_list = list(self.iter_objects())
+        except ObjectNotFound:
+            queue_list = []
+        return QueueConfigurationResolver(queue_list, host_group_index)
+
 
 #############################################################################
 # Testing.
@@ -0,0 +1,369 @@
+#!/usr/bin/env python
+#
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+#
+import datetime
+import gzip
+import hashlib
+import json
+import time
+
+from uge.log.log_manager import LogManager
+from uge.config.config_manager import ConfigManager
+from uge.exceptions.invalid_argument import InvalidArgument
+from uge.exceptions.object_not_found import ObjectNotFound
+from uge.objects.qconf_name_list import QconfNameList
+from uge.objects.qconf_object_factory import QconfObjectFactory
+from .parallel_executor import ParallelExecutor
+
+
+class ClusterSnapshot(object):
+    """
+    Configuration of a whole UGE cell: all objects of each snapshot class,
+    together with UGE version and creation metadata.
+
+    Snapshot file is a (optionally gzipped) sequence of compact JSON lines:
+    a header line, followed by a section line for each class (containing
+    class name, object count and content fingerprint) and by one line for
+    each object of that class. Objects are therefore read back one at a time,
+    and can also be processed with tools that handle JSON lines.
+    """
+
+    SNAPSHOT_FORMAT_VERSION = '1.0'
+    JSON_SEPARATORS = (',', ':')
+
+    def __init__(self, uge_version, object_dict=None, metadata=None):
+        """
+        :param uge_version: UGE version of snapshot objects.
+        :type uge_version: str
+
+        :param object_dict: Dictionary of object lists, keyed by snapshot class name.
+        :type object_dict: dict
+
+        :param metadata: Snapshot metadata (creation user and time, etc.).
+        :type metadata: dict
+        """
+        self.uge_version = uge_version
+        self.object_dict = object_dict or {}
+        self.metadata = metadata or {}
+
+    def __repr__(self):
+        return 'ClusterSnapshot(%s: %s)' % (self.uge_version, self.get_summary())
+
+    def get_class_names(self):
+        return sorted(self.object_dict.keys())
+
+    def get_objects(self, class_name):
+        """
+        :returns: List of objects of a given snapshot class (empty list if class is not in the snapshot).
+        """
+        return self.object_dict.get(class_name, [])
+
+    def iter_objects(self):
+        """ Yield all snapshot objects, class by class. """
+        for class_name in self.get_class_names():
+            for pycl_object in self.object_dict[class_name]:
+                yield pycl_object
+
+    def get_summary(self):
+        """
+        :returns: Dictionary containing number of objects for each snapshot class.
+        """
+        return dict([(class_name, len(object_list)) for (class_name, object_list) in list(self.object_dict.items())])
+
+    @classmethod
+    def get_fingerprint(cls, object_list, ignored_key_list=None):
+        """
+        :param object_list: List of objects.
+        :type object_list: list
+
+        :param ignored_key_list: Keys excluded from fingerprint (e.g., frequently changing load values).
+        :type ignored_key_list: list
+
+        :returns: Fingerprint of object data; it does not depend on object order or metadata.
+        """
+        digest = hashlib.sha1()
+        for fingerprint in sorted([o.get_fingerprint(ignored_key_list) for o in object_list]):
+            digest.update(fingerprint.encode('utf-8'))
+        return digest.hexdigest()
+
+    @classmethod
+    def open_file(cls, filename, mode):
+        if filename.endswith('.gz'):
+            return gzip.open(filename, mode + 't')
+        return open(filename, mode)
+
+    @classmethod
+    def get_object_dict(cls, pycl_object):
+        object_dict = {'object_class': pycl_object.metadata['object_class'],
+                       'object_version': pycl_object.metadata['object_version'], 'data': pycl_object.data}
+        if pycl_object.name:
+            object_dict['name'] = pycl_object.name
+        return object_dict
+
+    def write(self, filename):
+        """
+        Write snapshot to file; file is compressed if its name ends with '.gz'.
+
+        :param filename: Snapshot file name.
+        :type filename: str
+        """
+        header = dict(self.metadata)
+        header.update({'snapshot_version': self.SNAPSHOT_FORMAT_VERSION, 'uge_version': self.uge_version,
+                       'classes': self.get_summary()})
+        with self.open_file(filename, 'w') as f:
+            f.write('%s\n' % json.dumps(header, separators=self.JSON_SEPARATORS))
+            for class_name in self.get_class_names():
+                object_list = self.object_dict[class_name]
+                section = {'snapshot_class': class_name, 'count': len(object_list),
+                           'fingerprint': self.get_fingerprint(object_list)}
+                f.write('%s\n' % json.dumps(section, separators=self.JSON_SEPARATORS))
+                for pycl_object in object_list:
+                    f.write('%s\n' % json.dumps(self.get_object_dict(pycl_object), separators=self.JSON_SEPARATORS))
+
+    @classmethod
+    def create_object(cls, object_dict):
+        name = object_dict.pop('name', None)
+        if object_dict['object_class'] == QconfNameList.__name__:
+            pycl_object = QconfNameList(data=object_dict.pop('data'), metadata=object_dict)
+        else:
+            pycl_object = QconfObjectFactory.generate_object_from_dict(object_dict, add_required_data=False)
+        pycl_object.name = name
+        return pycl_object
+
+    @classmethod
+    def read(cls, filename):
+        """
+        Read snapshot written by write().
+
+        :param filename: Snapshot file name.
+        :type filename: str
+
+        :returns: ClusterSnapshot object.
+
+        :raises InvalidArgument: in case file does not contain a supported snapshot.
+        """
+        with cls.open_file(filename, 'r') as f:
+            try:
+                header = json.loads(f.readline())
+            except ValueError as ex:
+                raise InvalidArgument('File %s does not contain cluster snapshot: %s' % (filename, ex))
+            if type(header) != dict or header.get('snapshot_version') != cls.SNAPSHOT_FORMAT_VERSION:
+                raise InvalidArgument('File %s does not contain cluster snapshot version %s.' % (
+                    filename, cls.SNAPSHOT_FORMAT_VERSION))
+            uge_version = header.pop('uge_version')
+            header.pop('snapshot_version')
+            header.pop('classes', None)
+            object_dict = {}
+            object_list = None
+            for line in f:
+                item = json.loads(line)
+                if 'snapshot_class' in item:
+                    object_list = object_dict.setdefault(item['snapshot_class'], [])
+                    continue
+                if object_list is None:
+                    raise InvalidArgument('File %s contains object outside of class section.' % filename)
+                object_list.append(cls.create_object(item))
+        return ClusterSnapshot(uge_version, object_dict, header)
+
+
+class ClusterSnapshotBuilder(object):
+    """
+    Retrieves configuration of a whole UGE cell.
+
+    All snapshot classes are retrieved concurrently, using a single qconf
+    call per class where possible, so that snapshot time is bounded by the
+    slowest class rather than by the sum of all classes. Since objects may
+    be modified while classes are being retrieved, all classes are then
+    retrieved again (also concurrently), and classes whose fingerprints
+    differ are retrieved until two consecutive reads agree. Every class in
+    the resulting snapshot was therefore unchanged during a time interval
+    overlapping those of all other classes.
+
+    Usage:
+        snapshot = ClusterSnapshotBuilder(api).build()
+        snapshot.write('cluster.json.gz')
+    """
+
+    # Snapshot class name => retrieval method name
+    SNAPSHOT_CLASS_DICT = {
+        'AccessList': 'get_bulk_objects',
+        'Calendar': 'get_bulk_objects',
+        'CheckpointingEnvironment': 'get_bulk_objects',
+        'ClusterQueue': 'get_bulk_objects',
+        'ExecutionHost': 'get_bulk_objects',
+        'HostGroup': 'get_bulk_objects',
+        'JobClass': 'get_bulk_objects',
+        'ParallelEnvironment': 'get_bulk_objects',
+        'Project': 'get_bulk_objects',
+        'User': 'get_bulk_objects',
+        'ResourceQuotaSet': 'get_resource_quota_sets',
+        'ClusterConfiguration': 'get_cluster_configurations',
+        'SchedulerConfiguration': 'get_scheduler_configuration',
+        'ComplexConfiguration': 'get_complex_configuration',
+        'ShareTree': 'get_share_tree',
+        'Manager': 'get_name_list',
+        'Operator': 'get_name_list',
+        'SubmitHost': 'get_name_list',
+        'AdminHost': 'get_name_list',
+    }
+
+    # Name list classes: snapshot class name => manager name
+    NAME_LIST_MANAGER_NAME_DICT = {
+        'Manager': 'manager_manager',
+        'Operator': 'operator_manager',
+        'SubmitHost': 'submit_host_manager',
+        'AdminHost': 'admin_host_manager',
+    }
+
+    # Maximum number of times classes are retrieved while waiting for them to stop changing
+    MAX_READ_ROUNDS = 4
+
+    def __init__(self, api, max_workers=ParallelExecutor.DEFAULT_MAX_WORKERS):
+        """
+        :param api: API object used for retrieving objects.
+        :type api: QconfApi
+
+        :param max_workers: Maximum number of classes retrieved at the same time.
+        :type max_workers: int
+        """
+        self.logger = LogManager.get_instance().get_logger(self.__class__.__name__)
+        self.api = api
+        self.parallel_executor = ParallelExecutor(max_workers=max_workers)
+
+    def get_bulk_objects(self, class_name):
+        try:
+            for pycl_object in self.api.get_bulk_manager(class_name).iter_objects():
+                yield pycl_object
+        except ObjectNotFound as ex:
+            # There are no objects of this class
+            return
+
+    def get_resource_quota_sets(self, class_name):
+        try:
+            for pycl_object in self.api.resource_quota_set_manager.iter_objects():
+                yield pycl_object
+        except ObjectNotFound as ex:
+            return
+
+    def get_cluster_configurations(self, class_name):
+        manager = self.api.cluster_configuration_manager
+        manager.invalidate_cached_objects()
+        names = ['global'] + [name for name in manager.list_objects() if name != 'global']
+        return [manager.get_object(name) for name in names]
+
+    def get_scheduler_configuration(self, class_name):
+        manager = self.api.scheduler_configuration_manager
+        manager.invalidate_cached_objects()
+        return [manager.get_object('')]
+
+    def get_complex_configuration(self, class_name):
+        manager = self.api.complex_configuration_manager
+        manager.invalidate_cached_objects()
+        return [manager.get_object('')]
+
+    def get_share_tree(self, class_name):
+        manager = self.api.share_tree_manager
+        manager.invalidate_cached_object()
+        stree = manager.get_object_if_exists()
+        if not stree.data:
+            return []
+        return [stree]
+
+    def get_name_list(self, class_name):
+        return [getattr(self.api, self.NAME_LIST_MANAGER_NAME_DICT[class_name]).list_names()]
+
+    def iter_class_objects(self, class_name):
+        """
+        Retrieve objects of a given snapshot class; bulk classes are yielded one at a time, while qconf output is being read.
+
+        :raises InvalidArgument: in case an unsupported class name is specified.
+        """
+        if class_name not in self.SNAPSHOT_CLASS_DICT:
+            raise InvalidArgument('Snapshot is not supported for class %s.' % class_name)
+        return iter(getattr(self, self.SNAPSHOT_CLASS_DICT[class_name])(class_name))
+
+    def get_ignored_key_list(self, class_name):
+        # Keys reported by execution daemons change all the time, and are not part of configuration
+        if class_name in self.api.BULK_MANAGER_NAME_DICT:
+            return self.api.get_bulk_manager(class_name).READ_ONLY_KEY_LIST
+        return []
+
+    def read_class(self, class_name):
+        object_list = list(self.iter_class_objects(class_name))
+        return (object_list, ClusterSnapshot.get_fingerprint(object_list, self.get_ignored_key_list(class_name)))
+
+    def read_classes(self, class_names):
+        result_dict = {}
+        for result in self.parallel_executor.execute(self.read_class, class_names):
+            if not result.is_successful():
+                raise result.exception
+            result_dict[result.item] = result.result
+        return result_dict
+
+    def build(self, classes=None, verify=True):
+        """
+        Retrieve snapshot.
+
+        :param classes: Snapshot classes to retrieve (default: all).
+        :type classes: list
+
+        :param verify: If True (default), classes are retrieved again, and classes that changed in the meantime are retrieved until they stop changing.
+        :type verify: bool
+
+        :returns: ClusterSnapshot object.
+
+        :raises InvalidArgument: in case an unsupported class name is specified.
+        """
+        if classes is None:
+            classes = sorted(self.SNAPSHOT_CLASS_DICT.keys())
+        for class_name in classes:
+            if class_name not in self.SNAPSHOT_CLASS_DICT:
+                raise InvalidArgument('Snapshot is not supported for class %s.' % class_name)
+        uge_version = self.api.get_uge_version()
+        start_time = time.time()
+        result_dict = self.read_classes(classes)
+        changed_classes = list(classes) if verify else []
+        n_rounds = 1
+        while changed_classes:
+            if n_rounds >= self.MAX_READ_ROUNDS:
+                self.logger.warning('Classes %s keep changing, snapshot may not be consistent.' % changed_classes)
+                break
+            verify_result_dict = self.read_classes(changed_classes)
+            n_rounds += 1
+            changed_classes = [c for c in changed_classes if verify_result_dict[c][1] != result_dict[c][1]]
+            if changed_classes:
+                self.logger.debug('Classes changed during snapshot: %s' % changed_classes)
+            result_dict.update(verify_result_dict)
+        self.logger.debug('Retrieved snapshot in %.3f seconds (%s rounds)' % (time.time() - start_time, n_rounds))
+
+        cm = ConfigManager.get_instance()
+        metadata = {'created_by': '%s@%s' % (cm.get_user(), cm.get_host()),
+                    'created_on': datetime.datetime.now().isoformat()}
+        object_dict = dict([(class_name, result[0]) for (class_name, result) in list(result_dict.items())])
+        return ClusterSnapshot(uge_version, object_dict, metadata)
+
+
+#############################################################################
+# Testing.
+if __name__ == '__main__':
+    from uge.api.qconf_api import QconfApi
+    snapshot = ClusterSnapshotBuilder(QconfApi()).build()
+    print(snapshot)
@@ -25,6 +25,12 @@ import copy
 import os
 import shutil
 import tempfile
+
+try:
+    from sys import intern
+except ImportError:
+    pass
+
 from uge.log.log_manager import LogManager
 from uge.exceptions.object_not_found import ObjectNotFound
 from uge.exceptions.object_already_exists import ObjectAlreadyExists
@@ -53,6 +59,16 @@ class DictBasedObjectManager(object):
     OBJECT_CLASS_UGE_NAME = None
     OBJECT_CLASS_UGE_LIST_DETAILS_NAME = None
 
+    # Object name used by qconf attribute options (-mattr, -aattr, etc.);
+    # if not set, objects are always modified by replacing them (-M<x>)
+    OBJECT_CLASS_UGE_ATTRIBUTE_NAME = None
+    # Keys reported by UGE that cannot be modified
+    READ_ONLY_KEY_LIST = []
+    # Changes requiring more attribute commands are applied by replacing the object;
+    # attribute commands are not atomic, so a failed command would otherwise leave
+    # the object partially modified
+    MAX_ATTRIBUTE_COMMANDS = 1
+
     BULK_SEPARATOR = "^=================+"
     KEY_VALUE_DELIMITER = ' '
 
@@ -61,8 +77,28 @@ class DictBasedObjectManager(object):
     def __init__(self, qconf_executor):
         self.logger = LogManager.get_instance().get_logger(self.__class__.__name__)
         self.qconf_executor = qconf_executor
+        # Advance reservation manager uses qrstat executor, which does not cache objects
+        self.object_cache = getattr(qconf_executor, 'object_cache', None)
         self.object_dump_ignored_key_list = []
 
+    def get_object_name(self, pycl_object):
+        if self.OBJECT_NAME_KEY:
+            return pycl_object.data.get(self.OBJECT_NAME_KEY)
+        elif pycl_object.name:
+            return pycl_object.name
+        return ''
+
+    def get_cache_name(self, name):
+        return name
+
+    def invalidate_cached_object(self, name):
+        if self.object_cache:
+            self.object_cache.invalidate(self.OBJECT_CLASS_UGE_NAME, self.get_cache_name(name))
+
+    def invalidate_cached_objects(self):
+        if self.object_cache:
+            self.object_cache.invalidate_class(self.OBJECT_CLASS_UGE_NAME)
+
     def generate_object(self, name=None, data=None, metadata=None,
                         json_string=None, uge_version=None,
                         add_required_data=True):
@@ -109,12 +145,7 @@ class DictBasedObjectManager(object):
         new_object = self.__prepare_object(
             pycl_object=pycl_object, name=name, data=data,
             metadata=metadata, json_string=json_string)
-        if self.OBJECT_NAME_KEY:
-            object_name = new_object.data.get(self.OBJECT_NAME_KEY)
-        elif new_object.name:
-            object_name = new_object.name
-        else:
-            object_name = ''
+        object_name = self.get_object_name(new_object)
         try:
             old_object = self.get_object(object_name)
             raise ObjectAlreadyExists('%s %s already exists.' % (self.OBJECT_CLASS_NAME, object_name))
@@ -125,6 +156,7 @@ class DictBasedObjectManager(object):
         self.verify_object_before_add(new_object)
         self.qconf_executor.execute_qconf_with_object('-A%s' % self.OBJECT_CLASS_UGE_NAME, new_object,
                                                       self.QCONF_ERROR_REGEX_LIST)
+        self.invalidate_cached_object(object_name)
         new_object.set_add_metadata()
         return new_object
 
@@ -139,6 +171,7 @@ class DictBasedObjectManager(object):
     def add_objects_from_dir(self, dirname):
         self.qconf_executor.execute_qconf_with_dir('-A%s' % self.OBJECT_CLASS_UGE_NAME, dirname,
                                                    self.QCONF_ERROR_REGEX_LIST)
+        self.invalidate_cached_objects()
 
     def verify_object_before_modify(self, pycl_object):
         return
@@ -149,21 +182,115 @@ class DictBasedObjectManager(object):
             pycl_object=pycl_object, name=name, data=data,
             metadata=metadata, json_string=json_string,
             add_required_data=False)
-        if self.OBJECT_NAME_KEY:
-            object_name = generated_object.data.get(self.OBJECT_NAME_KEY)
-        elif generated_object.name:
-            object_name = generated_object.name
-        else:
-            object_name = ''
+        object_name = self.get_object_name(generated_object)
+        # Changes are computed against current qmaster state, never against a cached copy
+        self.invalidate_cached_object(object_name)
         updated_object = self.get_object(object_name)
+        current_data = copy.copy(updated_object.data)
         updated_object.data.update(generated_object.data)
         updated_object.remove_optional_keys()
         self.verify_object_before_modify(updated_object)
-        self.qconf_executor.execute_qconf_with_object('-M%s' % self.OBJECT_CLASS_UGE_NAME, updated_object,
-                                                      self.QCONF_ERROR_REGEX_LIST)
+        attribute_args_list = self.get_attribute_args(updated_object, current_data, list(generated_object.data.keys()))
+        if attribute_args_list == []:
+            self.logger.debug('%s %s is already up to date.' % (self.OBJECT_CLASS_NAME, object_name))
+            updated_object.set_modify_metadata()
+            return updated_object
+        try:
+            if attribute_args_list is None:
+                self.qconf_executor.execute_qconf_with_object('-M%s' % self.OBJECT_CLASS_UGE_NAME, updated_object,
+                                                              self.QCONF_ERROR_REGEX_LIST)
+            else:
+                for args in attribute_args_list:
+                    self.qconf_executor.execute_qconf(args, self.QCONF_ERROR_REGEX_LIST)
+        finally:
+            self.invalidate_cached_object(object_name)
         updated_object.set_modify_metadata()
         return updated_object
 
+    def get_attribute_args(self, updated_object, current_data, key_list):
+        """
+        Computes qconf attribute commands (-mattr, -aattr, -dattr, -rattr)
+        needed to change object from its current state into updated one.
+        Changes needing more than MAX_ATTRIBUTE_COMMANDS commands are applied
+        by replacing the object, which qmaster does atomically.
+
+        :returns: List of qconf argument lists (empty if there is nothing to change), or None if object should be replaced as a whole.
+        """
+        object_name = self.get_object_name(updated_object)
+        args_list = []
+        for key in key_list:
+            if key in self.READ_ONLY_KEY_LIST or key not in updated_object.data:
+                continue
+            old_value = current_data.get(key)
+            new_value = updated_object.data.get(key)
+            if old_value == new_value:
+                continue
+            if not self.OBJECT_CLASS_UGE_ATTRIBUTE_NAME or not object_name:
+                return None
+            value_args_list = self.get_attribute_value_args(updated_object, key, old_value, new_value)
+            if value_args_list is None:
+                return None
+            args_list.extend(value_args_list)
+        if len(args_list) > self.MAX_ATTRIBUTE_COMMANDS:
+            return None
+        return [[option, self.OBJECT_CLASS_UGE_ATTRIBUTE_NAME, key, value, object_name]
+                for (option, key, value) in args_list]
+
+    def get_attribute_value_args(self, pycl_object, key, old_value, new_value):
+        """
+        :returns: List of (option, key, value) tuples that change a single attribute value, or None if this cannot be done with attribute commands.
+        """
+        old_list = old_value if type(old_value) == list else None
+        new_list = new_value if type(new_value) == list else None
+        value_list = old_list if old_list is not None else [old_value]
+        value_list = value_list + (new_list if new_list is not None else [new_value])
+        for value in value_list:
+            # Host specific values (e.g., [@hgrp=...]) are modified by replacing the object
+            value = '%s' % value
+            if value.startswith('[') or value.find(',[') >= 0:
+                return None
+        if old_list and new_list:
+            old_named_items = self.__get_named_list_items(old_list)
+            new_named_items = self.__get_named_list_items(new_list)
+            if old_named_items is not None and new_named_items is not None:
+                # Items like complex_values slots=4 are matched by name
+                old_item_dict = dict(old_named_items)
+                new_item_dict = dict(new_named_items)
+                args_list = []
+                for (item_name, item) in new_named_items:
+                    old_item = old_item_dict.get(item_name)
+                    if old_item is None:
+                        args_list.append(('-aattr', key, item))
+                    elif old_item != item:
+                        args_list.append(('-mattr', key, item))
+                for (item_name, item) in old_named_items:
+                    if item_name not in new_item_dict:
+                        args_list.append(('-dattr', key, item))
+                return args_list
+            old_item_set = set(old_list)
+            new_item_set = set(new_list)
+            added_items = [item for item in new_list if item not in old_item_set]
+            removed_items = [item for item in old_list if item not in new_item_set]
+            if not added_items or not removed_items:
+                args_list = [('-aattr', key, '%s' % item) for item in added_items]
+                args_list += [('-dattr', key, '%s' % item) for item in removed_items]
+                if args_list:
+                    return args_list
+        option = '-mattr'
+        if old_list is not None or new_list is not None:
+            option = '-rattr'
+        return [(option, key, '%s' % pycl_object.py_to_uge(key, new_value))]
+
+    def __get_named_list_items(self, item_list):
+        # Returns list of (name, item) tuples for name=value items, or None
+        named_items = []
+        for item in item_list:
+            item = '%s' % item
+            if item.find('=') <= 0:
+                return None
+            named_items.append((item.split('=')[0], item))
+        return named_items
+
     def modify_objects(self, object_list, dirname=None):
         if not dirname:
             dirname = tempfile.mktemp()
@@ -176,31 +303,54 @@ class DictBasedObjectManager(object):
     def modify_objects_from_dir(self, dir):
         self.qconf_executor.execute_qconf_with_dir('-M%s' % self.OBJECT_CLASS_UGE_NAME, dir,
                                                    self.QCONF_ERROR_REGEX_LIST)
+        self.invalidate_cached_objects()
         return
 
     def replace_object(self, updated_object):
         self.qconf_executor.execute_qconf_with_object('-M%s' % self.OBJECT_CLASS_UGE_NAME, updated_object,
                                                       self.QCONF_ERROR_REGEX_LIST)
+        self.invalidate_cached_object(self.get_object_name(updated_object))
         updated_object.set_modify_metadata()
         return updated_object
 
-    def get_object(self, name):
+    def get_cached_object(self, name):
+        if self.object_cache:
+            return self.object_cache.get(self.OBJECT_CLASS_UGE_NAME, self.get_cache_name(name))
+        return None
+
+    def cache_object(self, name, pycl_object):
+        if self.object_cache:
+            self.object_cache.put(self.OBJECT_CLASS_UGE_NAME, self.get_cache_name(name), pycl_object)
+
+    def get_object_args(self, name):
+        # Some objects (e.g., scheduler configuration) are retrieved without name
+        return ['-s%s' % self.OBJECT_CLASS_UGE_NAME] + ([name] if name else [])
+
+    def create_object_from_qconf_output(self, name, qconf_output):
         uge_version = self.qconf_executor.get_uge_version()
         retrieved_object = self.GENERATE_OBJECT_FACTORY_METHOD(uge_version, add_required_data=False)
-        qconf_output = self.qconf_executor.execute_qconf('-s%s %s' % (self.OBJECT_CLASS_UGE_NAME, name),
-                                                         self.QCONF_ERROR_REGEX_LIST,
-                                                         failure_regex_list=self.QCONF_FAILURE_REGEX_LIST).get_stdout()
         retrieved_object.set_data_dict_from_qconf_output(qconf_output)
         retrieved_object.name = name
         return retrieved_object
 
+    def get_object(self, name):
+        retrieved_object = self.get_cached_object(name)
+        if retrieved_object is not None:
+            return retrieved_object
+        qconf_output = self.qconf_executor.execute_qconf(self.get_object_args(name), self.QCONF_ERROR_REGEX_LIST,
+                                                         failure_regex_list=self.QCONF_FAILURE_REGEX_LIST).get_stdout()
+        retrieved_object = self.create_object_from_qconf_output(name, qconf_output)
+        self.cache_object(name, retrieved_object)
+        return retrieved_object
+
     def verify_object_before_delete(self, pycl_object):
         return
 
     def delete_object(self, name):
         deleted_object = self.get_object(name)
         self.verify_object_before_delete(deleted_object)
-        self.qconf_executor.execute_qconf('-d%s %s' % (self.OBJECT_CLASS_UGE_NAME, name), self.QCONF_ERROR_REGEX_LIST)
+        self.qconf_executor.execute_qconf(['-d%s' % self.OBJECT_CLASS_UGE_NAME, name], self.QCONF_ERROR_REGEX_LIST)
+        self.invalidate_cached_object(name)
 
     def delete_object_list(self, object_list, dirname=None):
         if not dirname:
@@ -214,39 +364,71 @@ class DictBasedObjectManager(object):
     def delete_objects_from_dir(self, dir):
         self.qconf_executor.execute_qconf_with_dir('-D%s' % self.OBJECT_CLASS_UGE_NAME, dir,
                                                    self.QCONF_ERROR_REGEX_LIST)
+        self.invalidate_cached_objects()
         return
 
+    def get_list_objects_args(self):
+        return ['-s%sl' % self.OBJECT_CLASS_UGE_NAME]
+
+    def create_object_list_from_qconf_output(self, qconf_output):
+        return QconfNameList(metadata={'description': 'List of %s object names' % (self.OBJECT_CLASS_NAME)},
+                             data=QconfObject.get_list_from_qconf_output(qconf_output))
+
     def list_objects(self):
         try:
-            qconf_output = self.qconf_executor.execute_qconf('-s%sl' % (self.OBJECT_CLASS_UGE_NAME),
+            qconf_output = self.qconf_executor.execute_qconf(self.get_list_objects_args(),
                                                              self.QCONF_ERROR_REGEX_LIST).get_stdout()
-            object_list = QconfNameList(metadata={'description': 'List of %s object names' % (self.OBJECT_CLASS_NAME)},
-                                        data=QconfObject.get_list_from_qconf_output(qconf_output))
         except ObjectNotFound as ex:
-            object_list = QconfNameList(metadata={'description': 'List of %s object names' % (self.OBJECT_CLASS_NAME)},
-                                        data=[])
-        return object_list
+            qconf_output = ''
+        return self.create_object_list_from_qconf_output(qconf_output)
+
+    def get_objects_args(self):
+        return ['-s%s%s' % (self.OBJECT_CLASS_UGE_NAME, self.OBJECT_CLASS_UGE_LIST_DETAILS_NAME)]
 
     def get_objects(self):
         bulk_output = self.qconf_executor.execute_qconf(
-            '-s%s%s' % (self.OBJECT_CLASS_UGE_NAME, self.OBJECT_CLASS_UGE_LIST_DETAILS_NAME),
+            self.get_objects_args(),
             self.QCONF_ERROR_REGEX_LIST, failure_regex_list=self.QCONF_FAILURE_REGEX_LIST).get_stdout()
         bulk_object = self.parse_bulk_output(bulk_output)
         return bulk_object
 
+    def prefetch_objects(self):
+        """
+        Retrieve all objects with a single bulk qconf call, and seed object cache with them.
+
+        :returns: Number of cached objects.
+        """
+        if not self.object_cache:
+            raise InvalidRequest('Object cache is not enabled.')
+        if not self.OBJECT_NAME_KEY or not self.OBJECT_CLASS_UGE_LIST_DETAILS_NAME:
+            raise InvalidRequest('Prefetch is not supported for %s objects.' % self.OBJECT_CLASS_NAME)
+        n_cached = 0
+        try:
+            for pycl_object in self.iter_objects():
+                name = pycl_object.data.get(self.OBJECT_NAME_KEY)
+                if not name:
+                    continue
+                pycl_object.name = name
+                self.object_cache.put(self.OBJECT_CLASS_UGE_NAME, self.get_cache_name(name), pycl_object)
+                n_cached += 1
+        except ObjectNotFound as ex:
+            pass
+        if n_cached > self.object_cache.size:
+            self.logger.warning('Retrieved %s %s objects, but object cache size is only %s.' % (
+                n_cached, self.OBJECT_CLASS_NAME, self.object_cache.size))
+        return n_cached
+
     def get_bulk_dump_filename(self, object):
         return ''
 
     def write_objects(self, object_list, dirname):
         for object in object_list:
             filename = self.get_bulk_dump_filename(object)
-            lines = ''
-            for key, value in list(object.data.items()):
-                if key in self.object_dump_ignored_key_list:
-                    continue
-                lines += '%s%s%s\n' % (key, self.KEY_VALUE_DELIMITER, object.py_to_uge(key, value))
             with open(os.path.join(dirname, filename), 'w') as dumpfile:
-                dumpfile.write(lines)
+                for key, value in list(object.data.items()):
+                    if key in self.object_dump_ignored_key_list:
+                        continue
+                    dumpfile.write('%s%s%s\n' % (key, self.KEY_VALUE_DELIMITER, object.py_to_uge(key, value)))
         return
 
     def mk_object_dir(self, path):
@@ -263,37 +445,49 @@ class DictBasedObjectManager(object):
 
     def delete_objects(self, name_list):
         names = self.DEFAULT_LIST_DELIMITER.join(name_list)
-        self.qconf_executor.execute_qconf('-d%s %s' % (self.OBJECT_CLASS_UGE_NAME, names), self.QCONF_ERROR_REGEX_LIST)
+        self.qconf_executor.execute_qconf(['-d%s' % self.OBJECT_CLASS_UGE_NAME, names], self.QCONF_ERROR_REGEX_LIST)
+        for name in name_list:
+            self.invalidate_cached_object(name)
         return
 
-    def parse_bulk_output(self, bulk_output):
+    def iter_objects(self):
+        """
+        Retrieve all objects with a single bulk qconf call, and yield them
+        one at a time, while qconf output is being read.
+        """
+        if not self.OBJECT_CLASS_UGE_LIST_DETAILS_NAME:
+            raise InvalidRequest('Bulk retrieval is not supported for %s objects.' % self.OBJECT_CLASS_NAME)
+        qconf_output = self.qconf_executor.iter_qconf_output(
+            self.get_objects_args(), self.QCONF_ERROR_REGEX_LIST, failure_regex_list=self.QCONF_FAILURE_REGEX_LIST)
+        return self.iter_bulk_output(qconf_output)
+
+    def iter_bulk_output(self, lines):
         uge_version = self.qconf_executor.get_uge_version()
-        object_list = []
-        lines = []
-        # print "bulk_output begin"
-        # print bulk_output
-        # print "bulk_output end"
-        # print "len(bulk_output)=",len(bulk_output)
-        if len(bulk_output) > 0:
-            lines = bulk_output.split('\n')
-        if len(lines) > 0:
-            retrieved_object = self.GENERATE_OBJECT_FACTORY_METHOD(uge_version, add_required_data=False)
-            object_list.append(retrieved_object)
+        retrieved_object = None
         # Parse lines until a separator is found, and then create new dictionary object
         for line in lines:
+            if retrieved_object is None:
+                retrieved_object = self.GENERATE_OBJECT_FACTORY_METHOD(uge_version, add_required_data=False)
+            line = line.rstrip('\n')
             if not line:
                 continue
             if self.BULK_SEPARATOR:
                 if re.match(self.BULK_SEPARATOR, line):
+                    yield retrieved_object
                     retrieved_object = self.GENERATE_OBJECT_FACTORY_METHOD(uge_version, add_required_data=False)
-                    object_list.append(retrieved_object)
-                    continue;
+                    continue
             key_value = line.split(self.KEY_VALUE_DELIMITER)
-            key = key_value[0]
+            # Key names are shared by all objects
+            key = intern(key_value[0])
             value = self.KEY_VALUE_DELIMITER.join(key_value[1:]).strip()
             retrieved_object.data[key] = retrieved_object.uge_to_py(key, value)
+        if retrieved_object is not None:
+            yield retrieved_object
 
-        return object_list
+    def parse_bulk_output(self, bulk_output):
+        if not len(bulk_output):
+            return []
+        return list(self.iter_bulk_output(bulk_output.split('\n')))
 
 
 #############################################################################
@@ -45,6 +45,11 @@ class DictListBasedObjectManager(object):
     def __init__(self, qconf_executor):
         self.logger = LogManager.get_instance().get_logger(self.__class__.__name__)
         self.qconf_executor = qconf_executor
+        self.object_cache = qconf_executor.object_cache
+
+    def invalidate_cached_object(self):
+        if self.object_cache:
+            self.object_cache.invalidate(self.OBJECT_CLASS_UGE_NAME, '')
 
     def generate_object(self, data=None, metadata=None,
                         json_string=None, uge_version=None,
@@ -98,6 +103,7 @@ class DictListBasedObjectManager(object):
         self.verify_object_before_add(new_object)
         self.qconf_executor.execute_qconf_with_object('-A%s' % self.OBJECT_CLASS_UGE_NAME, new_object,
                                                       self.QCONF_ERROR_REGEX_LIST)
+        self.invalidate_cached_object()
         new_object.set_add_metadata()
         return new_object
 
@@ -115,22 +121,44 @@ class DictListBasedObjectManager(object):
         self.verify_object_before_modify(updated_object)
         self.qconf_executor.execute_qconf_with_object('-M%s' % self.OBJECT_CLASS_UGE_NAME, updated_object,
                                                       self.QCONF_ERROR_REGEX_LIST)
+        self.invalidate_cached_object()
         updated_object.set_modify_metadata()
         return updated_object
 
     def replace_object(self, updated_object):
         self.qconf_executor.execute_qconf_with_object('-M%s' % self.OBJECT_CLASS_UGE_NAME, updated_object,
                                                       self.QCONF_ERROR_REGEX_LIST)
+        self.invalidate_cached_object()
         updated_object.set_modify_metadata()
         return updated_object
 
-    def get_object(self):
+    def get_cached_object(self):
+        if self.object_cache:
+            return self.object_cache.get(self.OBJECT_CLASS_UGE_NAME, '')
+        return None
+
+    def cache_object(self, pycl_object):
+        if self.object_cache:
+            self.object_cache.put(self.OBJECT_CLASS_UGE_NAME, '', pycl_object)
+
+    def get_object_args(self):
+        return ['-s%s' % self.OBJECT_CLASS_UGE_NAME]
+
+    def create_object_from_qconf_output(self, qconf_output):
         uge_version = self.qconf_executor.get_uge_version()
         retrieved_object = self.GENERATE_OBJECT_FACTORY_METHOD(uge_version, add_required_data=False)
-        qconf_output = self.qconf_executor.execute_qconf('-s%s' % (self.OBJECT_CLASS_UGE_NAME),
+        retrieved_object.set_data_dict_list_from_qconf_output(qconf_output)
+        return retrieved_object
+
+    def get_object(self):
+        retrieved_object = self.get_cached_object()
+        if retrieved_object is not None:
+            return retrieved_object
+        qconf_output = self.qconf_executor.execute_qconf(self.get_object_args(),
                                                          self.QCONF_ERROR_REGEX_LIST,
                                                          failure_regex_list=self.QCONF_FAILURE_REGEX_LIST).get_stdout()
-        retrieved_object.set_data_dict_list_from_qconf_output(qconf_output)
+        retrieved_object = self.create_object_from_qconf_output(qconf_output)
+        self.cache_object(retrieved_object)
         return retrieved_object
 
     def verify_object_before_delete(self, pycl_object):
@@ -140,6 +168,7 @@ class DictListBasedObjectManager(object):
         deleted_object = self.get_object()
         self.verify_object_before_delete(deleted_object)
         self.qconf_executor.execute_qconf('-d%s' % (self.OBJECT_CLASS_UGE_NAME), self.QCONF_ERROR_REGEX_LIST)
+        self.invalidate_cached_object()
 
 
 #############################################################################
@@ -0,0 +1,247 @@
+#!/usr/bin/env python
+#
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+#
+from uge.log.log_manager import LogManager
+from uge.exceptions.invalid_argument import InvalidArgument
+from .parallel_executor import ParallelExecutor
+from .cluster_snapshot import ClusterSnapshot
+from .cluster_snapshot import ClusterSnapshotBuilder
+from .qconf_watcher import QconfWatcher
+
+
+class DriftReport(object):
+    """ Objects added, removed or changed since the baseline; each object is identified by a (class name, object name) tuple. """
+
+    def __init__(self, added=None, removed=None, changed=None, fingerprint_dict=None):
+        """
+        :param added: Objects not present in the baseline.
+        :type added: list
+
+        :param removed: Baseline objects that no longer exist.
+        :type removed: list
+
+        :param changed: Objects whose fingerprints differ from baseline fingerprints.
+        :type changed: list
+
+        :param fingerprint_dict: Current fingerprints, keyed by (class name, object name); can be used as the next baseline.
+        :type fingerprint_dict: dict
+        """
+        self.added = added or []
+        self.removed = removed or []
+        self.changed = changed or []
+        self.fingerprint_dict = fingerprint_dict or {}
+
+    def __repr__(self):
+        return 'DriftReport(added: %s, removed: %s, changed: %s)' % (self.added, self.removed, self.changed)
+
+    def is_empty(self):
+        return not self.added and not self.removed and not self.changed
+
+    def get_summary(self):
+        """
+        :returns: Dictionary containing number of added, removed and changed objects.
+        """
+        return {'added': len(self.added), 'removed': len(self.removed), 'changed': len(self.changed)}
+
+
+class DriftDetector(object):
+    """
+    Detects configuration drift by comparing object fingerprints with
+    fingerprints recorded in a baseline.
+
+    Objects are streamed from qconf output one class at a time (with
+    classes retrieved concurrently), and only their fingerprints are kept,
+    so memory usage does not depend on object size, and checking an
+    unchanged object costs a single fingerprint comparison. Objects of
+    bulk classes (see QconfApi.BULK_MANAGER_NAME_DICT) are fingerprinted
+    by hashing their qconf output, as done by QconfWatcher, and are parsed
+    only when compared with a snapshot baseline, which requires data
+    fingerprints (see QconfObject.get_fingerprint()).
+
+    Usage:
+        detector = DriftDetector(api, classes=['ClusterQueue', 'HostGroup'])
+        detector.set_baseline()
+        ...
+        report = detector.check()
+    """
+
+    def __init__(self, api, classes=None, max_workers=ParallelExecutor.DEFAULT_MAX_WORKERS):
+        """
+        :param api: API object used for retrieving objects.
+        :type api: QconfApi
+
+        :param classes: Checked classes; see ClusterSnapshotBuilder for supported classes (default: all).
+        :type classes: list
+
+        :param max_workers: Maximum number of classes retrieved at the same time.
+        :type max_workers: int
+
+        :raises InvalidArgument: in case an unsupported class name is specified.
+        """
+        self.logger = LogManager.get_instance().get_logger(self.__class__.__name__)
+        self.api = api
+        self.snapshot_builder = ClusterSnapshotBuilder(api)
+        self.classes = classes or sorted(ClusterSnapshotBuilder.SNAPSHOT_CLASS_DICT.keys())
+        for class_name in self.classes:
+            if class_name not in ClusterSnapshotBuilder.SNAPSHOT_CLASS_DICT:
+                raise InvalidArgument('Drift detection is not supported for class %s.' % class_name)
+        self.parallel_executor = ParallelExecutor(max_workers=max_workers)
+        self.fingerprint_dict = {}
+        # Data fingerprints of snapshot baseline, compared until the next check
+        self.data_fingerprint_dict = None
+
+    @classmethod
+    def get_object_name(cls, pycl_object):
+        if pycl_object.name:
+            return pycl_object.name
+        if pycl_object.NAME_KEY and type(pycl_object.data) == dict:
+            return pycl_object.data.get(pycl_object.NAME_KEY, '')
+        return ''
+
+    @classmethod
+    def get_block_name(cls, manager, block):
+        for line in block:
+            key_value = line.split(manager.KEY_VALUE_DELIMITER)
+            if key_value[0] == manager.OBJECT_NAME_KEY:
+                return manager.KEY_VALUE_DELIMITER.join(key_value[1:]).strip()
+        return ''
+
+    def get_class_fingerprints(self, class_name, parse=False):
+        """
+        :param parse: If True, objects of bulk classes are also parsed, and their data fingerprints are computed.
+        :type parse: bool
+
+        :returns: List of (class name, object name, fingerprint, data fingerprint) tuples for all objects of a given class; data fingerprint is None for unparsed objects.
+        """
+        ignored_key_list = self.snapshot_builder.get_ignored_key_list(class_name)
+        if class_name not in self.api.BULK_MANAGER_NAME_DICT:
+            fingerprint_list = []
+            for pycl_object in self.snapshot_builder.iter_class_objects(class_name):
+                fingerprint = pycl_object.get_fingerprint(ignored_key_list)
+                fingerprint_list.append((class_name, self.get_object_name(pycl_object), fingerprint, fingerprint))
+            return fingerprint_list
+        manager = self.api.get_bulk_manager(class_name)
+        fingerprint_list = []
+        for block in QconfWatcher.iter_blocks(manager, QconfWatcher.iter_output_lines(manager)):
+            data_fingerprint = None
+            if parse:
+                data_fingerprint = next(manager.iter_bulk_output(block)).get_fingerprint(ignored_key_list)
+            fingerprint_list.append((class_name, self.get_block_name(manager, block),
+                                     QconfWatcher.get_block_hash(manager, block), data_fingerprint))
+        return fingerprint_list
+
+    def read_fingerprints(self, parse=False):
+        """
+        :param parse: If True, data fingerprints are also computed.
+        :type parse: bool
+
+        :returns: Tuple of dictionaries of current object fingerprints and data fingerprints (empty unless parse is True), keyed by (class name, object name).
+        """
+        fingerprint_dict = {}
+        data_fingerprint_dict = {}
+        for result in self.parallel_executor.execute(lambda c: self.get_class_fingerprints(c, parse=parse),
+                                                     self.classes):
+            if not result.is_successful():
+                raise result.exception
+            for (class_name, name, fingerprint, data_fingerprint) in result.result:
+                fingerprint_dict[(class_name, name)] = fingerprint
+                if parse:
+                    data_fingerprint_dict[(class_name, name)] = data_fingerprint
+        return (fingerprint_dict, data_fingerprint_dict)
+
+    def get_fingerprints(self):
+        """
+        :returns: Dictionary of current object fingerprints, keyed by (class name, object name).
+        """
+        return self.read_fingerprints()[0]
+
+    def get_snapshot_fingerprints(self, snapshot):
+        """
+        :returns: Dictionary of data fingerprints of snapshot objects, keyed by (class name, object name).
+        """
+        fingerprint_dict = {}
+        for class_name in self.classes:
+            ignored_key_list = self.snapshot_builder.get_ignored_key_list(class_name)
+            for pycl_object in snapshot.get_objects(class_name):
+                fingerprint_dict[(class_name, self.get_object_name(pycl_object))] = \
+                    pycl_object.get_fingerprint(ignored_key_list)
+        return fingerprint_dict
+
+    def set_baseline(self, baseline=None):
+        """
+        :param baseline: Baseline fingerprints (as returned by get_fingerprints()), or ClusterSnapshot object; if not provided, current object fingerprints are retrieved.
+        :type baseline: dict or ClusterSnapshot
+        """
+        self.data_fingerprint_dict = None
+        if baseline is None:
+            baseline = self.get_fingerprints()
+        elif isinstance(baseline, ClusterSnapshot):
+            # Snapshot contains parsed objects, so it can only be compared with data fingerprints
+            self.data_fingerprint_dict = self.get_snapshot_fingerprints(baseline)
+            baseline = {}
+        self.fingerprint_dict = dict(baseline)
+
+    @classmethod
+    def compare(cls, baseline_fingerprint_dict, fingerprint_dict):
+        """
+        :returns: DriftReport describing differences between baseline and current fingerprints.
+        """
+        added = []
+        changed = []
+        for (key, fingerprint) in list(fingerprint_dict.items()):
+            baseline_fingerprint = baseline_fingerprint_dict.get(key)
+            if baseline_fingerprint is None:
+                added.append(key)
+            elif baseline_fingerprint != fingerprint:
+                changed.append(key)
+        removed = [key for key in baseline_fingerprint_dict if key not in fingerprint_dict]
+        return DriftReport(sorted(added), sorted(removed), sorted(changed), fingerprint_dict)
+
+    def check(self, update_baseline=True):
+        """
+        Compare current object fingerprints with the baseline.
+
+        :param update_baseline: If True (default), current fingerprints become the new baseline, so that each change is reported only once.
+        :type update_baseline: bool
+
+        :returns: DriftReport object.
+        """
+        if self.data_fingerprint_dict is None:
+            report = self.compare(self.fingerprint_dict, self.get_fingerprints())
+        else:
+            (fingerprint_dict, data_fingerprint_dict) = self.read_fingerprints(parse=True)
+            report = self.compare(self.data_fingerprint_dict, data_fingerprint_dict)
+            report.fingerprint_dict = fingerprint_dict
+        if not report.is_empty():
+            self.logger.debug('Detected configuration drift: %s' % report.get_summary())
+        if update_baseline:
+            self.fingerprint_dict = report.fingerprint_dict
+            self.data_fingerprint_dict = None
+        return report
+
+
+#############################################################################
+# Testing.
+if __name__ == '__main__':
+    from uge.api.qconf_api import QconfApi
+    detector = DriftDetector(QconfApi())
+    detector.set_baseline()
+    print(detector.check())
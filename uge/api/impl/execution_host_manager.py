@@ -25,6 +25,7 @@ from uge.exceptions.object_not_found import ObjectNotFound
 from uge.exceptions.invalid_request import InvalidRequest
 from uge.objects.qconf_object_factory import QconfObjectFactory
 from .dict_based_object_manager import DictBasedObjectManager
+from .execution_host_table import ExecutionHostTable
 
 
 class ExecutionHostManager(DictBasedObjectManager):
@@ -43,6 +44,8 @@ class ExecutionHostManager(DictBasedObjectManager):
     OBJECT_CLASS_NAME = 'ExecutionHost'
     OBJECT_CLASS_UGE_NAME = 'e'
     OBJECT_CLASS_UGE_LIST_DETAILS_NAME = 'ld'
+    OBJECT_CLASS_UGE_ATTRIBUTE_NAME = 'exechost'
+    READ_ONLY_KEY_LIST = ['load_values', 'processors']
 
     BULK_SEPARATOR = '^===========+'
 
@@ -59,11 +62,26 @@ class ExecutionHostManager(DictBasedObjectManager):
             self.object_dump_ignored_key_list = ['load_values', 'processors']
         super(ExecutionHostManager, self).write_objects(object_list, dirname)
 
-    def list_objects(self):
-        name_list = DictBasedObjectManager.list_objects(self)
+    def create_object_list_from_qconf_output(self, qconf_output):
+        name_list = DictBasedObjectManager.create_object_list_from_qconf_output(self, qconf_output)
         name_list.append('global')
         return name_list
 
+    def get_table(self):
+        """
+        Retrieve all execution hosts with a single bulk qconf call, and
+        store their load values, complex values and processors in columns,
+        without creating ExecutionHost objects.
+
+        :returns: ExecutionHostTable object.
+        """
+        qconf_output = self.qconf_executor.iter_qconf_output(
+            self.get_objects_args(), self.QCONF_ERROR_REGEX_LIST, failure_regex_list=self.QCONF_FAILURE_REGEX_LIST)
+        try:
+            return ExecutionHostTable.from_qconf_output(qconf_output, self.BULK_SEPARATOR, self.KEY_VALUE_DELIMITER)
+        except ObjectNotFound:
+            return ExecutionHostTable()
+
 
 #############################################################################
 # Testing.
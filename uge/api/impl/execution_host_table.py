@@ -0,0 +1,308 @@
+#!/usr/bin/env python
+#
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+#
+import operator
+import re
+from array import array
+
+from uge.exceptions.invalid_argument import InvalidArgument
+from uge.exceptions.object_not_found import ObjectNotFound
+
+
+class ExecutionHostTable(object):
+    """
+    Columnar view of execution hosts, suitable for fleet-wide queries.
+
+    Each load value, complex value and the number of processors is stored
+    in a separate column, with one entry per host. Numeric columns are
+    arrays of floats ('nan' for hosts that do not report a value), with
+    memory values (K/M/G/T, k/m/g/t) normalized to bytes and boolean values
+    converted to 1.0/0.0; columns containing other values (e.g., arch) are
+    lists of strings (None for missing values). Numeric columns support the
+    buffer protocol, and can be wrapped by array libraries without copying
+    (e.g., numpy.frombuffer(table.get_column('np_load_avg'))).
+
+    Usage:
+        table = api.get_ehost_table()
+        hosts = table.select('mem_free < 4G and np_load_avg > 1.5')
+    """
+
+    LOAD_VALUES = 'load_values'
+    COMPLEX_VALUES = 'complex_values'
+    PROCESSORS = 'processors'
+
+    # Memory unit multipliers, as defined by UGE (sge_types)
+    UNIT_MULTIPLIER_DICT = {
+        'k': 1000, 'K': 1024,
+        'm': 1000 ** 2, 'M': 1024 ** 2,
+        'g': 1000 ** 3, 'G': 1024 ** 3,
+        't': 1000 ** 4, 'T': 1024 ** 4,
+    }
+    NUMBER_REGEX = re.compile(r'^([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)([kKmMgGtT]?)$')
+    SPECIAL_VALUE_DICT = {'TRUE': 1.0, 'FALSE': 0.0, 'INFINITY': float('inf')}
+
+    OPERATOR_DICT = {
+        '<': operator.lt,
+        '<=': operator.le,
+        '>': operator.gt,
+        '>=': operator.ge,
+        '==': operator.eq,
+        '=': operator.eq,
+        '!=': operator.ne,
+    }
+    CONDITION_REGEX = re.compile(r'^\s*([\w.\-/]+)\s*(<=|>=|==|!=|<|>|=)\s*(\S+)\s*$')
+
+    def __init__(self, host_names=None, column_dict=None):
+        """
+        :param host_names: Host names, in row order.
+        :type host_names: list
+
+        :param column_dict: Dictionary of columns, keyed by (source attribute, name) tuples, e.g. ('load_values', 'mem_free').
+        :type column_dict: dict
+        """
+        self.host_names = host_names or []
+        self.host_index = dict([(name, row) for (row, name) in enumerate(self.host_names)])
+        self.column_dict = column_dict or {}
+
+    def __len__(self):
+        return len(self.host_names)
+
+    def __repr__(self):
+        return 'ExecutionHostTable(%s hosts, %s columns)' % (len(self.host_names), len(self.column_dict))
+
+    @classmethod
+    def parse_value(cls, value):
+        """
+        :returns: Float value (memory units are normalized to bytes), or None if value is not numeric.
+        """
+        special_value = cls.SPECIAL_VALUE_DICT.get(value.upper())
+        if special_value is not None:
+            return special_value
+        match = cls.NUMBER_REGEX.match(value)
+        if not match:
+            return None
+        (number, unit) = match.groups()
+        if unit:
+            return float(number) * cls.UNIT_MULTIPLIER_DICT[unit]
+        return float(number)
+
+    @classmethod
+    def create_column(cls, value_dict, n_rows):
+        parsed_value_dict = {}
+        for (row, value) in list(value_dict.items()):
+            parsed_value = cls.parse_value(value)
+            if parsed_value is None:
+                # Not a numeric column
+                return [value_dict.get(row) for row in range(n_rows)]
+            parsed_value_dict[row] = parsed_value
+        nan = float('nan')
+        return array('d', [parsed_value_dict.get(row, nan) for row in range(n_rows)])
+
+    @classmethod
+    def create_table(cls, host_value_iterable):
+        """
+        :param host_value_iterable: Iterable of (host name, load values, complex values, processors) tuples; load and complex values are lists of name=value strings.
+        :type host_value_iterable: iterable
+
+        :returns: ExecutionHostTable object.
+        """
+        host_names = []
+        raw_column_dict = {}
+        for (row, (host_name, load_values, complex_values, processors)) in enumerate(host_value_iterable):
+            host_names.append(host_name)
+            for (source, items) in [(cls.LOAD_VALUES, load_values), (cls.COMPLEX_VALUES, complex_values)]:
+                for item in items or []:
+                    (name, _, value) = item.partition('=')
+                    raw_column_dict.setdefault((source, name), {})[row] = value
+            if processors is not None:
+                raw_column_dict.setdefault((cls.PROCESSORS, cls.PROCESSORS), {})[row] = '%s' % processors
+        n_rows = len(host_names)
+        column_dict = dict([(key, cls.create_column(value_dict, n_rows))
+                            for (key, value_dict) in list(raw_column_dict.items())])
+        return ExecutionHostTable(host_names, column_dict)
+
+    @classmethod
+    def iter_qconf_host_values(cls, lines, separator_regex, delimiter=' '):
+        """ Extract host values from bulk qconf output (qconf -seld), without creating host objects. """
+        host_values = [None, None, None, None]
+        separator_regex = re.compile(separator_regex)
+        for line in lines:
+            line = line.rstrip('\n')
+            if not line:
+                continue
+            if separator_regex.match(line):
+                if host_values[0] is not None:
+                    yield tuple(host_values)
+                host_values = [None, None, None, None]
+                continue
+            (key, _, value) = line.partition(delimiter)
+            value = value.strip()
+            if key == 'hostname':
+                host_values[0] = value
+            elif key == cls.LOAD_VALUES:
+                host_values[1] = cls.split_items(value)
+            elif key == cls.COMPLEX_VALUES:
+                host_values[2] = cls.split_items(value)
+            elif key == cls.PROCESSORS:
+                host_values[3] = value
+        if host_values[0] is not None:
+            yield tuple(host_values)
+
+    @classmethod
+    def split_items(cls, value):
+        if not value or value.upper() == 'NONE':
+            return []
+        return value.split(',')
+
+    @classmethod
+    def from_qconf_output(cls, lines, separator_regex, delimiter=' '):
+        """
+        :param lines: Lines of bulk qconf output (qconf -seld).
+        :type lines: iterable
+
+        :returns: ExecutionHostTable object.
+        """
+        return cls.create_table(cls.iter_qconf_host_values(lines, separator_regex, delimiter))
+
+    @classmethod
+    def from_objects(cls, ehost_iterable):
+        """
+        :param ehost_iterable: Iterable of ExecutionHost objects.
+        :type ehost_iterable: iterable
+
+        :returns: ExecutionHostTable object.
+        """
+        def get_items(value):
+            if value is None:
+                return []
+            if type(value) == dict:
+                return ['%s=%s' % (key, item_value) for (key, item_value) in list(value.items())]
+            if type(value) != list:
+                return [value]
+            return value
+
+        return cls.create_table([(ehost.data.get('hostname'), get_items(ehost.data.get(cls.LOAD_VALUES)),
+                                  get_items(ehost.data.get(cls.COMPLEX_VALUES)), ehost.data.get(cls.PROCESSORS))
+                                 for ehost in ehost_iterable])
+
+    def get_column_names(self, source=None):
+        """
+        :param source: Column source ('load_values', 'complex_values' or 'processors'); if not provided, column names for all sources are returned.
+        :type source: str
+
+        :returns: Sorted list of column names.
+        """
+        return sorted(set([name for (column_source, name) in self.column_dict if source in (None, column_source)]))
+
+    def get_column_key(self, name):
+        if '.' in name:
+            (source, column_name) = name.split('.', 1)
+            if (source, column_name) in self.column_dict:
+                return (source, column_name)
+        # Load values take precedence over complex values with the same name
+        for source in [self.LOAD_VALUES, self.COMPLEX_VALUES, self.PROCESSORS]:
+            if (source, name) in self.column_dict:
+                return (source, name)
+        raise ObjectNotFound('Execution host table does not have column %s.' % name)
+
+    def get_column(self, name):
+        """
+        :param name: Column name (e.g., 'mem_free'); name can be qualified with source if load value and complex value have the same name (e.g., 'complex_values.mem_free').
+        :type name: str
+
+        :returns: Column values, in host order: array of floats for numeric columns, list of strings otherwise.
+
+        :raises ObjectNotFound: in case column does not exist.
+        """
+        return self.column_dict[self.get_column_key(name)]
+
+    def get_row(self, host_name):
+        """
+        :returns: Dictionary of host values, keyed by (source, name) tuples; missing values are not included.
+
+        :raises ObjectNotFound: in case host is not in the table.
+        """
+        row = self.host_index.get(host_name)
+        if row is None:
+            raise ObjectNotFound('Execution host table does not contain host %s.' % host_name)
+        row_dict = {}
+        for (key, column) in list(self.column_dict.items()):
+            value = column[row]
+            if value is not None and value == value:
+                row_dict[key] = value
+        return row_dict
+
+    def parse_condition(self, condition):
+        if not isinstance(condition, (tuple, list)):
+            match = self.CONDITION_REGEX.match(condition)
+            if not match:
+                raise InvalidArgument('Invalid execution host condition: %s' % condition)
+            condition = match.groups()
+        (name, op, value) = condition
+        if op not in self.OPERATOR_DICT:
+            raise InvalidArgument('Invalid operator in execution host condition: %s' % op)
+        column = self.get_column(name)
+        if type(column) == array and not isinstance(value, (int, float)):
+            parsed_value = self.parse_value('%s' % value)
+            if parsed_value is None:
+                raise InvalidArgument('Value %s cannot be compared with numeric column %s.' % (value, name))
+            value = parsed_value
+        return (column, self.OPERATOR_DICT[op], value)
+
+    def select(self, conditions):
+        """
+        Select hosts satisfying all conditions.
+
+        :param conditions: Conditions, either as a list of (column name, operator, value) tuples, or as a string containing conditions joined with 'and'. Supported operators are <, <=, >, >=, == and !=; numeric values may use memory units. Hosts that do not report a value never satisfy a condition on that value.
+        :type conditions: list or str
+
+        :returns: List of host names, in table order.
+
+        :raises InvalidArgument: in case condition cannot be parsed.
+        :raises ObjectNotFound: in case condition refers to a nonexistent column.
+
+        >>> table.select('mem_free < 4G and np_load_avg > 1.5')
+        >>> table.select([('slots', '>=', 16), ('arch', '==', 'lx-amd64')])
+        """
+        if not isinstance(conditions, (tuple, list)):
+            conditions = re.split(r'\s+and\s+', conditions.strip())
+        parsed_conditions = [self.parse_condition(condition) for condition in conditions]
+        rows = range(len(self.host_names))
+        for (column, compare, value) in parsed_conditions:
+            # Each condition only scans rows that satisfied previous conditions;
+            # missing values (None or nan, which is not equal to itself) never match
+            selected_rows = []
+            for row in rows:
+                row_value = column[row]
+                if row_value is not None and row_value == row_value and compare(row_value, value):
+                    selected_rows.append(row)
+            rows = selected_rows
+        return [self.host_names[row] for row in rows]
+
+
+#############################################################################
+# Testing.
+if __name__ == '__main__':
+    table = ExecutionHostTable.from_qconf_output([
+        'hostname h1', 'load_values arch=lx-amd64,mem_free=2.5G,np_load_avg=2.0', 'processors 8',
+        '==============', 'hostname h2', 'load_values arch=lx-amd64,mem_free=31.2G,np_load_avg=0.1',
+        'processors 32'], '^===========+')
+    print(table.select('mem_free < 4G and np_load_avg > 1.5'))
@@ -0,0 +1,257 @@
+#!/usr/bin/env python
+#
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+#
+from uge.exceptions.invalid_argument import InvalidArgument
+from uge.exceptions.object_not_found import ObjectNotFound
+
+
+class HostGroupIndex(object):
+    """
+    Resolution index for host groups.
+
+    Host group host lists may refer to other host groups (e.g., '@rack1').
+    The index keeps the flattened host set of every group, and an inverted
+    index mapping each host to all groups containing it, directly or through
+    nested groups. When a single group changes, only that group and groups
+    containing it are resolved again.
+
+    Usage:
+        index = api.get_hgrp_index()
+        group_names = index.get_groups('node1234')
+        hosts = index.get_hosts('@allhosts')
+    """
+
+    GROUP_PREFIX = '@'
+
+    def __init__(self, host_groups=None):
+        """
+        :param host_groups: Iterable of HostGroup objects.
+        :type host_groups: iterable
+
+        :raises InvalidArgument: in case host groups contain a cycle.
+        """
+        # Group name => list of members (hosts and group references)
+        self.member_dict = {}
+        # Group name => set of groups that refer to it directly
+        self.parent_dict = {}
+        # Group name => frozenset of resolved host names
+        self.host_set_dict = {}
+        # Host name => set of groups containing host
+        self.host_group_dict = {}
+        for host_group in host_groups or []:
+            self.set_members(host_group.data.get('group_name'), host_group.data.get('hostlist'))
+        self.resolve_groups(list(self.member_dict.keys()))
+
+    def __len__(self):
+        return len(self.member_dict)
+
+    def __contains__(self, group_name):
+        return group_name in self.member_dict
+
+    def __repr__(self):
+        return 'HostGroupIndex(%s groups, %s hosts)' % (len(self.member_dict), len(self.host_group_dict))
+
+    @classmethod
+    def is_group(cls, name):
+        return name.startswith(cls.GROUP_PREFIX)
+
+    @classmethod
+    def get_member_list(cls, hostlist):
+        if not hostlist:
+            return []
+        if type(hostlist) != list:
+            hostlist = hostlist.split()
+        return [member for member in hostlist if member.upper() != 'NONE']
+
+    def set_members(self, group_name, hostlist):
+        for member in self.member_dict.get(group_name, []):
+            if self.is_group(member):
+                self.parent_dict.get(member, set()).discard(group_name)
+        member_list = self.get_member_list(hostlist)
+        self.member_dict[group_name] = member_list
+        for member in member_list:
+            if self.is_group(member):
+                self.parent_dict.setdefault(member, set()).add(group_name)
+
+    def get_ancestors(self, group_name):
+        """ :returns: Set containing group and all groups that contain it, directly or indirectly. """
+        ancestor_set = set()
+        pending_list = [group_name]
+        while pending_list:
+            name = pending_list.pop()
+            if name in ancestor_set:
+                continue
+            ancestor_set.add(name)
+            pending_list.extend(self.parent_dict.get(name, []))
+        return ancestor_set
+
+    def resolve_groups(self, group_names):
+        """
+        Resolve host sets of the given groups, reusing resolved sets of all
+        other groups, and update inverted index.
+
+        :raises InvalidArgument: in case groups contain a cycle.
+        """
+        stale_set = set(group_names)
+        host_set_dict = {}
+        for group_name in group_names:
+            self.resolve_group(group_name, stale_set, host_set_dict, [])
+        # Groups are resolved before anything is modified, so that the index
+        # remains unchanged if a cycle is found
+        for (group_name, host_set) in list(host_set_dict.items()):
+            old_host_set = self.host_set_dict.get(group_name, frozenset())
+            for host_name in old_host_set - host_set:
+                group_set = self.host_group_dict[host_name]
+                group_set.discard(group_name)
+                if not group_set:
+                    del self.host_group_dict[host_name]
+            for host_name in host_set - old_host_set:
+                self.host_group_dict.setdefault(host_name, set()).add(group_name)
+            self.host_set_dict[group_name] = host_set
+
+    def resolve_group(self, group_name, stale_set, host_set_dict, path_list):
+        host_set = host_set_dict.get(group_name)
+        if host_set is not None:
+            return host_set
+        if group_name not in stale_set:
+            # Unchanged group, or reference to a nonexistent group
+            return self.host_set_dict.get(group_name, frozenset())
+        if group_name in path_list:
+            cycle_list = path_list[path_list.index(group_name):] + [group_name]
+            raise InvalidArgument('Host group cycle detected: %s' % ' -> '.join(cycle_list))
+        path_list.append(group_name)
+        host_set = set()
+        for member in self.member_dict.get(group_name, []):
+            if self.is_group(member):
+                host_set.update(self.resolve_group(member, stale_set, host_set_dict, path_list))
+            else:
+                host_set.add(member)
+        path_list.pop()
+        host_set = frozenset(host_set)
+        if group_name in self.member_dict:
+            host_set_dict[group_name] = host_set
+        return host_set
+
+    def update_group(self, host_group):
+        """
+        Update index after host group was added or modified.
+
+        :param host_group: Host group object.
+        :type host_group: HostGroup
+
+        :raises InvalidArgument: in case modified group introduces a cycle; index is not changed in that case.
+        """
+        group_name = host_group.data.get('group_name')
+        old_member_list = self.member_dict.get(group_name)
+        self.set_members(group_name, host_group.data.get('hostlist'))
+        try:
+            self.resolve_groups(list(self.get_ancestors(group_name)))
+        except InvalidArgument:
+            if old_member_list is None:
+                self.set_members(group_name, None)
+                del self.member_dict[group_name]
+            else:
+                self.set_members(group_name, old_member_list)
+            raise
+
+    def delete_group(self, group_name):
+        """
+        Update index after host group was deleted.
+
+        :param group_name: Host group name.
+        :type group_name: str
+
+        :raises ObjectNotFound: in case group is not in the index.
+        """
+        if group_name not in self.member_dict:
+            raise ObjectNotFound('Host group %s is not in the index.' % group_name)
+        ancestor_set = self.get_ancestors(group_name)
+        self.set_members(group_name, None)
+        del self.member_dict[group_name]
+        for host_name in self.host_set_dict.pop(group_name):
+            group_set = self.host_group_dict[host_name]
+            group_set.discard(group_name)
+            if not group_set:
+                del self.host_group_dict[host_name]
+        ancestor_set.discard(group_name)
+        self.resolve_groups(list(ancestor_set))
+
+    def apply_event(self, event):
+        """
+        Update index from a host group watch event (see QconfWatcher).
+
+        :param event: Watch event; events for other classes are ignored.
+        :type event: WatchEvent
+        """
+        if event.class_name != 'HostGroup':
+            return
+        if event.event_type == 'deleted':
+            if event.name in self.member_dict:
+                self.delete_group(event.name)
+        else:
+            self.update_group(event.pycl_object)
+
+    def get_group_names(self):
+        """ :returns: Sorted list of indexed group names. """
+        return sorted(self.member_dict.keys())
+
+    def get_members(self, group_name):
+        """
+        :returns: List of direct group members (hosts and group references), as given in group host list.
+
+        :raises ObjectNotFound: in case group is not in the index.
+        """
+        if group_name not in self.member_dict:
+            raise ObjectNotFound('Host group %s is not in the index.' % group_name)
+        return list(self.member_dict[group_name])
+
+    def get_hosts(self, group_name):
+        """
+        :param group_name: Host group name (e.g., '@allhosts').
+        :type group_name: str
+
+        :returns: Frozen set of host names in the group, including hosts in nested groups.
+
+        :raises ObjectNotFound: in case group is not in the index.
+        """
+        host_set = self.host_set_dict.get(group_name)
+        if host_set is None:
+            raise ObjectNotFound('Host group %s is not in the index.' % group_name)
+        return host_set
+
+    def get_groups(self, host_name):
+        """
+        :param host_name: Host name.
+        :type host_name: str
+
+        :returns: Set of names of groups that contain host, directly or through nested groups; empty set if host does not belong to any group.
+        """
+        return frozenset(self.host_group_dict.get(host_name, ()))
+
+    def contains(self, group_name, host_name):
+        """ :returns: True if group contains host, directly or through nested groups. """
+        return host_name in self.host_set_dict.get(group_name, ())
+
+
+#############################################################################
+# Testing.
+if __name__ == '__main__':
+    pass
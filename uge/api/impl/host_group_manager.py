@@ -25,6 +25,7 @@ from uge.exceptions.invalid_argument import InvalidArgument
 from uge.exceptions.invalid_request import InvalidRequest
 from uge.objects.qconf_object_factory import QconfObjectFactory
 from .dict_based_object_manager import DictBasedObjectManager
+from .host_group_index import HostGroupIndex
 
 
 class HostGroupManager(DictBasedObjectManager):
@@ -43,6 +44,7 @@ class HostGroupManager(DictBasedObjectManager):
     OBJECT_CLASS_NAME = 'HostGroup'
     OBJECT_CLASS_UGE_NAME = 'hgrp'
     OBJECT_CLASS_UGE_LIST_DETAILS_NAME = 'ld'
+    OBJECT_CLASS_UGE_ATTRIBUTE_NAME = 'hostgroup'
 
     def __init__(self, qconf_executor):
         DictBasedObjectManager.__init__(self, qconf_executor)
@@ -50,6 +52,18 @@ class HostGroupManager(DictBasedObjectManager):
     def get_bulk_dump_filename(self, object):
         return 'conf_api_dump_' + object.data['group_name']
 
+    def get_index(self):
+        """
+        Retrieve all host groups with a single bulk qconf call, and resolve
+        nested group references.
+
+        :returns: HostGroupIndex object.
+        """
+        try:
+            return HostGroupIndex(self.iter_objects())
+        except ObjectNotFound:
+            return HostGroupIndex()
+
 
 #############################################################################
 # Testing.
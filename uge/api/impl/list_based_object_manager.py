@@ -70,7 +70,7 @@ class ListBasedObjectManager(object):
 
     def add_names(self, names):
         names = self.__prepare_names(names)
-        self.qconf_executor.execute_qconf('-a%s %s' % (self.OBJECT_CLASS_UGE_NAME, names), self.QCONF_ERROR_REGEX_LIST,
+        self.qconf_executor.execute_qconf(['-a%s' % self.OBJECT_CLASS_UGE_NAME, names], self.QCONF_ERROR_REGEX_LIST,
                                           combine_error_lines=False)
         name_list = self.list_names()
         name_list.set_modify_metadata()
@@ -78,21 +78,26 @@ class ListBasedObjectManager(object):
 
     def delete_names(self, names):
         names = self.__prepare_names(names)
-        self.qconf_executor.execute_qconf('-d%s %s' % (self.OBJECT_CLASS_UGE_NAME, names), self.QCONF_ERROR_REGEX_LIST,
+        self.qconf_executor.execute_qconf(['-d%s' % self.OBJECT_CLASS_UGE_NAME, names], self.QCONF_ERROR_REGEX_LIST,
                                           combine_error_lines=False)
         name_list = self.list_names()
         name_list.set_modify_metadata()
         return name_list
 
+    def get_list_names_args(self):
+        return ['-s%s' % self.OBJECT_CLASS_UGE_NAME]
+
+    def create_name_list_from_qconf_output(self, qconf_output):
+        return QconfNameList(metadata={'description': 'List of %s names' % (self.OBJECT_NAME)},
+                             data=QconfObject.get_list_from_qconf_output(qconf_output))
+
     def list_names(self):
         try:
-            qconf_output = self.qconf_executor.execute_qconf('-s%s' % (self.OBJECT_CLASS_UGE_NAME),
+            qconf_output = self.qconf_executor.execute_qconf(self.get_list_names_args(),
                                                              self.QCONF_ERROR_REGEX_LIST).get_stdout()
-            name_list = QconfNameList(metadata={'description': 'List of %s names' % (self.OBJECT_NAME)},
-                                      data=QconfObject.get_list_from_qconf_output(qconf_output))
         except ObjectNotFound:
-            name_list = QconfNameList(metadata={'description': 'List of %s names' % (self.OBJECT_NAME)}, data=[])
-        return name_list
+            qconf_output = ''
+        return self.create_name_list_from_qconf_output(qconf_output)
 
 
 #############################################################################
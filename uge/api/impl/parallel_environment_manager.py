@@ -39,6 +39,7 @@ class ParallelEnvironmentManager(DictBasedObjectManager):
     OBJECT_CLASS_NAME = 'ParallelEnvironment'
     OBJECT_CLASS_UGE_NAME = 'p'
     OBJECT_CLASS_UGE_LIST_DETAILS_NAME = 'ld'
+    OBJECT_CLASS_UGE_ATTRIBUTE_NAME = 'pe'
 
     def __init__(self, qconf_executor):
         DictBasedObjectManager.__init__(self, qconf_executor)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+#
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+#
+import threading
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from uge.log.log_manager import LogManager
+from uge.exceptions.invalid_argument import InvalidArgument
+
+
+class ParallelOperationResult(object):
+    """ Outcome of an operation executed for a single item. """
+
+    def __init__(self, item, result=None, exception=None):
+        self.item = item
+        self.result = result
+        self.exception = exception
+
+    def is_successful(self):
+        return self.exception is None
+
+    def __repr__(self):
+        if self.exception is not None:
+            return 'ParallelOperationResult(item=%r, exception=%r)' % (self.item, self.exception)
+        return 'ParallelOperationResult(item=%r, result=%r)' % (self.item, self.result)
+
+
+class ParallelExecutor(object):
+    """
+    Executes independent per-item operations on a bounded pool of threads.
+
+    At most max_workers operations (and hence qconf processes) run at the
+    same time. Items are handed to worker threads through a queue that
+    holds at most max_pending items, so that items coming from a
+    generator are not consumed faster than they can be processed.
+    An exception raised for one item does not affect remaining items;
+    it is recorded in the item's result.
+
+    Usage:
+        executor = ParallelExecutor(max_workers=8)
+        results = executor.execute(lambda name: api.get_ehost(name), host_names)
+        failed = [r.item for r in results if not r.is_successful()]
+    """
+
+    DEFAULT_MAX_WORKERS = 8
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, max_pending=None):
+        """
+        :param max_workers: Maximum number of operations executing at the same time.
+        :type max_workers: int
+
+        :param max_pending: Maximum number of items waiting for a worker thread (default: 2*max_workers).
+        :type max_pending: int
+
+        :raises InvalidArgument: in case max_workers or max_pending are not positive numbers.
+        """
+        self.logger = LogManager.get_instance().get_logger(self.__class__.__name__)
+        if not max_workers or max_workers < 1:
+            raise InvalidArgument('Maximum number of parallel operations must be a positive number.')
+        if max_pending is None:
+            max_pending = 2 * max_workers
+        if max_pending < 1:
+            raise InvalidArgument('Maximum number of pending operations must be a positive number.')
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+
+    def execute(self, operation, items):
+        """
+        Execute operation(item) for each item.
+
+        :param operation: Callable invoked with a single item argument.
+        :type operation: callable
+
+        :param items: Items to process; may be any iterable, including a generator.
+        :type items: iterable
+
+        :returns: List of ParallelOperationResult objects, in the same order as input items.
+        """
+        task_queue = queue.Queue(self.max_pending)
+        result_dict = {}
+        result_lock = threading.Lock()
+
+        def run_tasks():
+            while True:
+                task = task_queue.get()
+                if task is None:
+                    return
+                (index, item) = task
+                try:
+                    result = ParallelOperationResult(item, result=operation(item))
+                except Exception as ex:
+                    self.logger.debug('Operation failed for item %s: %s' % (item, ex))
+                    result = ParallelOperationResult(item, exception=ex)
+                with result_lock:
+                    result_dict[index] = result
+
+        n_workers = self.max_workers
+        if hasattr(items, '__len__'):
+            n_workers = max(1, min(n_workers, len(items)))
+        self.logger.debug('Starting %s worker threads' % n_workers)
+        threads = []
+        for i in range(n_workers):
+            thread = threading.Thread(target=run_tasks)
+            thread.daemon = True
+            thread.start()
+            threads.append(thread)
+        try:
+            for task in enumerate(items):
+                # Blocks while max_pending items are waiting
+                task_queue.put(task)
+        finally:
+            for thread in threads:
+                task_queue.put(None)
+            for thread in threads:
+                thread.join()
+        return [result_dict[index] for index in sorted(result_dict.keys())]
+
+
+#############################################################################
+# Testing.
+if __name__ == '__main__':
+    executor = ParallelExecutor(max_workers=4)
+    for r in executor.execute(lambda x: 10 / x, [1, 2, 0, 5]):
+        print(r)
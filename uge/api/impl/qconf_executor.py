@@ -21,7 +21,13 @@
 #
 import re
 import os
+import subprocess
+import tempfile
 from uge.utility.uge_subprocess import UgeSubprocess
+from uge.utility.uge_worker_pool import UgeWorkerPool
+from uge.utility.uge_worker_pool import UgeShellWorker
+from uge.utility.uge_environment import UgeEnvironment
+from uge.utility.uge_version_cache import UgeVersionCache
 from uge.log.log_manager import LogManager
 from uge.exceptions.qconf_exception import QconfException
 from uge.exceptions.command_failed import CommandFailed
@@ -42,7 +48,8 @@ class QconfExecutor(object):
     QCONF_SUCCESS_REGEX_LIST = []  # for successful outcome incorrectly classified as failure
     QCONF_FAILURE_REGEX_LIST = []  # for failure incorrectly classified as successful outcome
 
-    def __init__(self, sge_root, sge_cell, sge_qmaster_port, sge_execd_port):
+    def __init__(self, sge_root, sge_cell, sge_qmaster_port, sge_execd_port, worker_pool_size=None,
+                 object_cache=None):
         self.logger = LogManager.get_instance().get_logger(self.__class__.__name__)
         self.env_dict = {
             'SGE_ROOT': sge_root,
@@ -52,6 +59,13 @@ class QconfExecutor(object):
             'SGE_SINGLE_LINE': '1',
         }
         self.uge_version = None
+        # Shared by all object managers using this executor
+        self.object_cache = object_cache
+        # Settings file is sourced only once; qconf is executed directly
+        self.command_env_dict = UgeEnvironment.get_command_env(self.env_dict)
+        self.worker_pool = None
+        if worker_pool_size:
+            self.worker_pool = UgeWorkerPool(worker_pool_size, env=self.command_env_dict)
         self.__configure()
 
     def __configure(self):
@@ -61,21 +75,38 @@ class QconfExecutor(object):
 
     def get_uge_version(self):
         if not self.uge_version:
-            p = self.execute_qconf('-help')
-            lines = p.get_stdout().split('\n')
-            if not len(lines):
-                raise QconfException('Cannot determine UGE version from output: %s' % p.get_stdout())
-            self.uge_version = lines[0].split()[-1].split("_")[0].replace('(','').replace(')','')
-            # if 2022.0.1 is used instead
-            # self.uge_version = lines[0].split()[1]
+            # Version is probed only if it is not already cached for this qconf binary
+            self.uge_version = UgeVersionCache.get_uge_version(
+                self.env_dict['SGE_ROOT'], self.env_dict['SGE_CELL'], 'qconf', self.__probe_uge_version)
         return self.uge_version
 
+    def __probe_uge_version(self):
+        p = self.execute_qconf('-help')
+        lines = p.get_stdout().split('\n')
+        if not len(lines):
+            raise QconfException('Cannot determine UGE version from output: %s' % p.get_stdout())
+        uge_version = lines[0].split()[-1].split("_")[0].replace('(','').replace(')','')
+        # if 2022.0.1 is used instead
+        # uge_version = lines[0].split()[1]
+        return uge_version
+
+    def get_qconf_argv(self, cmd):
+        """
+        :param cmd: Qconf arguments, either as a list, or as a string using shell quoting rules.
+        :type cmd: list or str
+
+        :returns: Qconf argument vector, starting with qconf full path.
+        """
+        return UgeEnvironment.get_command_argv(self.env_dict['SGE_ROOT'], self.env_dict['SGE_CELL'], 'qconf', cmd)
+
     def execute_qconf(self, cmd, error_regex_list=[], error_details=None, combine_error_lines=False,
                       success_regex_list=[], failure_regex_list=[]):
         try:
-            command = '. %s/%s/common/settings.sh; qconf %s' % (
-            self.env_dict['SGE_ROOT'], self.env_dict['SGE_CELL'], cmd)
-            p = UgeSubprocess(command, env=self.env_dict)
+            argv = self.get_qconf_argv(cmd)
+            if self.worker_pool:
+                p = self.worker_pool.create_process(' '.join([UgeShellWorker.quote(arg) for arg in argv]))
+            else:
+                p = UgeSubprocess(argv, env=self.command_env_dict, shell=False)
             p.run()
 
             # In some cases successful outcome is actually a failure
@@ -100,6 +131,59 @@ class QconfExecutor(object):
                     raise qconfExClass(error, error_details=error_details)
             raise
 
+    def iter_qconf_output(self, cmd, error_regex_list=[], error_details=None, failure_regex_list=[]):
+        """
+        Execute qconf and yield lines of its standard output as they are produced,
+        so that large outputs never have to be held in memory. Qconf is always
+        executed in a new process, even if worker pool is used.
+
+        :raises QconfException: (or one of its subclasses) after output is consumed, in case qconf fails.
+        """
+        argv = self.get_qconf_argv(cmd)
+        self.logger.debug('Streaming output of: [%s]' % argv)
+        # Standard error goes into a file, so that qconf never blocks on it
+        with tempfile.TemporaryFile() as stderr_file:
+            p = subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=stderr_file, env=self.command_env_dict)
+            try:
+                for line in p.stdout:
+                    yield line.decode()
+            finally:
+                p.stdout.close()
+                exit_status = p.wait()
+            stderr_file.seek(0)
+            error = stderr_file.read().decode()
+        self.logger.debug('Exit status: %s' % exit_status)
+        self.check_qconf_error(error, exit_status, error_regex_list=error_regex_list,
+                               error_details=error_details, failure_regex_list=failure_regex_list)
+
+    def check_qconf_error(self, error, exit_status, error_regex_list=[], error_details=None, failure_regex_list=[]):
+        """
+        Classify outcome of a qconf command executed outside of execute_qconf().
+
+        :param error: Qconf standard error.
+        :type error: str
+
+        :param exit_status: Qconf exit status.
+        :type exit_status: int
+
+        :raises QconfException: (or one of its subclasses) in case qconf failed.
+        """
+        if exit_status != 0:
+            for (pattern, qconfExClass) in error_regex_list + QconfExecutor.QCONF_ERROR_REGEX_LIST:
+                if pattern.match(error):
+                    raise qconfExClass(error, error_details=error_details)
+            raise CommandFailed(error, command_stderr=error, command_exit_status=exit_status)
+        # In some cases successful outcome is actually a failure
+        if error:
+            for (pattern, qconfExClass) in failure_regex_list + QconfExecutor.QCONF_FAILURE_REGEX_LIST:
+                if pattern.match(error):
+                    raise qconfExClass(error, error_details=error_details)
+
+    def close(self):
+        if self.worker_pool:
+            self.worker_pool.close()
+            self.worker_pool = None
+
     def execute_qconf_with_object(self, cmd, qconf_object, error_regex_list=[]):
         try:
             # fd, tmp_file_path = tempfile.mkstemp(text=True)
@@ -107,13 +191,17 @@ class QconfExecutor(object):
             tmp_file_path = None
             tmp_dir_path = None
             tmp_file, tmp_file_path, tmp_dir_path = qconf_object.get_tmp_file()
-            tmp_file_content = qconf_object.to_uge()
-            tmp_file.write(tmp_file_content)
+            qconf_object.write_uge(tmp_file)
             tmp_file.flush()
             tmp_file.close()
-            full_cmd = '%s %s' % (cmd, tmp_file_path)
-            error_details = 'Object configuration file content:\n%s' % tmp_file_content
-            self.execute_qconf(full_cmd, error_regex_list=error_regex_list, error_details=error_details)
+            full_cmd = UgeEnvironment.split_args(cmd) + [tmp_file_path]
+            try:
+                self.execute_qconf(full_cmd, error_regex_list=error_regex_list)
+            except QconfException as ex:
+                # Object content is serialized again only if needed for error details
+                if ex.error_details is None:
+                    ex.error_details = 'Object configuration file content:\n%s' % qconf_object.to_uge()
+                raise
         finally:
             if tmp_file_path is not None:
                 os.remove(tmp_file_path)
@@ -123,7 +211,7 @@ class QconfExecutor(object):
     def execute_qconf_with_dir(self, cmd, dir, error_regex_list=[]):
         if not os.path.isdir(dir):
             raise QconfException('%s is not a directory' % dir)
-        full_cmd = '%s %s' % (cmd, dir)
+        full_cmd = UgeEnvironment.split_args(cmd) + [dir]
         self.execute_qconf(full_cmd, error_regex_list=error_regex_list)
 
 
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+#
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+#
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from uge.log.log_manager import LogManager
+from uge.exceptions.invalid_argument import InvalidArgument
+
+
+class QconfObjectCache(object):
+    """
+    Read-through cache for objects retrieved from qmaster.
+
+    Entries are keyed by (object class, object name), expire after a
+    configurable time-to-live, and the least recently used entries are
+    evicted once the cache size limit is reached. Objects are copied on
+    the way in and out, so that callers can modify retrieved objects
+    without affecting cached data.
+    """
+
+    DEFAULT_SIZE = 1000
+
+    def __init__(self, ttl, size=DEFAULT_SIZE):
+        """
+        :param ttl: Entry time-to-live, in seconds.
+        :type ttl: float
+
+        :param size: Maximum number of cached objects.
+        :type size: int
+
+        :raises InvalidArgument: in case ttl or size are not positive numbers.
+        """
+        self.logger = LogManager.get_instance().get_logger(self.__class__.__name__)
+        if not ttl or ttl <= 0:
+            raise InvalidArgument('Cache time-to-live must be a positive number.')
+        if not size or size < 1:
+            raise InvalidArgument('Cache size must be a positive number.')
+        self.ttl = ttl
+        self.size = size
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, object_class, name):
+        """
+        :returns: Copy of the cached object, or None if object is not cached, or its entry expired.
+        """
+        key = (object_class, name)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] < time.time():
+                del self.entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            # Re-insert entry to mark it as most recently used
+            self.entries[key] = self.entries.pop(key)
+            self.hits += 1
+            cached_object = entry[1]
+        return copy.deepcopy(cached_object)
+
+    def put(self, object_class, name, pycl_object):
+        key = (object_class, name)
+        cached_object = copy.deepcopy(pycl_object)
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = (time.time() + self.ttl, cached_object)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, object_class, name):
+        with self.lock:
+            if self.entries.pop((object_class, name), None) is not None:
+                self.invalidations += 1
+
+    def invalidate_class(self, object_class):
+        with self.lock:
+            for key in [key for key in self.entries if key[0] == object_class]:
+                del self.entries[key]
+                self.invalidations += 1
+
+    def clear(self):
+        with self.lock:
+            self.invalidations += len(self.entries)
+            self.entries.clear()
+
+    def get_stats(self):
+        """
+        :returns: Dictionary with cache statistics; each hit corresponds to one qconf invocation saved.
+        """
+        with self.lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions,
+                    'invalidations': self.invalidations,
+                    'size': len(self.entries),
+                    'max_size': self.size,
+                    'ttl': self.ttl}
+
+
+#############################################################################
+# Testing.
+if __name__ == '__main__':
+    cache = QconfObjectCache(10, size=2)
+    cache.put('q', 'all.q', {'qname': 'all.q'})
+    print(cache.get('q', 'all.q'))
+    print(cache.get('q', 'x.q'))
+    print(cache.get_stats())
@@ -0,0 +1,427 @@
+#!/usr/bin/env python
+#
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+#
+import copy
+
+from uge.log.log_manager import LogManager
+from uge.exceptions.invalid_argument import InvalidArgument
+from uge.exceptions.object_not_found import ObjectNotFound
+from uge.objects.qconf_object import QconfObject
+from uge.objects.qconf_object_factory import QconfObjectFactory
+from .parallel_executor import ParallelExecutor
+
+
+class ReconcileAction(object):
+    """ Single change planned by reconciler: creation, update or deletion of an object. """
+
+    CREATE = 'create'
+    UPDATE = 'update'
+    DELETE = 'delete'
+
+    def __init__(self, action, class_name, name, pycl_object=None, changed_keys=None):
+        """
+        :param action: Action type (create, update or delete).
+        :type action: str
+
+        :param class_name: Object class name.
+        :type class_name: str
+
+        :param name: Object name; for complex configuration, this is complex attribute name.
+        :type name: str
+
+        :param pycl_object: Object to be added, or updated object (complex attribute data for complex configuration).
+        :type pycl_object: QconfObject
+
+        :param changed_keys: List of keys that differ from the current state (updates only).
+        :type changed_keys: list
+        """
+        self.action = action
+        self.class_name = class_name
+        self.name = name
+        self.pycl_object = pycl_object
+        self.changed_keys = changed_keys or []
+
+    def __repr__(self):
+        if self.changed_keys:
+            return 'ReconcileAction(%s %s %s: %s)' % (self.action, self.class_name, self.name,
+                                                       ', '.join(self.changed_keys))
+        return 'ReconcileAction(%s %s %s)' % (self.action, self.class_name, self.name)
+
+
+class ReconcilePlan(object):
+    """
+    Ordered list of actions needed to converge cluster configuration to
+    the desired state. Creations and updates are ordered so that referenced
+    objects come first (e.g., host groups before queues), and deletions
+    follow them in reverse order.
+    """
+
+    def __init__(self, action_list=None):
+        self.action_list = action_list or []
+
+    def __iter__(self):
+        return iter(self.action_list)
+
+    def __len__(self):
+        return len(self.action_list)
+
+    def __repr__(self):
+        return 'ReconcilePlan(%s)' % self.action_list
+
+    def is_empty(self):
+        return not self.action_list
+
+    def get_actions(self, class_name=None, action=None):
+        """
+        :returns: List of planned actions, optionally restricted to a given object class and/or action type.
+        """
+        return [a for a in self.action_list if (class_name is None or a.class_name == class_name) and (
+            action is None or a.action == action)]
+
+    def get_summary(self):
+        """
+        :returns: Dictionary containing number of creations, updates and deletions for each object class.
+        """
+        summary = {}
+        for a in self.action_list:
+            class_summary = summary.setdefault(a.class_name, {
+                ReconcileAction.CREATE: 0, ReconcileAction.UPDATE: 0, ReconcileAction.DELETE: 0})
+            class_summary[a.action] += 1
+        return summary
+
+
+class QconfReconciler(object):
+    """
+    Converges cluster configuration to the desired state.
+
+    Current state is retrieved with a single qconf call per object class.
+    Changes are applied class by class, using bulk (directory based)
+    qconf commands where available; classes that do not reference each
+    other are applied concurrently.
+
+    Usage:
+        reconciler = QconfReconciler(api)
+        plan = reconciler.plan(desired_object_list, prune=True)
+        reconciler.apply(plan)
+    """
+
+    # Reconciled object classes: class name => manager name
+    MANAGER_NAME_DICT = {
+        'ComplexConfiguration': 'complex_configuration_manager',
+        'AccessList': 'access_list_manager',
+        'HostGroup': 'host_group_manager',
+        'Project': 'project_manager',
+        'ParallelEnvironment': 'parallel_environment_manager',
+        'User': 'user_manager',
+        'ClusterQueue': 'cluster_queue_manager',
+        'ResourceQuotaSet': 'resource_quota_set_manager',
+    }
+
+    # Object classes that objects of a given class may reference
+    CLASS_DEPENDENCY_DICT = {
+        'ComplexConfiguration': [],
+        'AccessList': [],
+        'HostGroup': [],
+        'Project': ['AccessList'],
+        'ParallelEnvironment': ['AccessList'],
+        'User': ['Project'],
+        'ClusterQueue': ['ComplexConfiguration', 'AccessList', 'HostGroup', 'Project', 'ParallelEnvironment'],
+        'ResourceQuotaSet': ['ComplexConfiguration', 'AccessList', 'HostGroup', 'Project', 'ParallelEnvironment',
+                             'User', 'ClusterQueue'],
+    }
+
+    # Classes whose managers add, modify and delete many objects with a single qconf call
+    BULK_WRITE_CLASS_LIST = ['AccessList', 'HostGroup', 'Project', 'ParallelEnvironment', 'User', 'ClusterQueue']
+
+    # Objects that are never deleted when pruning
+    PROTECTED_OBJECT_NAME_DICT = {
+        'AccessList': ['arusers', 'deadlineusers', 'defaultdepartment'],
+        'HostGroup': [],
+    }
+
+    def __init__(self, api, max_workers=ParallelExecutor.DEFAULT_MAX_WORKERS):
+        """
+        :param api: API object used for retrieving and modifying objects.
+        :type api: QconfApi
+
+        :param max_workers: Maximum number of object classes retrieved or modified at the same time.
+        :type max_workers: int
+        """
+        self.logger = LogManager.get_instance().get_logger(self.__class__.__name__)
+        self.api = api
+        self.parallel_executor = ParallelExecutor(max_workers=max_workers)
+
+    @classmethod
+    def get_class_levels(cls, class_names):
+        """
+        :returns: List of class name lists; classes in each list reference only classes from preceding lists.
+        """
+        level_dict = {}
+
+        def get_level(class_name):
+            if class_name not in level_dict:
+                dependency_levels = [get_level(c) for c in cls.CLASS_DEPENDENCY_DICT.get(class_name, [])]
+                level_dict[class_name] = max([-1] + dependency_levels) + 1
+            return level_dict[class_name]
+
+        class_levels = []
+        for class_name in sorted(class_names):
+            level = get_level(class_name)
+            while len(class_levels) <= level:
+                class_levels.append([])
+            class_levels[level].append(class_name)
+        return [level for level in class_levels if level]
+
+    def get_manager(self, class_name):
+        return getattr(self.api, self.MANAGER_NAME_DICT[class_name])
+
+    def get_desired_object(self, pycl_object, uge_version):
+        if isinstance(pycl_object, dict):
+            pycl_object = QconfObjectFactory.generate_object_from_dict(pycl_object)
+        elif not isinstance(pycl_object, QconfObject):
+            pycl_object = QconfObjectFactory.generate_object(pycl_object)
+        class_name = pycl_object.__class__.__name__
+        if class_name not in self.MANAGER_NAME_DICT:
+            raise InvalidArgument('Reconciliation is not supported for class %s.' % class_name)
+        return QconfObjectFactory.migrate_object(pycl_object, uge_version)
+
+    def get_current_objects(self, class_name):
+        """
+        :returns: Dictionary of current objects of a given class, keyed by object name.
+        """
+        manager = self.get_manager(class_name)
+        if class_name == 'ComplexConfiguration':
+            manager.invalidate_cached_object('')
+            return {'': manager.get_object('')}
+        current_object_dict = {}
+        try:
+            for pycl_object in manager.iter_objects():
+                name = manager.get_object_name(pycl_object)
+                if name:
+                    current_object_dict[name] = pycl_object
+        except ObjectNotFound as ex:
+            # There are no objects of this class
+            pass
+        return current_object_dict
+
+    @classmethod
+    def get_comparable_string(cls, value):
+        # Numbers retrieved from qconf may differ in format from requested ones (e.g., 0.000000 vs 0.0)
+        try:
+            return '%s' % float(value)
+        except (TypeError, ValueError):
+            return '%s' % value
+
+    @classmethod
+    def get_comparable_value(cls, pycl_object, key, value):
+        if type(value) == list:
+            return sorted([cls.get_comparable_string(pycl_object.py_to_uge(key, item)) for item in value])
+        return cls.get_comparable_string(pycl_object.py_to_uge(key, value))
+
+    @classmethod
+    def get_changed_keys(cls, current_object, desired_data):
+        changed_keys = []
+        for (key, value) in list(desired_data.items()):
+            if key not in current_object.data or cls.get_comparable_value(current_object, key, value) != \
+                    cls.get_comparable_value(current_object, key, current_object.data[key]):
+                changed_keys.append(key)
+        return sorted(changed_keys)
+
+    def plan_class(self, class_name, desired_object_list, current_object_dict, prune):
+        manager = self.get_manager(class_name)
+        action_list = []
+        if class_name == 'ComplexConfiguration':
+            current_object = current_object_dict['']
+            desired_attributes = {}
+            for pycl_object in desired_object_list:
+                desired_attributes.update(pycl_object.data)
+            for (name, attribute) in sorted(desired_attributes.items()):
+                current_attribute = current_object.data.get(name)
+                if current_attribute is None:
+                    action_list.append(ReconcileAction(ReconcileAction.CREATE, class_name, name, attribute))
+                    continue
+                changed_keys = [key for (key, value) in sorted(attribute.items())
+                                if key != 'default_is_bool' and self.get_comparable_string(value) !=
+                                self.get_comparable_string(current_attribute.get(key))]
+                if changed_keys:
+                    updated_attribute = copy.copy(current_attribute)
+                    updated_attribute.update(attribute)
+                    action_list.append(ReconcileAction(ReconcileAction.UPDATE, class_name, name, updated_attribute,
+                                                       changed_keys))
+            if prune:
+                # Built-in attributes cannot be deleted
+                builtin_attributes = current_object.get_required_data_defaults()
+                for name in sorted(current_object.data.keys()):
+                    if name not in desired_attributes and name not in builtin_attributes:
+                        action_list.append(ReconcileAction(ReconcileAction.DELETE, class_name, name))
+            return action_list
+
+        desired_object_dict = {}
+        for pycl_object in desired_object_list:
+            desired_object_dict[manager.get_object_name(pycl_object)] = pycl_object
+        for (name, pycl_object) in sorted(desired_object_dict.items()):
+            current_object = current_object_dict.get(name)
+            if current_object is None:
+                pycl_object.update_with_required_data_defaults()
+                pycl_object.remove_optional_keys()
+                action_list.append(ReconcileAction(ReconcileAction.CREATE, class_name, name, pycl_object))
+                continue
+            changed_keys = self.get_changed_keys(current_object, pycl_object.data)
+            if changed_keys:
+                updated_object = copy.copy(current_object)
+                updated_object.data = copy.copy(current_object.data)
+                updated_object.data.update(pycl_object.data)
+                updated_object.remove_optional_keys()
+                action_list.append(ReconcileAction(ReconcileAction.UPDATE, class_name, name, updated_object,
+                                                   changed_keys))
+        if prune:
+            protected_names = self.PROTECTED_OBJECT_NAME_DICT.get(class_name, [])
+            for name in sorted(current_object_dict.keys()):
+                if name not in desired_object_dict and name not in protected_names:
+                    action_list.append(ReconcileAction(ReconcileAction.DELETE, class_name, name))
+        return action_list
+
+    def plan(self, desired_objects, prune=False, classes=None):
+        """
+        Compute changes needed to converge cluster configuration to the desired state.
+
+        :param desired_objects: Desired objects; each item may be an object, its JSON string, or dictionary with object's JSON structure. Objects are migrated to the qmaster version if needed.
+        :type desired_objects: iterable
+
+        :param prune: If True, existing objects of the reconciled classes that are not among desired objects are deleted.
+        :type prune: bool
+
+        :param classes: Object classes to reconcile (default: classes of desired objects). Classes listed here with no desired objects are emptied if prune is True.
+        :type classes: list
+
+        :returns: ReconcilePlan object.
+        """
+        uge_version = self.api.get_uge_version()
+        desired_object_dict = {}
+        for class_name in classes or []:
+            if class_name not in self.MANAGER_NAME_DICT:
+                raise InvalidArgument('Reconciliation is not supported for class %s.' % class_name)
+            desired_object_dict[class_name] = []
+        for pycl_object in desired_objects:
+            pycl_object = self.get_desired_object(pycl_object, uge_version)
+            class_name = pycl_object.__class__.__name__
+            if classes is not None and class_name not in classes:
+                continue
+            desired_object_dict.setdefault(class_name, []).append(pycl_object)
+
+        class_names = sorted(desired_object_dict.keys())
+        current_results = self.parallel_executor.execute(self.get_current_objects, class_names)
+        class_action_dict = {}
+        for result in current_results:
+            if not result.is_successful():
+                raise result.exception
+            class_name = result.item
+            class_action_dict[class_name] = self.plan_class(
+                class_name, desired_object_dict[class_name], result.result, prune)
+
+        # Referenced classes are created first, and deleted last
+        action_list = []
+        class_levels = self.get_class_levels(class_names)
+        for level in class_levels:
+            for class_name in level:
+                action_list += [a for a in class_action_dict[class_name] if a.action != ReconcileAction.DELETE]
+        for level in reversed(class_levels):
+            for class_name in level:
+                action_list += [a for a in class_action_dict[class_name] if a.action == ReconcileAction.DELETE]
+        return ReconcilePlan(action_list)
+
+    def apply_complex_actions(self, action_list):
+        manager = self.get_manager('ComplexConfiguration')
+        manager.invalidate_cached_object('')
+        cconf = manager.get_object('')
+        for a in action_list:
+            if a.action == ReconcileAction.DELETE:
+                cconf.data.pop(a.name, None)
+            else:
+                cconf.check_attribute_data(a.name, a.pycl_object)
+                cconf.data[a.name] = a.pycl_object
+        manager.replace_object(cconf)
+
+    def apply_class_actions(self, class_name, action_list):
+        if not action_list:
+            return
+        self.logger.debug('Applying %s %s actions' % (len(action_list), class_name))
+        if class_name == 'ComplexConfiguration':
+            return self.apply_complex_actions(action_list)
+        manager = self.get_manager(class_name)
+        create_list = [a.pycl_object for a in action_list if a.action == ReconcileAction.CREATE]
+        update_list = [a.pycl_object for a in action_list if a.action == ReconcileAction.UPDATE]
+        delete_list = [a.name for a in action_list if a.action == ReconcileAction.DELETE]
+        if class_name in self.BULK_WRITE_CLASS_LIST:
+            if create_list:
+                manager.add_objects(create_list)
+            if update_list:
+                manager.modify_objects(update_list)
+            if delete_list:
+                manager.delete_objects(delete_list)
+            return
+        for pycl_object in create_list:
+            manager.add_object(pycl_object=pycl_object)
+        for pycl_object in update_list:
+            manager.modify_object(pycl_object=pycl_object)
+        for name in delete_list:
+            manager.delete_object(name)
+
+    def apply_level(self, level, action_list):
+        class_action_dict = {}
+        for a in action_list:
+            class_action_dict.setdefault(a.class_name, []).append(a)
+        class_names = [c for c in level if c in class_action_dict]
+        results = self.parallel_executor.execute(
+            lambda class_name: self.apply_class_actions(class_name, class_action_dict[class_name]), class_names)
+        for result in results:
+            if not result.is_successful():
+                raise result.exception
+
+    def apply(self, plan):
+        """
+        Apply planned changes. Creations and updates are applied first, level
+        by level, so that referenced objects exist before objects that refer
+        to them; deletions are applied last, in reverse order. Object classes
+        within the same level are applied concurrently. If changes for any
+        class fail, remaining levels are not applied.
+
+        :param plan: Plan computed by plan().
+        :type plan: ReconcilePlan
+        """
+        class_levels = self.get_class_levels(set([a.class_name for a in plan]))
+        changes = [a for a in plan if a.action != ReconcileAction.DELETE]
+        deletions = [a for a in plan if a.action == ReconcileAction.DELETE]
+        for level in class_levels:
+            self.apply_level(level, changes)
+        for level in reversed(class_levels):
+            self.apply_level(level, deletions)
+        return plan
+
+
+#############################################################################
+# Testing.
+if __name__ == '__main__':
+    from uge.api.qconf_api import QconfApi
+    reconciler = QconfReconciler(QconfApi())
+    hgrp = QconfObjectFactory.generate_host_group(reconciler.api.get_uge_version(), name='@test',
+                                                  data={'hostlist': ['NONE']})
+    print(reconciler.plan([hgrp]))
@@ -0,0 +1,328 @@
+#!/usr/bin/env python
+#
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+#
+import hashlib
+import re
+import threading
+import time
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from uge.log.log_manager import LogManager
+from uge.exceptions.invalid_argument import InvalidArgument
+from uge.exceptions.object_not_found import ObjectNotFound
+from .parallel_executor import ParallelExecutor
+
+
+class WatchEvent(object):
+    """ Change of a single object detected by watcher. """
+
+    ADDED = 'added'
+    MODIFIED = 'modified'
+    DELETED = 'deleted'
+
+    def __init__(self, event_type, class_name, name, pycl_object=None):
+        """
+        :param event_type: Event type (added, modified or deleted).
+        :type event_type: str
+
+        :param class_name: Object class name.
+        :type class_name: str
+
+        :param name: Object name.
+        :type name: str
+
+        :param pycl_object: Current object (for deleted objects, last seen object).
+        :type pycl_object: QconfObject
+        """
+        self.event_type = event_type
+        self.class_name = class_name
+        self.name = name
+        self.pycl_object = pycl_object
+
+    def __repr__(self):
+        return 'WatchEvent(%s %s %s)' % (self.event_type, self.class_name, self.name)
+
+
+class WatchSubscription(object):
+    """ Iterator over events delivered to a single watcher subscriber. """
+
+    def __init__(self, watcher):
+        self.watcher = watcher
+        self.event_queue = queue.Queue()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        event = self.event_queue.get()
+        if event is None:
+            raise StopIteration()
+        return event
+
+    next = __next__
+
+    def get(self, timeout=None):
+        """
+        :returns: Next event, or None if no event arrived within timeout, or watcher was stopped.
+        """
+        try:
+            return self.event_queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def put(self, event):
+        self.event_queue.put(event)
+
+    def close(self):
+        self.watcher.unsubscribe(self)
+        self.event_queue.put(None)
+
+
+class QconfWatcher(object):
+    """
+    Poll-based change feed for objects that can be listed with a single
+    bulk qconf call (e.g., qconf -sqld).
+
+    Bulk output of each watched class is split into per-object blocks, and
+    each block is hashed; only blocks whose text changed since the previous
+    poll are parsed. Lines with values reported by execution daemons (e.g.,
+    load_values) are not hashed, so that they do not generate events. Watched
+    classes are polled concurrently.
+
+    Events are consumed either directly, with watch(), or through
+    subscriptions, which let many consumers share a single polling thread.
+
+    Usage:
+        watcher = QconfWatcher(api, classes=['ClusterQueue', 'HostGroup'], interval=10)
+        for event in watcher.watch():
+            print(event.event_type, event.name)
+    """
+
+    DEFAULT_INTERVAL = 30
+
+    def __init__(self, api, classes=None, interval=DEFAULT_INTERVAL, initial_events=False,
+                 max_workers=ParallelExecutor.DEFAULT_MAX_WORKERS):
+        """
+        :param api: API object used for retrieving objects.
+        :type api: QconfApi
+
+        :param classes: Watched object classes; see QconfApi.iter_objects() for supported classes (default: all).
+        :type classes: list
+
+        :param interval: Polling interval in seconds.
+        :type interval: float
+
+        :param initial_events: If True, the first poll generates 'added' events for all existing objects; otherwise, it only records their state.
+        :type initial_events: bool
+
+        :param max_workers: Maximum number of classes polled at the same time.
+        :type max_workers: int
+
+        :raises InvalidArgument: in case an unsupported class name is specified.
+        """
+        self.logger = LogManager.get_instance().get_logger(self.__class__.__name__)
+        self.api = api
+        self.classes = classes or sorted(api.BULK_MANAGER_NAME_DICT.keys())
+        for class_name in self.classes:
+            if class_name not in api.BULK_MANAGER_NAME_DICT:
+                raise InvalidArgument('Watching is not supported for class %s.' % class_name)
+        self.interval = interval
+        self.initial_events = initial_events
+        self.parallel_executor = ParallelExecutor(max_workers=max_workers)
+        # Class name => {object name: (block hash, object)}
+        self.state_dict = {}
+        self.subscription_list = []
+        self.__lock = threading.Lock()
+        self.__stop_event = threading.Event()
+        self.__thread = None
+
+    def get_manager(self, class_name):
+        return self.api.get_bulk_manager(class_name)
+
+    @classmethod
+    def iter_blocks(cls, manager, lines):
+        """ Split bulk qconf output into lists of lines describing individual objects. """
+        block = []
+        for line in lines:
+            line = line.rstrip('\n')
+            if not line:
+                continue
+            if manager.BULK_SEPARATOR and re.match(manager.BULK_SEPARATOR, line):
+                if block:
+                    yield block
+                block = []
+                continue
+            block.append(line)
+        if block:
+            yield block
+
+    @classmethod
+    def get_block_hash(cls, manager, block):
+        digest = hashlib.sha1()
+        for line in block:
+            if manager.READ_ONLY_KEY_LIST and line.split(manager.KEY_VALUE_DELIMITER)[0] in \
+                    manager.READ_ONLY_KEY_LIST:
+                continue
+            digest.update(line.encode('utf-8'))
+            digest.update(b'\n')
+        return digest.hexdigest()
+
+    def process_output(self, class_name, lines):
+        """
+        Compare bulk qconf output with the state recorded by the previous poll, and record the new state.
+
+        :param class_name: Object class name.
+        :type class_name: str
+
+        :param lines: Lines of bulk qconf output.
+        :type lines: iterable
+
+        :returns: List of events.
+        """
+        manager = self.get_manager(class_name)
+        previous_state = self.state_dict.get(class_name)
+        hash_dict = {}
+        if previous_state:
+            hash_dict = dict([(block_hash, (name, pycl_object))
+                              for (name, (block_hash, pycl_object)) in list(previous_state.items())])
+        state = {}
+        for block in self.iter_blocks(manager, lines):
+            block_hash = self.get_block_hash(manager, block)
+            if block_hash in hash_dict:
+                (name, pycl_object) = hash_dict[block_hash]
+            else:
+                pycl_object = next(manager.iter_bulk_output(block))
+                name = manager.get_object_name(pycl_object)
+                pycl_object.name = name
+            state[name] = (block_hash, pycl_object)
+        self.state_dict[class_name] = state
+
+        if previous_state is None and not self.initial_events:
+            return []
+        previous_state = previous_state or {}
+        event_list = []
+        for (name, (block_hash, pycl_object)) in sorted(state.items()):
+            if name not in previous_state:
+                event_list.append(WatchEvent(WatchEvent.ADDED, class_name, name, pycl_object))
+            elif previous_state[name][0] != block_hash:
+                event_list.append(WatchEvent(WatchEvent.MODIFIED, class_name, name, pycl_object))
+        for (name, (_, pycl_object)) in sorted(previous_state.items()):
+            if name not in state:
+                event_list.append(WatchEvent(WatchEvent.DELETED, class_name, name, pycl_object))
+        return event_list
+
+    @classmethod
+    def iter_output_lines(cls, manager):
+        try:
+            for line in manager.qconf_executor.iter_qconf_output(
+                    manager.get_objects_args(), manager.QCONF_ERROR_REGEX_LIST,
+                    failure_regex_list=manager.QCONF_FAILURE_REGEX_LIST):
+                yield line
+        except ObjectNotFound as ex:
+            # There are no objects of this class
+            return
+
+    def poll_class(self, class_name):
+        return self.process_output(class_name, self.iter_output_lines(self.get_manager(class_name)))
+
+    def poll(self):
+        """
+        Poll all watched classes once.
+
+        :returns: List of events, ordered by class and object name.
+        """
+        event_list = []
+        for result in self.parallel_executor.execute(self.poll_class, self.classes):
+            if not result.is_successful():
+                raise result.exception
+            event_list += result.result
+        return event_list
+
+    def watch(self):
+        """
+        Poll watched classes every interval seconds, and yield events as they are detected.
+
+        :returns: Event generator; it stops when stop() is called.
+        """
+        while not self.__stop_event.is_set():
+            start_time = time.time()
+            for event in self.poll():
+                yield event
+            self.__stop_event.wait(max(0, self.interval - (time.time() - start_time)))
+
+    def subscribe(self):
+        """
+        Create event subscription; polling thread is started with the first subscription.
+
+        :returns: WatchSubscription object, which can be iterated over to receive events.
+        """
+        subscription = WatchSubscription(self)
+        with self.__lock:
+            self.subscription_list.append(subscription)
+            if self.__thread is None:
+                self.__stop_event.clear()
+                self.__thread = threading.Thread(target=self.__run, name='QconfWatcher')
+                self.__thread.daemon = True
+                self.__thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.__lock:
+            if subscription in self.subscription_list:
+                self.subscription_list.remove(subscription)
+
+    def __run(self):
+        try:
+            for event in self.watch():
+                with self.__lock:
+                    subscription_list = list(self.subscription_list)
+                for subscription in subscription_list:
+                    subscription.put(event)
+        except Exception as ex:
+            self.logger.error('Watcher failed: %s' % ex)
+        finally:
+            with self.__lock:
+                subscription_list = list(self.subscription_list)
+                self.__thread = None
+            # Wake up subscribers, so that they can stop
+            for subscription in subscription_list:
+                subscription.put(None)
+
+    def stop(self):
+        """ Stop polling; pending watch() generators and subscriptions terminate after the current poll. """
+        self.__stop_event.set()
+        with self.__lock:
+            thread = self.__thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+
+#############################################################################
+# Testing.
+if __name__ == '__main__':
+    from uge.api.qconf_api import QconfApi
+    watcher = QconfWatcher(QconfApi(), classes=['ClusterQueue', 'HostGroup'], interval=5)
+    for event in watcher.watch():
+        print(event)
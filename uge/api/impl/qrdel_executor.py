@@ -23,6 +23,8 @@ import re
 import os
 import tempfile
 from uge.utility.uge_subprocess import UgeSubprocess
+from uge.utility.uge_environment import UgeEnvironment
+from uge.utility.uge_version_cache import UgeVersionCache
 from uge.log.log_manager import LogManager
 from uge.exceptions.ar_exception import AdvanceReservationException
 from uge.exceptions.command_failed import CommandFailed
@@ -54,6 +56,7 @@ class QrdelExecutor(object):
             'SGE_SINGLE_LINE': '1',
         }
         self.uge_version = None
+        self.command_env_dict = UgeEnvironment.get_command_env(self.env_dict)
         self.__configure()
 
     def __configure(self):
@@ -63,21 +66,27 @@ class QrdelExecutor(object):
 
     def get_uge_version(self):
         if not self.uge_version:
-            p = self.execute_qrdel('-help')
-            lines = p.get_stdout().split('\n')
-            if not len(lines):
-                raise AdvanceReservationException('Cannot determine UGE version from output: %s' % p.get_stdout())
-            self.uge_version = lines[0].split()[-1].split("_")[0].replace('(','').replace(')','')
-            # if 2022.0.1 is used instead
-            # self.uge_version = lines[0].split()[1]
+            # Version is probed only if it is not already cached for this qrdel binary
+            self.uge_version = UgeVersionCache.get_uge_version(
+                self.env_dict['SGE_ROOT'], self.env_dict['SGE_CELL'], 'qrdel', self.__probe_uge_version)
         return self.uge_version
 
+    def __probe_uge_version(self):
+        p = self.execute_qrdel('-help')
+        lines = p.get_stdout().split('\n')
+        if not len(lines):
+            raise AdvanceReservationException('Cannot determine UGE version from output: %s' % p.get_stdout())
+        uge_version = lines[0].split()[-1].split("_")[0].replace('(','').replace(')','')
+        # if 2022.0.1 is used instead
+        # uge_version = lines[0].split()[1]
+        return uge_version
+
     def execute_qrdel(self, cmd, error_regex_list=[], error_details=None, combine_error_lines=False,
                       success_regex_list=[], failure_regex_list=[]):
         try:
-            command = '. %s/%s/common/settings.sh; qrdel %s' % (
-            self.env_dict['SGE_ROOT'], self.env_dict['SGE_CELL'], cmd)
-            p = UgeSubprocess(command, env=self.env_dict)
+            argv = UgeEnvironment.get_command_argv(
+                self.env_dict['SGE_ROOT'], self.env_dict['SGE_CELL'], 'qrdel', cmd)
+            p = UgeSubprocess(argv, env=self.command_env_dict, shell=False)
             p.run()
 
             # In some cases successful outcome is actually a failure
@@ -102,8 +111,25 @@ class QrdelExecutor(object):
                     raise qrdelExClass(error, error_details=error_details)
             raise
 
+    def check_qrdel_error(self, error, exit_status, error_regex_list=[], error_details=None, failure_regex_list=[]):
+        """
+        Classify outcome of a qrdel command executed outside of execute_qrdel().
+
+        :raises AdvanceReservationException: (or one of its subclasses) in case qrdel failed.
+        """
+        if exit_status != 0:
+            for (pattern, qrdelExClass) in error_regex_list + QrdelExecutor.QRDEL_ERROR_REGEX_LIST:
+                if pattern.match(error):
+                    raise qrdelExClass(error, error_details=error_details)
+            raise CommandFailed(error, command_stderr=error, command_exit_status=exit_status)
+        # In some cases successful outcome is actually a failure
+        if error:
+            for (pattern, qrdelExClass) in failure_regex_list + QrdelExecutor.QRDEL_FAILURE_REGEX_LIST:
+                if pattern.match(error):
+                    raise qrdelExClass(error, error_details=error_details)
+
     def delete_ar(self, name):
-        p = self.execute_qrdel(name)
+        p = self.execute_qrdel([name])
         lines = p.get_stdout()
         return lines
 
@@ -20,10 +20,11 @@
 # ___INFO__MARK_END__
 #
 import re
-import xmltodict
 import json
 
 from uge.utility.uge_subprocess import UgeSubprocess
+from uge.utility.uge_environment import UgeEnvironment
+from uge.utility.uge_version_cache import UgeVersionCache
 from uge.log.log_manager import LogManager
 from uge.exceptions.ar_exception import AdvanceReservationException
 from uge.exceptions.command_failed import CommandFailed
@@ -44,6 +45,9 @@ class QrstatExecutor(object):
     QRSTAT_SUCCESS_REGEX_LIST = []  # for successful outcome incorrectly classified as failure
     QRSTAT_FAILURE_REGEX_LIST = []  # for failure incorrectly classified as successful outcome
 
+    AR_SUMMARY_ARGS = ['-json']
+    AR_LIST_ARGS = ['-json', '-u', '*']
+
     def __init__(self, sge_root, sge_cell, sge_qmaster_port, sge_execd_port):
         self.logger = LogManager.get_instance().get_logger(self.__class__.__name__)
         self.env_dict = {
@@ -54,6 +58,7 @@ class QrstatExecutor(object):
             'SGE_SINGLE_LINE': '1',
         }
         self.uge_version = None
+        self.command_env_dict = UgeEnvironment.get_command_env(self.env_dict)
         self.__configure()
 
     def __configure(self):
@@ -63,21 +68,27 @@ class QrstatExecutor(object):
 
     def get_uge_version(self):
         if not self.uge_version:
-            p = self.execute_qrstat('-help')
-            lines = p.get_stdout().split('\n')
-            if not len(lines):
-                raise AdvanceReservationException('Cannot determine UGE version from output: %s' % p.get_stdout())
-            self.uge_version = lines[0].split()[-1].split("_")[0].replace('(','').replace(')','')
-            # if 2022.0.1 is used instead
-            # self.uge_version = lines[0].split()[1]
+            # Version is probed only if it is not already cached for this qrstat binary
+            self.uge_version = UgeVersionCache.get_uge_version(
+                self.env_dict['SGE_ROOT'], self.env_dict['SGE_CELL'], 'qrstat', self.__probe_uge_version)
         return self.uge_version
 
+    def __probe_uge_version(self):
+        p = self.execute_qrstat('-help')
+        lines = p.get_stdout().split('\n')
+        if not len(lines):
+            raise AdvanceReservationException('Cannot determine UGE version from output: %s' % p.get_stdout())
+        uge_version = lines[0].split()[-1].split("_")[0].replace('(','').replace(')','')
+        # if 2022.0.1 is used instead
+        # uge_version = lines[0].split()[1]
+        return uge_version
+
     def execute_qrstat(self, cmd, error_regex_list=[], error_details=None, combine_error_lines=False,
                        success_regex_list=[], failure_regex_list=[]):
         try:
-            command = '. %s/%s/common/settings.sh; qrstat %s' % (
-            self.env_dict['SGE_ROOT'], self.env_dict['SGE_CELL'], cmd)
-            p = UgeSubprocess(command, env=self.env_dict)
+            argv = UgeEnvironment.get_command_argv(
+                self.env_dict['SGE_ROOT'], self.env_dict['SGE_CELL'], 'qrstat', cmd)
+            p = UgeSubprocess(argv, env=self.command_env_dict, shell=False)
             p.run()
 
             # In some cases successful outcome is actually a failure
@@ -102,22 +113,44 @@ class QrstatExecutor(object):
                     raise qrstatExClass(error, error_details=error_details)
             raise
 
+    def check_qrstat_error(self, error, exit_status, error_regex_list=[], error_details=None, failure_regex_list=[]):
+        """
+        Classify outcome of a qrstat command executed outside of execute_qrstat().
+
+        :raises AdvanceReservationException: (or one of its subclasses) in case qrstat failed.
+        """
+        if exit_status != 0:
+            for (pattern, qrstatExClass) in error_regex_list + QrstatExecutor.QRSTAT_ERROR_REGEX_LIST:
+                if pattern.match(error):
+                    raise qrstatExClass(error, error_details=error_details)
+            raise CommandFailed(error, command_stderr=error, command_exit_status=exit_status)
+        # In some cases successful outcome is actually a failure
+        if error:
+            for (pattern, qrstatExClass) in failure_regex_list + QrstatExecutor.QRSTAT_FAILURE_REGEX_LIST:
+                if pattern.match(error):
+                    raise qrstatExClass(error, error_details=error_details)
+
+    def get_ar_args(self, name):
+        return ['-json', '-ar', name]
+
     def get_ar(self, name):
-        p = self.execute_qrstat('-json -ar ' + name)
+        p = self.execute_qrstat(self.get_ar_args(name))
         lines = p.get_stdout()
         aro = json.loads(lines)
         return aro
 
     def get_ar_summary(self):
-        p = self.execute_qrstat('-json')
+        p = self.execute_qrstat(self.AR_SUMMARY_ARGS)
         lines = p.get_stdout()
         aro = json.loads(lines)
         return aro
 
     def get_ar_list(self):
-        p = self.execute_qrstat('-json -u "*"')
-        lines = p.get_stdout()
-        aro = json.loads(lines)
+        p = self.execute_qrstat(self.AR_LIST_ARGS)
+        return self.create_ar_list_from_qrstat_output(p.get_stdout())
+
+    def create_ar_list_from_qrstat_output(self, qrstat_output):
+        aro = json.loads(qrstat_output)
         arl = []
         if 'ar_summary' in aro['qrstat']:
             for item in aro['qrstat']['ar_summary']:
@@ -128,6 +161,7 @@ class QrstatExecutor(object):
 #############################################################################
 # Testing.
 if __name__ == '__main__':
+    import xmltodict
     from uge.exceptions.command_failed import CommandFailed
 
     executor = QrstatExecutor(sge_root='/Users/aalefeld/univa/clusters/UGE86', sge_cell='default',
@@ -23,6 +23,8 @@ import re
 import os
 import tempfile
 from uge.utility.uge_subprocess import UgeSubprocess
+from uge.utility.uge_environment import UgeEnvironment
+from uge.utility.uge_version_cache import UgeVersionCache
 from uge.log.log_manager import LogManager
 from uge.exceptions.ar_exception import AdvanceReservationException
 from uge.exceptions.command_failed import CommandFailed
@@ -54,6 +56,7 @@ class QrsubExecutor(object):
             'SGE_SINGLE_LINE': '1',
         }
         self.uge_version = None
+        self.command_env_dict = UgeEnvironment.get_command_env(self.env_dict)
         self.__configure()
 
     def __configure(self):
@@ -63,21 +66,27 @@ class QrsubExecutor(object):
 
     def get_uge_version(self):
         if not self.uge_version:
-            p = self.execute_qrsub('-help')
-            lines = p.get_stdout().split('\n')
-            if not len(lines):
-                raise AdvanceReservationException('Cannot determine UGE version from output: %s' % p.get_stdout())
-            self.uge_version = lines[0].split()[-1].split("_")[0].replace('(','').replace(')','')
-            # if 2022.0.1 is used instead
-            # self.uge_version = lines[0].split()[1]
+            # Version is probed only if it is not already cached for this qrsub binary
+            self.uge_version = UgeVersionCache.get_uge_version(
+                self.env_dict['SGE_ROOT'], self.env_dict['SGE_CELL'], 'qrsub', self.__probe_uge_version)
         return self.uge_version
 
+    def __probe_uge_version(self):
+        p = self.execute_qrsub('-help')
+        lines = p.get_stdout().split('\n')
+        if not len(lines):
+            raise AdvanceReservationException('Cannot determine UGE version from output: %s' % p.get_stdout())
+        uge_version = lines[0].split()[-1].split("_")[0].replace('(','').replace(')','')
+        # if 2022.0.1 is used instead
+        # uge_version = lines[0].split()[1]
+        return uge_version
+
     def execute_qrsub(self, cmd, error_regex_list=[], error_details=None, combine_error_lines=False,
                       success_regex_list=[], failure_regex_list=[]):
         try:
-            command = '. %s/%s/common/settings.sh; qrsub %s' % (
-            self.env_dict['SGE_ROOT'], self.env_dict['SGE_CELL'], cmd)
-            p = UgeSubprocess(command, env=self.env_dict)
+            argv = UgeEnvironment.get_command_argv(
+                self.env_dict['SGE_ROOT'], self.env_dict['SGE_CELL'], 'qrsub', cmd)
+            p = UgeSubprocess(argv, env=self.command_env_dict, shell=False)
             p.run()
 
             # In some cases successful outcome is actually a failure
@@ -102,12 +111,33 @@ class QrsubExecutor(object):
                     raise qrsubExClass(error, error_details=error_details)
             raise
 
+    def check_qrsub_error(self, error, exit_status, error_regex_list=[], error_details=None, failure_regex_list=[]):
+        """
+        Classify outcome of a qrsub command executed outside of execute_qrsub().
+
+        :raises AdvanceReservationException: (or one of its subclasses) in case qrsub failed.
+        """
+        if exit_status != 0:
+            for (pattern, qrsubExClass) in error_regex_list + QrsubExecutor.QRSUB_ERROR_REGEX_LIST:
+                if pattern.match(error):
+                    raise qrsubExClass(error, error_details=error_details)
+            raise CommandFailed(error, command_stderr=error, command_exit_status=exit_status)
+        # In some cases successful outcome is actually a failure
+        if error:
+            for (pattern, qrsubExClass) in failure_regex_list + QrsubExecutor.QRSUB_FAILURE_REGEX_LIST:
+                if pattern.match(error):
+                    raise qrsubExClass(error, error_details=error_details)
+
     def request_ar(self, args):
         p = self.execute_qrsub(args);
         lines = p.get_stdout()
         print(lines)
-        result = re.findall(r'\d+', lines)
-        print(result[0])
+        ar_id = self.get_ar_id_from_qrsub_output(lines)
+        print(ar_id)
+        return ar_id
+
+    def get_ar_id_from_qrsub_output(self, qrsub_output):
+        result = re.findall(r'\d+', qrsub_output)
         return result[0]
 
 
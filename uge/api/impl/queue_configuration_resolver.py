@@ -0,0 +1,319 @@
+#!/usr/bin/env python
+#
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+#
+from uge.exceptions.invalid_argument import InvalidArgument
+from uge.exceptions.object_not_found import ObjectNotFound
+from .host_group_index import HostGroupIndex
+
+
+class QueueAttributeValue(object):
+    """
+    Queue attribute value with per-host and per-host group overrides.
+
+    Queue attributes use the syntax 'default,[target=value],...', where the
+    target is either a host name or a host group name (e.g.,
+    'slots 1,[@gpu=8],[node7=16]'). Override values may themselves contain
+    commas and '=' characters (e.g., 'complex_values mem=4G,[@gpu=gpu=2,mem=8G]').
+    """
+
+    def __init__(self, default=None, override_list=None):
+        """
+        :param default: Default value, in UGE format.
+        :type default: str
+
+        :param override_list: List of (host or host group name, value) tuples, in configuration order.
+        :type override_list: list
+        """
+        self.default = default
+        self.override_list = override_list or []
+        self.host_override_dict = {}
+        self.group_override_list = []
+        for (target, value) in self.override_list:
+            if HostGroupIndex.is_group(target):
+                self.group_override_list.append((target, value))
+            else:
+                self.host_override_dict[target] = value
+
+    def __repr__(self):
+        return 'QueueAttributeValue(%s)' % self.to_uge()
+
+    def __eq__(self, other):
+        return isinstance(other, QueueAttributeValue) and \
+            (self.default, self.override_list) == (other.default, other.override_list)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def has_overrides(self):
+        return len(self.override_list) > 0
+
+    @classmethod
+    def split(cls, value):
+        """ Split value on commas that are not enclosed in brackets. """
+        token_list = []
+        depth = 0
+        start = 0
+        for (i, c) in enumerate(value):
+            if c == '[':
+                depth += 1
+            elif c == ']':
+                depth -= 1
+            elif c == ',' and depth == 0:
+                token_list.append(value[start:i])
+                start = i + 1
+        if depth != 0:
+            raise InvalidArgument('Unbalanced brackets in queue attribute value: %s' % value)
+        token_list.append(value[start:])
+        return token_list
+
+    @classmethod
+    def parse(cls, value):
+        """
+        :param value: Attribute value, either in UGE format, or as parsed by ClusterQueue (e.g., list split on commas).
+        :type value: str, list or any other python value
+
+        :returns: QueueAttributeValue object; default and override values are UGE-formatted strings.
+
+        :raises InvalidArgument: in case value cannot be parsed.
+        """
+        if isinstance(value, QueueAttributeValue):
+            return value
+        if type(value) == list:
+            # List keys were split on every comma; restore original value
+            value = ','.join(['%s' % item for item in value])
+        elif value is None:
+            value = 'NONE'
+        elif type(value) == bool:
+            value = value and 'TRUE' or 'FALSE'
+        elif type(value) == float and value == float('inf'):
+            value = 'INFINITY'
+        else:
+            value = '%s' % value
+        default_token_list = []
+        override_list = []
+        for token in cls.split(value.strip()):
+            token = token.strip()
+            if token.startswith('['):
+                if not token.endswith(']') or '=' not in token:
+                    raise InvalidArgument('Invalid queue attribute override: %s' % token)
+                (target, override_value) = token[1:-1].split('=', 1)
+                override_list.append((target.strip(), override_value.strip()))
+            else:
+                default_token_list.append(token)
+        return QueueAttributeValue(','.join(default_token_list), override_list)
+
+    def to_uge(self):
+        """ :returns: Value in UGE format. """
+        return ','.join([self.default] + ['[%s=%s]' % (target, value) for (target, value) in self.override_list])
+
+    def get_matching_values(self, host_name, group_names=()):
+        """
+        :returns: List of override values applicable to a host: host override, if any, or otherwise overrides of all host groups containing host.
+        """
+        value = self.host_override_dict.get(host_name)
+        if value is not None:
+            return [value]
+        return [value for (target, value) in self.group_override_list if target in group_names]
+
+    def get_value(self, host_name, group_names=()):
+        """
+        :param host_name: Host name.
+        :type host_name: str
+
+        :param group_names: Names of all host groups containing host.
+        :type group_names: set
+
+        :returns: Effective value for the host: host override takes precedence over host group overrides, which take precedence over default value. As in UGE, default value is used if host groups containing host provide different overrides (ambiguous configuration).
+        """
+        value_set = set(self.get_matching_values(host_name, group_names))
+        if len(value_set) == 1:
+            return value_set.pop()
+        return self.default
+
+
+class QueueConfigurationResolver(object):
+    """
+    Resolves effective configuration of queue instances, i.e., values of
+    cluster queue attributes for individual hosts, taking per-host and
+    per-host group overrides into account. Queue and host group objects are
+    retrieved once; all lookups are local, and their results are memoized.
+
+    Usage:
+        resolver = api.get_queue_resolver()
+        slots = resolver.get_slots('all.q', 'node7')
+        total_slots_dict = resolver.get_total_slots()
+    """
+
+    def __init__(self, queues=None, host_group_index=None):
+        """
+        :param queues: Iterable of ClusterQueue objects.
+        :type queues: iterable
+
+        :param host_group_index: Host group index used for resolving host group membership.
+        :type host_group_index: HostGroupIndex
+        """
+        self.host_group_index = host_group_index or HostGroupIndex()
+        self.queue_dict = {}
+        for queue in queues or []:
+            self.queue_dict[queue.data.get('qname')] = queue
+        # (queue name, key) => QueueAttributeValue
+        self.attribute_value_dict = {}
+        # (queue name, host name, key) => effective value
+        self.value_dict = {}
+        # Queue name => list of host names
+        self.queue_host_dict = {}
+
+    def __repr__(self):
+        return 'QueueConfigurationResolver(%s queues)' % len(self.queue_dict)
+
+    def clear_cache(self):
+        """ Forget memoized values, e.g. after host group index was updated. """
+        self.attribute_value_dict.clear()
+        self.value_dict.clear()
+        self.queue_host_dict.clear()
+
+    def update_queue(self, queue):
+        """
+        Replace queue object, e.g. after queue was modified.
+
+        :param queue: Cluster queue object.
+        :type queue: ClusterQueue
+        """
+        self.queue_dict[queue.data.get('qname')] = queue
+        self.clear_cache()
+
+    def delete_queue(self, queue_name):
+        """ Remove queue, e.g. after it was deleted. """
+        self.queue_dict.pop(queue_name, None)
+        self.clear_cache()
+
+    def get_queue_names(self):
+        """ :returns: Sorted list of queue names. """
+        return sorted(self.queue_dict.keys())
+
+    def get_queue(self, queue_name):
+        queue = self.queue_dict.get(queue_name)
+        if queue is None:
+            raise ObjectNotFound('Queue %s is not known to resolver.' % queue_name)
+        return queue
+
+    def get_attribute_value(self, queue_name, key):
+        """
+        :returns: QueueAttributeValue object for a given queue attribute.
+
+        :raises ObjectNotFound: in case queue is not known to resolver.
+        :raises InvalidArgument: in case attribute value cannot be parsed.
+        """
+        attribute_key = (queue_name, key)
+        attribute_value = self.attribute_value_dict.get(attribute_key)
+        if attribute_value is None:
+            attribute_value = QueueAttributeValue.parse(self.get_queue(queue_name).data.get(key))
+            self.attribute_value_dict[attribute_key] = attribute_value
+        return attribute_value
+
+    def get_hosts(self, queue_name):
+        """
+        :returns: List of hosts with instances of a given queue, i.e., hosts in queue host list, with host groups expanded.
+
+        :raises ObjectNotFound: in case queue is not known to resolver.
+        """
+        host_list = self.queue_host_dict.get(queue_name)
+        if host_list is None:
+            hostlist = self.get_queue(queue_name).data.get('hostlist')
+            if type(hostlist) != list:
+                hostlist = ('%s' % (hostlist or '')).replace(',', ' ').split()
+            host_set = set()
+            for member in HostGroupIndex.get_member_list(hostlist):
+                if HostGroupIndex.is_group(member):
+                    if member in self.host_group_index:
+                        host_set.update(self.host_group_index.get_hosts(member))
+                else:
+                    host_set.add(member)
+            host_list = sorted(host_set)
+            self.queue_host_dict[queue_name] = host_list
+        return host_list
+
+    def get_value(self, queue_name, host_name, key):
+        """
+        :param queue_name: Queue name.
+        :type queue_name: str
+
+        :param host_name: Host name.
+        :type host_name: str
+
+        :param key: Queue attribute name (e.g., 'slots', 'tmpdir', 'complex_values').
+        :type key: str
+
+        :returns: Effective attribute value for a queue instance, in UGE format.
+
+        :raises ObjectNotFound: in case queue is not known to resolver.
+
+        >>> resolver.get_value('all.q', 'node7', 'tmpdir')
+        '/scratch'
+        """
+        value_key = (queue_name, host_name, key)
+        value = self.value_dict.get(value_key)
+        if value is None:
+            value = self.get_attribute_value(queue_name, key).get_value(
+                host_name, self.host_group_index.get_groups(host_name))
+            self.value_dict[value_key] = value
+        return value
+
+    def is_ambiguous(self, queue_name, host_name, key):
+        """ :returns: True if host groups containing host provide different overrides for a queue attribute. """
+        value_list = self.get_attribute_value(queue_name, key).get_matching_values(
+            host_name, self.host_group_index.get_groups(host_name))
+        return len(set(value_list)) > 1
+
+    def get_slots(self, queue_name, host_name):
+        """
+        :returns: Number of slots of a queue instance.
+
+        :raises ObjectNotFound: in case queue is not known to resolver.
+        :raises InvalidArgument: in case slots value is not an integer.
+        """
+        value = self.get_value(queue_name, host_name, 'slots')
+        try:
+            return int(value)
+        except ValueError:
+            raise InvalidArgument('Invalid slots value for queue instance %s@%s: %s' % (queue_name, host_name, value))
+
+    def get_total_slots(self, queue_names=None):
+        """
+        :param queue_names: List of queue names; if not provided, all queues are included.
+        :type queue_names: list
+
+        :returns: Dictionary of total number of slots of all instances, keyed by queue name.
+
+        :raises ObjectNotFound: in case queue is not known to resolver.
+        """
+        total_slots_dict = {}
+        for queue_name in queue_names or self.get_queue_names():
+            total_slots_dict[queue_name] = sum([self.get_slots(queue_name, host_name)
+                                                for host_name in self.get_hosts(queue_name)])
+        return total_slots_dict
+
+
+#############################################################################
+# Testing.
+if __name__ == '__main__':
+    print(QueueAttributeValue.parse('mem=4G,[@gpu=gpu=2,mem=8G],[node7=mem=16G]'))
+    print(QueueAttributeValue.parse(['1', '[@gpu=8]', '[node7=16]']).get_value('node1', set(['@gpu'])))
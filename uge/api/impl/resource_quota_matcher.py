@@ -0,0 +1,349 @@
+#!/usr/bin/env python
+#
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+#
+from fnmatch import fnmatchcase
+
+from uge.exceptions.invalid_argument import InvalidArgument
+
+
+class ResourceQuotaFilter(object):
+    """
+    Single rule filter (e.g., 'users {*,!bob}' or 'hosts @gpu,node7').
+    Group references (access lists for users, host groups for hosts) are
+    expanded when filter is created.
+    """
+
+    WILDCARD_CHARACTERS = '*?['
+    GROUP_PREFIX = '@'
+
+    def __init__(self, dimension, value, group_resolver=None):
+        """
+        :param dimension: Filter dimension (users, projects, pes, queues or hosts).
+        :type dimension: str
+
+        :param value: Filter value, e.g. '{*,!bob}'.
+        :type value: str
+
+        :param group_resolver: Function that takes dimension and group name (e.g., 'hosts', '@gpu'), and returns set of group members, or None if group cannot be resolved.
+        :type group_resolver: callable
+        """
+        self.dimension = dimension
+        self.value = value
+        value = value.strip()
+        # Braces mean that limit applies to each entry separately
+        self.per_entry = value.startswith('{') and value.endswith('}')
+        if self.per_entry:
+            value = value[1:-1]
+        self.name_set = set()
+        self.pattern_list = []
+        self.excluded_name_set = set()
+        self.excluded_pattern_list = []
+        self.has_positive_entries = False
+        for entry in value.split(','):
+            entry = entry.strip()
+            if not entry:
+                continue
+            excluded = entry.startswith('!')
+            if excluded:
+                entry = entry[1:]
+            else:
+                self.has_positive_entries = True
+            (name_set, pattern_list) = excluded and \
+                (self.excluded_name_set, self.excluded_pattern_list) or (self.name_set, self.pattern_list)
+            if entry.startswith(self.GROUP_PREFIX) and group_resolver:
+                # Unresolved groups do not match anything
+                name_set.update(group_resolver(dimension, entry) or [])
+            elif any([c in entry for c in self.WILDCARD_CHARACTERS]):
+                pattern_list.append(entry)
+            else:
+                name_set.add(entry)
+
+    def __repr__(self):
+        return '%s %s' % (self.dimension, self.value)
+
+    def is_indexable(self):
+        """ :returns: True if filter can only match names from its name set. """
+        return self.has_positive_entries and not self.pattern_list
+
+    def matches(self, name):
+        """
+        :returns: True if name satisfies filter; missing name (e.g., project of a job without project) only satisfies filters that contain nothing but exclusions.
+        """
+        if name is None:
+            return not self.has_positive_entries
+        if name in self.excluded_name_set:
+            return False
+        for pattern in self.excluded_pattern_list:
+            if fnmatchcase(name, pattern):
+                return False
+        if not self.has_positive_entries:
+            return True
+        if name in self.name_set:
+            return True
+        for pattern in self.pattern_list:
+            if fnmatchcase(name, pattern):
+                return True
+        return False
+
+
+class ResourceQuotaRule(object):
+    """ Single compiled resource quota rule ('limit' line). """
+
+    def __init__(self, set_name, index, rule, group_resolver=None):
+        """
+        :param set_name: Resource quota set name.
+        :type set_name: str
+
+        :param index: Rule position within the set (0-based).
+        :type index: int
+
+        :param rule: Rule string, without 'limit' keyword (e.g., 'users {*} queues all.q to slots=10').
+        :type rule: str
+
+        :param group_resolver: Function resolving group references (see ResourceQuotaFilter).
+        :type group_resolver: callable
+
+        :raises InvalidArgument: in case rule cannot be parsed.
+        """
+        self.set_name = set_name
+        self.index = index
+        self.rule = rule
+        # As in UGE, unnamed rules are referred to by their position
+        self.name = '%s' % (index + 1)
+        self.filter_dict = {}
+        self.limit_dict = {}
+        token_list = rule.split()
+        i = 0
+        while i < len(token_list):
+            keyword = token_list[i]
+            if keyword == 'to':
+                self.parse_limits(' '.join(token_list[i + 1:]))
+                break
+            if i + 1 >= len(token_list):
+                raise InvalidArgument('Missing value for %s in resource quota rule: %s' % (keyword, rule))
+            value = token_list[i + 1]
+            if keyword == 'name':
+                self.name = value
+            elif keyword in ResourceQuotaMatcher.DIMENSION_LIST:
+                self.filter_dict[keyword] = ResourceQuotaFilter(keyword, value, group_resolver)
+            else:
+                raise InvalidArgument('Invalid keyword %s in resource quota rule: %s' % (keyword, rule))
+            i += 2
+        if not self.limit_dict:
+            raise InvalidArgument('Resource quota rule does not define limits: %s' % rule)
+
+    def __repr__(self):
+        return 'ResourceQuotaRule(%s/%s: %s)' % (self.set_name, self.name, self.rule)
+
+    def parse_limits(self, limits):
+        for limit in limits.split(','):
+            if '=' not in limit:
+                raise InvalidArgument('Invalid limit %s in resource quota rule: %s' % (limit, self.rule))
+            (resource, value) = limit.split('=', 1)
+            self.limit_dict[resource.strip()] = value.strip()
+
+    def get_limit(self, resource):
+        """ :returns: Limit for a given resource (e.g., '10' or '$num_proc*2'), or None if rule does not limit resource. """
+        return self.limit_dict.get(resource)
+
+    def matches(self, request):
+        """
+        :param request: Dictionary of request attributes, keyed by dimension (users, projects, pes, queues, hosts).
+        :type request: dict
+
+        :returns: True if all rule filters match request.
+        """
+        for (dimension, rule_filter) in list(self.filter_dict.items()):
+            if not rule_filter.matches(request.get(dimension)):
+                return False
+        return True
+
+
+class ResourceQuotaMatcher(object):
+    """
+    Compiled form of resource quota sets, for finding rules that apply to a
+    (user, project, pe, queue, host) request without contacting qmaster.
+
+    As in UGE, each enabled resource quota set is evaluated independently,
+    and the first rule of a set whose filters match the request applies.
+    Rules are indexed by names in their filters: each dimension maps names
+    to bit masks of rules that refer to them, so that only candidate rules
+    are evaluated. Query results are memoized.
+
+    Usage:
+        matcher = api.get_rqs_matcher()
+        rule_list = matcher.match(user='bob', queue='all.q', host='node7')
+        limit_list = matcher.get_limits('slots', user='bob', queue='all.q', host='node7')
+    """
+
+    DIMENSION_LIST = ['users', 'projects', 'pes', 'queues', 'hosts']
+
+    # Number of memoized requests; cache is cleared when limit is reached
+    MAX_CACHE_SIZE = 100000
+
+    def __init__(self, rqs_list=None, hgrp_index=None, acls=None, include_disabled=False):
+        """
+        :param rqs_list: Iterable of ResourceQuotaSet objects, in evaluation order.
+        :type rqs_list: iterable
+
+        :param hgrp_index: Host group index, used for resolving host groups in 'hosts' filters.
+        :type hgrp_index: HostGroupIndex
+
+        :param acls: Iterable of AccessList objects, used for resolving access lists in 'users' filters; unix groups cannot be resolved offline.
+        :type acls: iterable
+
+        :param include_disabled: If True, disabled resource quota sets are also compiled.
+        :type include_disabled: bool
+
+        :raises InvalidArgument: in case a rule cannot be parsed.
+        """
+        self.hgrp_index = hgrp_index
+        self.acl_dict = {}
+        for acl in acls or []:
+            self.acl_dict[acl.data.get('name')] = acl.data.get('entries') or []
+        self.set_name_list = []
+        self.rule_list = []
+        # Rule id => position of its set
+        self.rule_set_index_list = []
+        for rqs in rqs_list or []:
+            if not rqs.data.get('enabled') and not include_disabled:
+                continue
+            set_name = rqs.data.get('name')
+            self.set_name_list.append(set_name)
+            limits = rqs.data.get('limit') or []
+            if type(limits) != list:
+                limits = [limits]
+            for (index, rule) in enumerate(limits):
+                self.rule_list.append(ResourceQuotaRule(set_name, index, rule, self.resolve_group))
+                self.rule_set_index_list.append(len(self.set_name_list) - 1)
+        self.build_index()
+        self.match_cache = {}
+
+    def __repr__(self):
+        return 'ResourceQuotaMatcher(%s sets, %s rules)' % (len(self.set_name_list), len(self.rule_list))
+
+    def resolve_group(self, dimension, group_name):
+        if dimension == 'hosts':
+            if self.hgrp_index is not None and group_name in self.hgrp_index:
+                return self.hgrp_index.get_hosts(group_name)
+        elif dimension == 'users':
+            return set([entry for entry in self.acl_dict.get(group_name[1:], [])
+                        if not entry.startswith(ResourceQuotaFilter.GROUP_PREFIX)])
+        return None
+
+    def build_index(self):
+        # Dimension => name => bit mask of rules whose filter contains name
+        self.name_mask_dict = dict([(dimension, {}) for dimension in self.DIMENSION_LIST])
+        # Dimension => bit mask of rules that have to be evaluated for any name
+        self.generic_mask_dict = dict([(dimension, 0) for dimension in self.DIMENSION_LIST])
+        for (rule_id, rule) in enumerate(self.rule_list):
+            rule_mask = 1 << rule_id
+            for dimension in self.DIMENSION_LIST:
+                rule_filter = rule.filter_dict.get(dimension)
+                if rule_filter is None or not rule_filter.is_indexable():
+                    self.generic_mask_dict[dimension] |= rule_mask
+                    continue
+                name_mask_dict = self.name_mask_dict[dimension]
+                for name in rule_filter.name_set:
+                    name_mask_dict[name] = name_mask_dict.get(name, 0) | rule_mask
+
+    def get_candidate_mask(self, request):
+        candidate_mask = (1 << len(self.rule_list)) - 1
+        for dimension in self.DIMENSION_LIST:
+            candidate_mask &= self.generic_mask_dict[dimension] | \
+                self.name_mask_dict[dimension].get(request.get(dimension), 0)
+            if not candidate_mask:
+                break
+        return candidate_mask
+
+    def match(self, user=None, project=None, pe=None, queue=None, host=None):
+        """
+        :param user: User name.
+        :type user: str
+
+        :param project: Project name (None for jobs without project).
+        :type project: str
+
+        :param pe: Parallel environment name (None for sequential jobs).
+        :type pe: str
+
+        :param queue: Cluster queue name.
+        :type queue: str
+
+        :param host: Host name.
+        :type host: str
+
+        :returns: List of rules that apply to the request, at most one per resource quota set, in set order.
+
+        >>> matcher.match(user='bob', project='p1', queue='all.q', host='node7')
+        [ResourceQuotaRule(max_slots/1: users {*} to slots=10)]
+        """
+        request_key = (user, project, pe, queue, host)
+        rule_list = self.match_cache.get(request_key)
+        if rule_list is not None:
+            return list(rule_list)
+        request = {'users': user, 'projects': project, 'pes': pe, 'queues': queue, 'hosts': host}
+        rule_list = []
+        matched_set_index_set = set()
+        candidate_mask = self.get_candidate_mask(request)
+        while candidate_mask:
+            low_bit = candidate_mask & -candidate_mask
+            candidate_mask ^= low_bit
+            rule_id = low_bit.bit_length() - 1
+            set_index = self.rule_set_index_list[rule_id]
+            if set_index in matched_set_index_set:
+                continue
+            rule = self.rule_list[rule_id]
+            if rule.matches(request):
+                matched_set_index_set.add(set_index)
+                rule_list.append(rule)
+        if len(self.match_cache) >= self.MAX_CACHE_SIZE:
+            self.match_cache.clear()
+        self.match_cache[request_key] = rule_list
+        return list(rule_list)
+
+    def match_all(self, request_list):
+        """
+        :param request_list: List of (user, project, pe, queue, host) tuples.
+        :type request_list: list
+
+        :returns: List of matching rule lists, one for each request.
+        """
+        return [self.match(*request) for request in request_list]
+
+    def get_limits(self, resource, user=None, project=None, pe=None, queue=None, host=None):
+        """
+        :param resource: Resource name (e.g., 'slots').
+        :type resource: str
+
+        :returns: List of (rule, limit) tuples for rules that apply to the request and limit a given resource.
+
+        >>> matcher.get_limits('slots', user='bob', queue='all.q', host='node7')
+        [(ResourceQuotaRule(max_slots/1: users {*} to slots=10), '10')]
+        """
+        return [(rule, rule.limit_dict[resource])
+                for rule in self.match(user, project, pe, queue, host) if resource in rule.limit_dict]
+
+
+#############################################################################
+# Testing.
+if __name__ == '__main__':
+    pass
@@ -24,6 +24,7 @@ from uge.exceptions.invalid_request import InvalidRequest
 from uge.exceptions.object_not_found import ObjectNotFound
 from uge.objects.qconf_object_factory import QconfObjectFactory
 from .dict_based_object_manager import DictBasedObjectManager
+from .resource_quota_matcher import ResourceQuotaMatcher
 
 
 class ResourceQuotaSetManager(DictBasedObjectManager):
@@ -44,6 +45,40 @@ class ResourceQuotaSetManager(DictBasedObjectManager):
     def __init__(self, qconf_executor):
         DictBasedObjectManager.__init__(self, qconf_executor)
 
+    def get_objects_args(self):
+        # Without a name, qconf prints all resource quota sets
+        return ['-s%s' % self.OBJECT_CLASS_UGE_NAME]
+
+    def iter_objects(self):
+        """
+        Retrieve all resource quota sets with a single qconf call, and yield
+        them one at a time; each set is enclosed in braces.
+        """
+        qconf_output = self.qconf_executor.iter_qconf_output(
+            self.get_objects_args(), self.QCONF_ERROR_REGEX_LIST, failure_regex_list=self.QCONF_FAILURE_REGEX_LIST)
+        lines = []
+        for line in qconf_output:
+            line = line.rstrip('\n')
+            lines.append(line)
+            if line.strip() == '}':
+                retrieved_object = self.create_object_from_qconf_output(None, '\n'.join(lines))
+                retrieved_object.name = retrieved_object.data.get(self.OBJECT_NAME_KEY)
+                lines = []
+                yield retrieved_object
+
+    def get_matcher(self, hgrp_index=None, acls=None, include_disabled=False):
+        """
+        Retrieve all resource quota sets with a single qconf call, and
+        compile their rules.
+
+        :returns: ResourceQuotaMatcher object.
+        """
+        try:
+            rqs_list = list(self.iter_objects())
+        except ObjectNotFound:
+            rqs_list = []
+        return ResourceQuotaMatcher(rqs_list, hgrp_index=hgrp_index, acls=acls, include_disabled=include_disabled)
+
 
 #############################################################################
 # Testing.
@@ -25,6 +25,7 @@ from uge.exceptions.invalid_request import InvalidRequest
 from uge.exceptions.invalid_argument import InvalidArgument
 from uge.objects.qconf_object_factory import QconfObjectFactory
 from .dict_list_based_object_manager import DictListBasedObjectManager
+from .share_tree_model import ShareTreeModel
 
 class ShareTreeManager(DictListBasedObjectManager):
 
@@ -52,13 +53,34 @@ class ShareTreeManager(DictListBasedObjectManager):
             share_value = int(shares)
         except ValueError as ex:
             raise InvalidArgument(exception=ex)
-        self.qconf_executor.execute_qconf('-astnode %s=%s' % (path, shares), self.QCONF_ERROR_REGEX_LIST)
+        self.qconf_executor.execute_qconf(['-astnode', '%s=%s' % (path, shares)], self.QCONF_ERROR_REGEX_LIST)
+        self.invalidate_cached_object()
         return self.get_object()
 
     def delete_stnode(self, path):
-        self.qconf_executor.execute_qconf('-dstnode %s' % (path), self.QCONF_ERROR_REGEX_LIST)
+        self.qconf_executor.execute_qconf(['-dstnode', path], self.QCONF_ERROR_REGEX_LIST)
+        self.invalidate_cached_object()
         return self.get_object()
 
+    def get_model(self):
+        try:
+            return ShareTreeModel(self.get_object())
+        except ObjectNotFound:
+            return ShareTreeModel()
+
+    def commit_model(self, model):
+        # All staged changes are applied with a single qconf command
+        stree = self.generate_object(data=model.get_data(), add_required_data=False)
+        if model.exists:
+            self.replace_object(stree)
+        else:
+            self.qconf_executor.execute_qconf_with_object('-A%s' % self.OBJECT_CLASS_UGE_NAME, stree,
+                                                          self.QCONF_ERROR_REGEX_LIST)
+            self.invalidate_cached_object()
+            stree.set_add_metadata()
+        model.set_committed()
+        return stree
+
     def object_exists(self):
         try:
             self.qconf_executor.execute_qconf('-sstree', self.QCONF_ERROR_SSTREE_REGEX_LIST)
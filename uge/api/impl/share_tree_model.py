@@ -0,0 +1,315 @@
+#!/usr/bin/env python
+#
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+#
+from uge.exceptions.invalid_argument import InvalidArgument
+from uge.exceptions.invalid_request import InvalidRequest
+from uge.exceptions.object_already_exists import ObjectAlreadyExists
+from uge.exceptions.object_not_found import ObjectNotFound
+
+
+class ShareTreeNode(object):
+    """ Single share tree node. """
+
+    __slots__ = ('id', 'name', 'type', 'shares', 'parent', 'children')
+
+    def __init__(self, node_id, name, node_type=0, shares=0, parent=None):
+        self.id = node_id
+        self.name = name
+        self.type = node_type
+        self.shares = shares
+        self.parent = parent
+        self.children = []
+
+    def __repr__(self):
+        return 'ShareTreeNode(%s, %s)' % (self.get_path(), self.shares)
+
+    def get_path(self):
+        """ :returns: Node path (e.g., '/P1/user1'); root node path is '/'. """
+        name_list = []
+        node = self
+        while node.parent is not None:
+            name_list.append(node.name)
+            node = node.parent
+        return '/' + '/'.join(reversed(name_list))
+
+    def get_child(self, name):
+        for child in self.children:
+            if child.name == name:
+                return child
+        return None
+
+    def iter_subtree(self):
+        """ Yield node and all its descendants, parents before children. """
+        pending_list = [self]
+        while pending_list:
+            node = pending_list.pop()
+            yield node
+            pending_list.extend(reversed(node.children))
+
+
+class ShareTreeModel(object):
+    """
+    Share tree as a tree of nodes, indexed by node id and by path.
+
+    The model is built from a single share tree retrieval; node additions,
+    deletions, moves and share changes are applied locally, and all of them
+    are committed together by replacing the whole share tree (qconf -Mstree).
+
+    Usage:
+        model = api.get_stree_model()
+        model.add_node('/P1/user1', 10)
+        model.set_shares('/P2', 50)
+        model.delete_node('/P3')
+        api.commit_stree_model(model)
+    """
+
+    #: Node types.
+    USER_NODE = 0
+    PROJECT_NODE = 1
+
+    ROOT_NAME = 'Root'
+
+    def __init__(self, share_tree=None):
+        """
+        :param share_tree: Share tree object; if not provided (or empty), model contains only root node.
+        :type share_tree: ShareTree
+
+        :raises InvalidArgument: in case share tree data does not describe a tree.
+        """
+        self.node_dict = {}
+        self.path_dict = {}
+        self.root = None
+        self.exists = False
+        self.change_count = 0
+        if share_tree is not None and share_tree.data:
+            self.exists = True
+            self.build(share_tree.data)
+        else:
+            self.root = ShareTreeNode(0, self.ROOT_NAME, self.USER_NODE, 1)
+            self.node_dict[0] = self.root
+            self.path_dict['/'] = self.root
+        self.next_id = max(self.node_dict.keys()) + 1
+
+    def __len__(self):
+        return len(self.node_dict)
+
+    def __repr__(self):
+        return 'ShareTreeModel(%s nodes, %s pending changes)' % (len(self.node_dict), self.change_count)
+
+    @classmethod
+    def get_child_ids(cls, childnodes):
+        if childnodes is None:
+            return []
+        if type(childnodes) != list:
+            childnodes = ('%s' % childnodes).split(',')
+        return [int(child_id) for child_id in childnodes if ('%s' % child_id).upper() != 'NONE']
+
+    def build(self, data):
+        child_ids_dict = {}
+        for d in data:
+            node_id = int(d.get('id'))
+            if node_id in self.node_dict:
+                raise InvalidArgument('Duplicate share tree node id: %s' % node_id)
+            self.node_dict[node_id] = ShareTreeNode(node_id, d.get('name'), d.get('type'), d.get('shares'))
+            child_ids_dict[node_id] = self.get_child_ids(d.get('childnodes'))
+        for (node_id, child_id_list) in list(child_ids_dict.items()):
+            node = self.node_dict[node_id]
+            for child_id in child_id_list:
+                child = self.node_dict.get(child_id)
+                if child is None:
+                    raise InvalidArgument('Share tree node %s refers to unknown child node %s.' % (node_id, child_id))
+                if child.parent is not None or child_id == data[0].get('id'):
+                    raise InvalidArgument('Share tree node %s has more than one parent.' % child_id)
+                child.parent = node
+                node.children.append(child)
+        # First node is the root
+        self.root = self.node_dict[int(data[0].get('id'))]
+        for node in self.root.iter_subtree():
+            self.path_dict[node.get_path()] = node
+        if len(self.path_dict) != len(self.node_dict):
+            raise InvalidArgument('Share tree contains nodes that are not reachable from root.')
+
+    @classmethod
+    def split_path(cls, path):
+        return [name for name in path.split('/') if name]
+
+    @classmethod
+    def normalize_path(cls, path):
+        return '/' + '/'.join(cls.split_path(path))
+
+    @classmethod
+    def check_shares(cls, shares):
+        try:
+            shares = int(shares)
+        except (TypeError, ValueError) as ex:
+            raise InvalidArgument(exception=ex)
+        if shares < 0:
+            raise InvalidArgument('Number of shares must not be negative: %s' % shares)
+        return shares
+
+    def has_changes(self):
+        """ :returns: True if model has changes that were not committed. """
+        return self.change_count > 0
+
+    def get_node(self, path):
+        """
+        :param path: Node path (e.g., '/P1/user1').
+        :type path: str
+
+        :returns: ShareTreeNode object.
+
+        :raises ObjectNotFound: in case path does not exist.
+        """
+        node = self.path_dict.get(self.normalize_path(path))
+        if node is None:
+            raise ObjectNotFound('Share tree node %s does not exist.' % path)
+        return node
+
+    def get_node_by_id(self, node_id):
+        """ :raises ObjectNotFound: in case node with a given id does not exist. """
+        node = self.node_dict.get(node_id)
+        if node is None:
+            raise ObjectNotFound('Share tree node with id %s does not exist.' % node_id)
+        return node
+
+    def get_paths(self):
+        """ :returns: Sorted list of all node paths. """
+        return sorted(self.path_dict.keys())
+
+    def add_node(self, path, shares, node_type=USER_NODE):
+        """
+        Add node; parent node must exist.
+
+        :param path: New node path (e.g., '/P1/user1').
+        :type path: str
+
+        :param shares: Number of shares.
+        :type shares: int
+
+        :param node_type: Node type (ShareTreeModel.USER_NODE or ShareTreeModel.PROJECT_NODE).
+        :type node_type: int
+
+        :returns: New ShareTreeNode object.
+
+        :raises ObjectNotFound: in case parent node does not exist.
+        :raises ObjectAlreadyExists: in case node already exists.
+        :raises InvalidArgument: in case number of shares is not valid.
+        """
+        name_list = self.split_path(path)
+        if not name_list:
+            raise ObjectAlreadyExists('Share tree root node already exists.')
+        shares = self.check_shares(shares)
+        parent = self.get_node('/'.join(name_list[:-1]))
+        path = self.normalize_path(path)
+        if path in self.path_dict:
+            raise ObjectAlreadyExists('Share tree node %s already exists.' % path)
+        node = ShareTreeNode(self.next_id, name_list[-1], node_type, shares, parent)
+        self.next_id += 1
+        parent.children.append(node)
+        self.node_dict[node.id] = node
+        self.path_dict[path] = node
+        self.change_count += 1
+        return node
+
+    def delete_node(self, path):
+        """
+        Delete node, together with all its descendants.
+
+        :raises ObjectNotFound: in case node does not exist.
+        :raises InvalidRequest: in case root node is to be deleted.
+        """
+        node = self.get_node(path)
+        if node is self.root:
+            raise InvalidRequest('Share tree root node cannot be deleted.')
+        self.remove_paths(node)
+        for deleted_node in node.iter_subtree():
+            del self.node_dict[deleted_node.id]
+        node.parent.children.remove(node)
+        node.parent = None
+        self.change_count += 1
+
+    def remove_paths(self, node):
+        for subtree_node in node.iter_subtree():
+            del self.path_dict[subtree_node.get_path()]
+
+    def move_node(self, path, parent_path):
+        """
+        Move node, together with all its descendants, under a new parent.
+
+        :returns: Moved ShareTreeNode object.
+
+        :raises ObjectNotFound: in case node or new parent node do not exist.
+        :raises ObjectAlreadyExists: in case new parent already has a child with the same name.
+        :raises InvalidRequest: in case root node is to be moved, or node is to be moved into its own subtree.
+        """
+        node = self.get_node(path)
+        parent = self.get_node(parent_path)
+        if node is self.root:
+            raise InvalidRequest('Share tree root node cannot be moved.')
+        ancestor = parent
+        while ancestor is not None:
+            if ancestor is node:
+                raise InvalidRequest('Share tree node %s cannot be moved into its own subtree.' % path)
+            ancestor = ancestor.parent
+        new_path = '%s/%s' % (parent.get_path().rstrip('/'), node.name)
+        if new_path in self.path_dict:
+            raise ObjectAlreadyExists('Share tree node %s already exists.' % new_path)
+        self.remove_paths(node)
+        node.parent.children.remove(node)
+        node.parent = parent
+        parent.children.append(node)
+        for moved_node in node.iter_subtree():
+            self.path_dict[moved_node.get_path()] = moved_node
+        self.change_count += 1
+        return node
+
+    def set_shares(self, path, shares):
+        """
+        Change number of shares of a node.
+
+        :raises ObjectNotFound: in case node does not exist.
+        :raises InvalidArgument: in case number of shares is not valid.
+        """
+        self.get_node(path).shares = self.check_shares(shares)
+        self.change_count += 1
+
+    def get_data(self):
+        """ :returns: Share tree data (list of node dictionaries, root node first), as used by ShareTree object. """
+        data = []
+        for node in self.root.iter_subtree():
+            data.append({
+                'id': node.id,
+                'name': node.name,
+                'type': node.type,
+                'shares': node.shares,
+                'childnodes': node.children and ['%s' % child.id for child in node.children] or None,
+            })
+        return data
+
+    def set_committed(self):
+        self.exists = True
+        self.change_count = 0
+
+
+#############################################################################
+# Testing.
+if __name__ == '__main__':
+    pass
@@ -21,33 +21,19 @@
 #
 __docformat__ = 'reStructuredText'
 
+import importlib
 import os
 from decorator import decorator
 from functools import wraps
 from uge.log.log_manager import LogManager
 from uge.exceptions.qconf_exception import QconfException
 from uge.exceptions.configuration_error import ConfigurationError
+from uge.exceptions.invalid_argument import InvalidArgument
+from uge.exceptions.object_not_found import ObjectNotFound
 from uge.objects.qconf_object_factory import QconfObjectFactory
 from uge.api.impl.qconf_executor import QconfExecutor
-from uge.api.impl.cluster_queue_manager import ClusterQueueManager
-from uge.api.impl.execution_host_manager import ExecutionHostManager
-from uge.api.impl.host_group_manager import HostGroupManager
-from uge.api.impl.submit_host_manager import SubmitHostManager
-from uge.api.impl.admin_host_manager import AdminHostManager
-from uge.api.impl.operator_manager import OperatorManager
-from uge.api.impl.manager_manager import ManagerManager
-from uge.api.impl.parallel_environment_manager import ParallelEnvironmentManager
-from uge.api.impl.user_manager import UserManager
-from uge.api.impl.project_manager import ProjectManager
-from uge.api.impl.calendar_manager import CalendarManager
-from uge.api.impl.checkpointing_environment_manager import CheckpointingEnvironmentManager
-from uge.api.impl.access_list_manager import AccessListManager
-from uge.api.impl.scheduler_configuration_manager import SchedulerConfigurationManager
-from uge.api.impl.job_class_manager import JobClassManager
-from uge.api.impl.cluster_configuration_manager import ClusterConfigurationManager
-from uge.api.impl.complex_configuration_manager import ComplexConfigurationManager
-from uge.api.impl.resource_quota_set_manager import ResourceQuotaSetManager
-from uge.api.impl.share_tree_manager import ShareTreeManager
+from uge.api.impl.qconf_object_cache import QconfObjectCache
+from uge.api.impl.parallel_executor import ParallelExecutor
 
 try:
     import UserList
@@ -62,10 +48,49 @@ class QconfApi(object):
     DEFAULT_SGE_QMASTER_PORT = 6444
     DEFAULT_SGE_EXECD_PORT = 6445
 
+    # Managers are imported and created on first use: attribute name => (module name, class name)
+    MANAGER_CLASS_DICT = {
+        'cluster_queue_manager': ('cluster_queue_manager', 'ClusterQueueManager'),
+        'execution_host_manager': ('execution_host_manager', 'ExecutionHostManager'),
+        'host_group_manager': ('host_group_manager', 'HostGroupManager'),
+        'submit_host_manager': ('submit_host_manager', 'SubmitHostManager'),
+        'admin_host_manager': ('admin_host_manager', 'AdminHostManager'),
+        'operator_manager': ('operator_manager', 'OperatorManager'),
+        'manager_manager': ('manager_manager', 'ManagerManager'),
+        'parallel_environment_manager': ('parallel_environment_manager', 'ParallelEnvironmentManager'),
+        'user_manager': ('user_manager', 'UserManager'),
+        'project_manager': ('project_manager', 'ProjectManager'),
+        'calendar_manager': ('calendar_manager', 'CalendarManager'),
+        'checkpointing_environment_manager': ('checkpointing_environment_manager', 'CheckpointingEnvironmentManager'),
+        'access_list_manager': ('access_list_manager', 'AccessListManager'),
+        'scheduler_configuration_manager': ('scheduler_configuration_manager', 'SchedulerConfigurationManager'),
+        'job_class_manager': ('job_class_manager', 'JobClassManager'),
+        'cluster_configuration_manager': ('cluster_configuration_manager', 'ClusterConfigurationManager'),
+        'complex_configuration_manager': ('complex_configuration_manager', 'ComplexConfigurationManager'),
+        'resource_quota_set_manager': ('resource_quota_set_manager', 'ResourceQuotaSetManager'),
+        'share_tree_manager': ('share_tree_manager', 'ShareTreeManager'),
+    }
+
+    # Managers that can retrieve all objects of their class with a single qconf call: class name => manager name
+    BULK_MANAGER_NAME_DICT = {
+        'ClusterQueue': 'cluster_queue_manager',
+        'ExecutionHost': 'execution_host_manager',
+        'HostGroup': 'host_group_manager',
+        'ParallelEnvironment': 'parallel_environment_manager',
+        'User': 'user_manager',
+        'Project': 'project_manager',
+        'Calendar': 'calendar_manager',
+        'CheckpointingEnvironment': 'checkpointing_environment_manager',
+        'AccessList': 'access_list_manager',
+        'JobClass': 'job_class_manager',
+    }
+
     logger = None
 
     def __init__(self, sge_root=None, sge_cell=None,
-                 sge_qmaster_port=None, sge_execd_port=None):
+                 sge_qmaster_port=None, sge_execd_port=None,
+                 worker_pool_size=None, cache_ttl=None,
+                 cache_size=QconfObjectCache.DEFAULT_SIZE):
         """ 
         Class constructor. 
 
@@ -81,16 +106,28 @@ class QconfApi(object):
         :param sge_execd_port: SGE Execd port. It can be set via environment variable SGE_EXECD_PORT. Default port is 6445.
         :type sge_execd_port: int
 
+        :param worker_pool_size: Number of persistent shell workers used for running qconf commands. Workers source UGE settings only once, when started, and are reused for subsequent commands. If not provided, each qconf command is run in a new shell.
+        :type worker_pool_size: int
+
+        :param cache_ttl: Time-to-live (in seconds) for objects kept in the read-through object cache. Objects retrieved by name are cached, and objects modified through this API instance are removed from the cache. If not provided, objects are not cached.
+        :type cache_ttl: float
+
+        :param cache_size: Maximum number of objects kept in the object cache; least recently used objects are evicted first. Default cache size is 1000.
+        :type cache_size: int
+
         :raises ConfigurationError: in case sge_root is not provided, and environment variable SGE_ROOT is not defined.
         :raises QmasterUnreachable: in case UGE Qmaster cannot be reached.
         :raises QconfException: for any other errors.
 
         >>> api = QconfApi(sge_root='/opt/uge')
+        >>> pooled_api = QconfApi(sge_root='/opt/uge', worker_pool_size=4)
+        >>> cached_api = QconfApi(sge_root='/opt/uge', cache_ttl=30)
         """
-        self.__configure(sge_root, sge_cell, sge_qmaster_port, sge_execd_port)
+        self.__configure(sge_root, sge_cell, sge_qmaster_port, sge_execd_port, worker_pool_size,
+                         cache_ttl, cache_size)
 
     def __configure(self, sge_root, sge_cell, sge_qmaster_port,
-                    sge_execd_port):
+                    sge_execd_port, worker_pool_size, cache_ttl, cache_size):
         self.get_logger()
         if not sge_root:
             sge_root = os.environ.get('SGE_ROOT')
@@ -105,29 +142,30 @@ class QconfApi(object):
 
         self.logger.debug('Configuration: SGE_ROOT=%s, SGE_CELL=%s, SGE_QMASTER_PORT=%s, SGE_EXECD_PORT=%s' % (
         sge_root, sge_cell, sge_qmaster_port, sge_execd_port))
+        self.object_cache = None
+        if cache_ttl:
+            self.object_cache = QconfObjectCache(cache_ttl, size=cache_size)
         self.qconf_executor = QconfExecutor(
             sge_root=sge_root, sge_cell=sge_cell,
             sge_qmaster_port=sge_qmaster_port,
-            sge_execd_port=sge_qmaster_port)
-        self.cluster_queue_manager = ClusterQueueManager(self.qconf_executor)
-        self.execution_host_manager = ExecutionHostManager(self.qconf_executor)
-        self.host_group_manager = HostGroupManager(self.qconf_executor)
-        self.submit_host_manager = SubmitHostManager(self.qconf_executor)
-        self.admin_host_manager = AdminHostManager(self.qconf_executor)
-        self.operator_manager = OperatorManager(self.qconf_executor)
-        self.manager_manager = ManagerManager(self.qconf_executor)
-        self.parallel_environment_manager = ParallelEnvironmentManager(self.qconf_executor)
-        self.user_manager = UserManager(self.qconf_executor)
-        self.project_manager = ProjectManager(self.qconf_executor)
-        self.calendar_manager = CalendarManager(self.qconf_executor)
-        self.checkpointing_environment_manager = CheckpointingEnvironmentManager(self.qconf_executor)
-        self.access_list_manager = AccessListManager(self.qconf_executor)
-        self.scheduler_configuration_manager = SchedulerConfigurationManager(self.qconf_executor)
-        self.job_class_manager = JobClassManager(self.qconf_executor)
-        self.cluster_configuration_manager = ClusterConfigurationManager(self.qconf_executor)
-        self.complex_configuration_manager = ComplexConfigurationManager(self.qconf_executor)
-        self.resource_quota_set_manager = ResourceQuotaSetManager(self.qconf_executor)
-        self.share_tree_manager = ShareTreeManager(self.qconf_executor)
+            sge_execd_port=sge_qmaster_port,
+            worker_pool_size=worker_pool_size,
+            object_cache=self.object_cache)
+
+    def __getattr__(self, name):
+        # Invoked only for missing attributes, i.e., for managers not used so far
+        if name not in self.MANAGER_CLASS_DICT:
+            raise AttributeError("'%s' object has no attribute '%s'" % (self.__class__.__name__, name))
+        (module_name, class_name) = self.MANAGER_CLASS_DICT[name]
+        module = importlib.import_module('uge.api.impl.%s' % module_name)
+        manager = getattr(module, class_name)(self.qconf_executor)
+        setattr(self, name, manager)
+        return manager
+
+    def get_bulk_manager(self, class_name):
+        if class_name not in self.BULK_MANAGER_NAME_DICT:
+            return None
+        return getattr(self, self.BULK_MANAGER_NAME_DICT[class_name])
 
     @classmethod
     def get_logger(cls):
@@ -178,6 +216,322 @@ class QconfApi(object):
         """
         return self.qconf_executor.get_uge_version()
 
+    def close(self):
+        """ Terminate persistent qconf workers, if any. Subsequent API calls run each qconf command in a new shell.
+
+        >>> api = QconfApi(worker_pool_size=4)
+        >>> api.close()
+        """
+        self.qconf_executor.close()
+
+    def get_cache_stats(self):
+        """ Get object cache statistics.
+
+        :returns: Dictionary with number of cache hits (i.e., qconf invocations saved), misses, evictions and invalidations, as well as current and maximum cache size and entry time-to-live; None if object cache is not enabled.
+
+        >>> api = QconfApi(cache_ttl=30)
+        >>> q = api.get_queue('all.q')
+        >>> q = api.get_queue('all.q')
+        >>> print(api.get_cache_stats()['hits'])
+        1
+        """
+        if not self.object_cache:
+            return None
+        return self.object_cache.get_stats()
+
+    def clear_cache(self):
+        """ Remove all objects from the object cache, so that subsequent API calls retrieve them from qmaster. Has no effect if object cache is not enabled.
+
+        >>> api.clear_cache()
+        """
+        if self.object_cache:
+            self.object_cache.clear()
+
+    @api_call
+    def execute_parallel(self, operation, items, max_workers=ParallelExecutor.DEFAULT_MAX_WORKERS,
+                         max_pending=None):
+        """ Execute independent per-item operations (typically API calls) on a bounded pool of threads. Failure of an operation for one item does not abort operations for remaining items; exceptions are collected in per-item results instead. At most max_workers qconf commands are executed at the same time, and items are consumed from the input iterable only as fast as they can be processed, so that qmaster is not flooded with requests.
+
+        :param operation: Callable invoked with a single item argument.
+        :type operation: callable
+
+        :param items: Items to process (e.g., list of host names); may be any iterable, including a generator.
+        :type items: iterable
+
+        :param max_workers: Maximum number of operations executing at the same time (default: 8).
+        :type max_workers: int
+
+        :param max_pending: Maximum number of items waiting for execution (default: 2*max_workers).
+        :type max_pending: int
+
+        :returns: List of ParallelOperationResult objects, in the same order as input items; each result contains the item, and either the operation result, or the exception raised by the operation.
+
+        :raises InvalidArgument: in case max_workers or max_pending are not positive numbers.
+
+        >>> results = api.execute_parallel(lambda name: api.modify_ehost(name=name, data={'complex_values': ['slots=8']}), host_names, max_workers=16)
+        >>> failed_hosts = [r.item for r in results if not r.is_successful()]
+        """
+        return ParallelExecutor(max_workers=max_workers, max_pending=max_pending).execute(operation, items)
+
+    @api_call
+    def iter_objects(self, class_name):
+        """ Retrieve all objects of the given class using a single qconf call, and return iterator that yields them one at a time, while qconf output is being read. Unlike get_queues(), get_ehosts(), etc., memory usage does not grow with the number of objects in the cluster.
+
+        :param class_name: Object class name; supported classes are AccessList, Calendar, CheckpointingEnvironment, ClusterQueue, ExecutionHost, HostGroup, JobClass, ParallelEnvironment, Project and User.
+        :type class_name: str
+
+        :returns: Object iterator.
+
+        :raises InvalidArgument: in case an unsupported class name is specified.
+        :raises QmasterUnreachable: in case UGE Qmaster cannot be reached.
+        :raises QconfException: for any other errors.
+
+        >>> for ehost in api.iter_objects('ExecutionHost'):
+        ...     print(ehost.data['hostname'], ehost.data['load_values'])
+        """
+        if class_name not in self.BULK_MANAGER_NAME_DICT:
+            raise InvalidArgument('Bulk retrieval is not supported for class %s.' % class_name)
+        return self.get_bulk_manager(class_name).iter_objects()
+
+    @api_call
+    def prefetch(self, classes=None):
+        """ Retrieve all objects of the given classes, using a single qconf call per class, and store them in the object cache. Subsequent retrievals of individual objects (e.g., get_queue() or get_ehost()) are served from the cache until cached objects expire. Object cache must be enabled, and its size should be large enough to hold all prefetched objects.
+
+        :param classes: List of object class names; supported classes are AccessList, Calendar, CheckpointingEnvironment, ClusterQueue, ExecutionHost, HostGroup, JobClass, ParallelEnvironment, Project and User. If not provided, objects of all supported classes are retrieved.
+        :type classes: list
+
+        :returns: Dictionary containing number of cached objects for each class.
+
+        :raises InvalidArgument: in case an unsupported class name is specified.
+        :raises InvalidRequest: in case object cache is not enabled.
+        :raises QmasterUnreachable: in case UGE Qmaster cannot be reached.
+        :raises QconfException: for any other errors.
+
+        >>> api = QconfApi(cache_ttl=300, cache_size=10000)
+        >>> api.prefetch(classes=['ExecutionHost', 'ClusterQueue'])
+        {'ExecutionHost': 5000, 'ClusterQueue': 12}
+        >>> ehost = api.get_ehost('node1001')
+        """
+        if classes is None:
+            classes = sorted(self.BULK_MANAGER_NAME_DICT.keys())
+        for class_name in classes:
+            if class_name not in self.BULK_MANAGER_NAME_DICT:
+                raise InvalidArgument('Prefetch is not supported for class %s.' % class_name)
+        n_cached_dict = {}
+        for class_name in classes:
+            n_cached_dict[class_name] = self.get_bulk_manager(class_name).prefetch_objects()
+        return n_cached_dict
+
+    @api_call
+    def snapshot(self, filename=None, classes=None, verify=True, max_workers=ParallelExecutor.DEFAULT_MAX_WORKERS):
+        """ Retrieve configuration of the whole UGE cell, and optionally write it to a single file. All classes are retrieved concurrently, using a single qconf call per class where possible, so that snapshot time is bounded by the slowest class. Classes are then retrieved again, and those modified in the meantime are retrieved until they stop changing, so that the snapshot represents a consistent cut of the cell configuration (load values of execution hosts are not considered configuration changes).
+
+        :param filename: Snapshot file name; file is compressed if its name ends with '.gz'. If not provided, snapshot is not written.
+        :type filename: str
+
+        :param classes: List of snapshot classes; supported classes are AccessList, AdminHost, Calendar, CheckpointingEnvironment, ClusterConfiguration, ClusterQueue, ComplexConfiguration, ExecutionHost, HostGroup, JobClass, Manager, Operator, ParallelEnvironment, Project, ResourceQuotaSet, SchedulerConfiguration, ShareTree, SubmitHost and User. If not provided, all classes are retrieved.
+        :type classes: list
+
+        :param verify: If True (default), classes that changed during retrieval are retrieved again.
+        :type verify: bool
+
+        :param max_workers: Maximum number of classes retrieved at the same time (default: 8).
+        :type max_workers: int
+
+        :returns: ClusterSnapshot object.
+
+        :raises InvalidArgument: in case an unsupported class name is specified.
+        :raises QmasterUnreachable: in case UGE Qmaster cannot be reached.
+        :raises QconfException: for any other errors.
+
+        >>> snapshot = api.snapshot('/tmp/cell.json.gz')
+        >>> snapshot.get_summary()
+        {'ExecutionHost': 5000, 'ClusterQueue': 12, 'SchedulerConfiguration': 1,...}
+        >>> api.reconcile(snapshot.get_objects('HostGroup'))
+        """
+        from uge.api.impl.cluster_snapshot import ClusterSnapshotBuilder
+        snapshot = ClusterSnapshotBuilder(self, max_workers=max_workers).build(classes=classes, verify=verify)
+        if filename:
+            snapshot.write(filename)
+        return snapshot
+
+    @api_call
+    def read_snapshot(self, filename):
+        """ Read snapshot file written by snapshot(); qmaster is not contacted.
+
+        :param filename: Snapshot file name.
+        :type filename: str
+
+        :returns: ClusterSnapshot object.
+
+        :raises InvalidArgument: in case file does not contain a cluster snapshot.
+        """
+        from uge.api.impl.cluster_snapshot import ClusterSnapshot
+        return ClusterSnapshot.read(filename)
+
+    @api_call
+    def get_fingerprints(self, classes=None, max_workers=ParallelExecutor.DEFAULT_MAX_WORKERS):
+        """ Retrieve fingerprints of all objects of the given classes. Objects that can be listed with a single bulk qconf call are fingerprinted by hashing their qconf output, without parsing it; other objects are fingerprinted using a canonical hash of object data (see QconfObject.get_fingerprint()). Load values of execution hosts are not included. Objects are streamed from qconf output, and only their fingerprints are kept in memory.
+
+        :param classes: List of classes; see snapshot() for supported classes. If not provided, all classes are retrieved.
+        :type classes: list
+
+        :param max_workers: Maximum number of classes retrieved at the same time (default: 8).
+        :type max_workers: int
+
+        :returns: Dictionary of object fingerprints, keyed by (class name, object name) tuples.
+
+        :raises InvalidArgument: in case an unsupported class name is specified.
+        :raises QmasterUnreachable: in case UGE Qmaster cannot be reached.
+        :raises QconfException: for any other errors.
+        """
+        from uge.api.impl.drift_detector import DriftDetector
+        return DriftDetector(self, classes=classes, max_workers=max_workers).get_fingerprints()
+
+    @api_call
+    def detect_drift(self, baseline, classes=None, max_workers=ParallelExecutor.DEFAULT_MAX_WORKERS):
+        """ Detect objects that were added, removed or changed since the baseline was recorded. Unchanged objects cost a single fingerprint comparison.
+
+        :param baseline: Baseline fingerprints, as returned by get_fingerprints() or by previous detect_drift() call (report.fingerprint_dict), or ClusterSnapshot object.
+        :type baseline: dict or ClusterSnapshot
+
+        :param classes: List of checked classes (default: classes present in the baseline).
+        :type classes: list
+
+        :param max_workers: Maximum number of classes retrieved at the same time (default: 8).
+        :type max_workers: int
+
+        :returns: DriftReport object.
+
+        :raises InvalidArgument: in case an unsupported class name is specified.
+        :raises QmasterUnreachable: in case UGE Qmaster cannot be reached.
+        :raises QconfException: for any other errors.
+
+        >>> baseline = api.get_fingerprints(classes=['ClusterQueue', 'HostGroup'])
+        >>> report = api.detect_drift(baseline)
+        >>> report.changed
+        [('ClusterQueue', 'all.q')]
+        >>> baseline = report.fingerprint_dict
+        """
+        from uge.api.impl.cluster_snapshot import ClusterSnapshot
+        from uge.api.impl.drift_detector import DriftDetector
+        if classes is None:
+            if isinstance(baseline, ClusterSnapshot):
+                classes = baseline.get_class_names()
+            else:
+                classes = sorted(set([class_name for (class_name, _) in baseline]))
+        detector = DriftDetector(self, classes=classes, max_workers=max_workers)
+        detector.set_baseline(baseline)
+        return detector.check()
+
+    @api_call
+    def create_watcher(self, classes=None, interval=None, initial_events=False,
+                       max_workers=ParallelExecutor.DEFAULT_MAX_WORKERS):
+        """ Create watcher that polls bulk qconf listings (e.g., qconf -sqld) of the given classes, and reports objects that were added, modified or deleted. Only objects whose qconf output changed since the previous poll are parsed. Many consumers can share a single watcher (and therefore a single stream of qconf calls) by subscribing to it.
+
+        :param classes: List of watched classes; supported classes are AccessList, Calendar, CheckpointingEnvironment, ClusterQueue, ExecutionHost, HostGroup, JobClass, ParallelEnvironment, Project and User. If not provided, all classes are watched.
+        :type classes: list
+
+        :param interval: Polling interval in seconds (default: 30).
+        :type interval: float
+
+        :param initial_events: If True, the first poll reports all existing objects as added (default: False).
+        :type initial_events: bool
+
+        :param max_workers: Maximum number of classes polled at the same time (default: 8).
+        :type max_workers: int
+
+        :returns: QconfWatcher object.
+
+        :raises InvalidArgument: in case an unsupported class name is specified.
+
+        >>> watcher = api.create_watcher(classes=['ClusterQueue'], interval=10)
+        >>> for event in watcher.subscribe():
+        ...     print(event.event_type, event.name, event.pycl_object.data['slots'])
+        """
+        from uge.api.impl.qconf_watcher import QconfWatcher
+        if interval is None:
+            interval = QconfWatcher.DEFAULT_INTERVAL
+        return QconfWatcher(self, classes=classes, interval=interval, initial_events=initial_events,
+                            max_workers=max_workers)
+
+    def watch(self, classes=None, interval=None, initial_events=False,
+              max_workers=ParallelExecutor.DEFAULT_MAX_WORKERS):
+        """ Poll bulk qconf listings of the given classes every interval seconds, and yield object events (see create_watcher() for details).
+
+        :returns: Generator of WatchEvent objects; each event contains event type ('added', 'modified' or 'deleted'), class name, object name and parsed object.
+
+        :raises InvalidArgument: in case an unsupported class name is specified.
+        :raises QmasterUnreachable: in case UGE Qmaster cannot be reached.
+        :raises QconfException: for any other errors.
+
+        >>> for event in api.watch(classes=['HostGroup'], interval=10):
+        ...     print(event.event_type, event.name, event.pycl_object.data['hostlist'])
+        """
+        return self.create_watcher(classes=classes, interval=interval, initial_events=initial_events,
+                                   max_workers=max_workers).watch()
+
+    @api_call
+    def create_reconcile_plan(self, desired_objects, prune=False, classes=None,
+                              max_workers=ParallelExecutor.DEFAULT_MAX_WORKERS):
+        """ Compare desired objects with the current cluster configuration, and compute changes (creations, updates and deletions) needed to converge the cluster to the desired state. Current objects are retrieved using a single qconf call per object class, with classes retrieved concurrently. Changes are ordered so that referenced objects are created before objects that refer to them (e.g., host groups before queues, access lists before projects), and deleted after them.
+
+        :param desired_objects: Desired objects; each item may be an object, its JSON string, or dictionary with object's JSON structure. Supported classes are AccessList, ClusterQueue, ComplexConfiguration, HostGroup, ParallelEnvironment, Project, ResourceQuotaSet and User. Objects are migrated to the qmaster UGE version if needed.
+        :type desired_objects: iterable
+
+        :param prune: If True, existing objects of the reconciled classes that are not among desired objects are deleted (default: False). Built-in access lists and complex attributes are never deleted.
+        :type prune: bool
+
+        :param classes: Object classes to reconcile (default: classes of desired objects); objects of other classes are ignored.
+        :type classes: list
+
+        :param max_workers: Maximum number of object classes retrieved at the same time (default: 8).
+        :type max_workers: int
+
+        :returns: ReconcilePlan object.
+
+        :raises InvalidArgument: in case an unsupported class is specified.
+        :raises QmasterUnreachable: in case UGE Qmaster cannot be reached.
+        :raises QconfException: for any other errors.
+
+        >>> plan = api.create_reconcile_plan(QconfObjectFactory.migrate_objects(snapshot, api.get_uge_version()), prune=True)
+        >>> print(plan.get_summary())
+        {'HostGroup': {'create': 2, 'update': 1, 'delete': 0}, 'ClusterQueue': {'create': 0, 'update': 3, 'delete': 1}}
+        """
+        from uge.api.impl.qconf_reconciler import QconfReconciler
+        return QconfReconciler(self, max_workers=max_workers).plan(desired_objects, prune=prune, classes=classes)
+
+    @api_call
+    def apply_reconcile_plan(self, plan, max_workers=ParallelExecutor.DEFAULT_MAX_WORKERS):
+        """ Apply changes computed by create_reconcile_plan(). Creations and updates of each class are applied using bulk (directory based) qconf commands where available, and object classes that do not reference each other are applied concurrently. Deletions are applied after all creations and updates, in reverse reference order. If changes for any class fail, the first error is raised once all classes at the same reference level are processed, and remaining changes are not applied.
+
+        :param plan: Reconcile plan.
+        :type plan: ReconcilePlan
+
+        :param max_workers: Maximum number of object classes modified at the same time (default: 8).
+        :type max_workers: int
+
+        :returns: Applied plan.
+
+        :raises QmasterUnreachable: in case UGE Qmaster cannot be reached.
+        :raises QconfException: for any other errors.
+        """
+        from uge.api.impl.qconf_reconciler import QconfReconciler
+        return QconfReconciler(self, max_workers=max_workers).apply(plan)
+
+    @api_call
+    def reconcile(self, desired_objects, prune=False, classes=None, max_workers=ParallelExecutor.DEFAULT_MAX_WORKERS):
+        """ Converge cluster configuration to the desired state; this is equivalent to calling create_reconcile_plan() followed by apply_reconcile_plan().
+
+        :returns: Applied plan.
+
+        >>> plan = api.reconcile([hgrp, queue])
+        >>> print(plan.get_actions(action='create'))
+        """
+        from uge.api.impl.qconf_reconciler import QconfReconciler
+        reconciler = QconfReconciler(self, max_workers=max_workers)
+        return reconciler.apply(reconciler.plan(desired_objects, prune=prune, classes=classes))
+
     def generate_object(self, json_string, target_uge_version=None):
         """ Use specified JSON string to generate object for the target UGE version.
  
@@ -394,6 +748,29 @@ class QconfApi(object):
         """
         return self.cluster_queue_manager.get_objects()
 
+    @api_call
+    def get_queue_resolver(self, hgrp_index=None):
+        """ Retrieve all UGE queues and host groups (one qconf call each), and create resolver for effective configuration of queue instances, which takes per-host and per-host group overrides (e.g., 'slots 1,[@gpu=8],[node7=16]') into account. All resolver lookups are local.
+
+        :param hgrp_index: Host group index; if not provided, host groups are retrieved.
+        :type hgrp_index: HostGroupIndex
+
+        :returns: QueueConfigurationResolver object.
+
+        :raises InvalidArgument: in case host groups refer to each other in a cycle.
+        :raises QmasterUnreachable: in case UGE Qmaster cannot be reached.
+        :raises QconfException: for any other errors.
+
+        >>> resolver = api.get_queue_resolver()
+        >>> resolver.get_slots('all.q', 'node7')
+        16
+        >>> resolver.get_total_slots()
+        {'all.q': 10240}
+        """
+        if hgrp_index is None:
+            hgrp_index = self.host_group_manager.get_index()
+        return self.cluster_queue_manager.get_resolver(hgrp_index)
+
     @api_call
     def delete_queue(self, name):
         """ Delete UGE queue configuration.
@@ -938,6 +1315,20 @@ class QconfApi(object):
         """
         return self.execution_host_manager.get_objects()
 
+    @api_call
+    def get_ehost_table(self):
+        """ Retrieve load values, complex values and processors for all UGE execution hosts, in columnar form.
+
+        :returns: ExecutionHostTable object; numeric columns (with memory units normalized to bytes) can be scanned with select().
+
+        :raises QmasterUnreachable: in case UGE Qmaster cannot be reached.
+        :raises QconfException: for any other errors.
+
+        >>> table = api.get_ehost_table()
+        >>> busy_host_list = table.select('mem_free < 4G and np_load_avg > 1.5')
+        """
+        return self.execution_host_manager.get_table()
+
     @api_call
     def delete_ehost(self, name):
         """ Delete UGE execution host.
@@ -1230,6 +1621,23 @@ class QconfApi(object):
         """
         return self.host_group_manager.get_objects()
 
+    @api_call
+    def get_hgrp_index(self):
+        """ Retrieve all UGE host groups using a single qconf call, and build index of their resolved host sets, with nested group references (e.g., '@rack1') expanded.
+
+        :returns: HostGroupIndex object, providing host sets of all groups, and groups containing each host.
+
+        :raises InvalidArgument: in case host groups refer to each other in a cycle.
+        :raises QmasterUnreachable: in case UGE Qmaster cannot be reached.
+        :raises QconfException: for any other errors.
+
+        >>> hgrp_index = api.get_hgrp_index()
+        >>> hgrp_index.get_groups('node1234')
+        frozenset({'@allhosts', '@rack12'})
+        >>> hgrp_index.update_group(api.get_hgrp('@rack12'))
+        """
+        return self.host_group_manager.get_index()
+
     @api_call
     def delete_hgrp(self, name):
         """ Delete UGE host group.
@@ -3697,6 +4105,35 @@ class QconfApi(object):
         """
         return self.resource_quota_set_manager.get_object(name)
 
+    @api_call
+    def get_rqs_matcher(self, hgrp_index=None, include_disabled=False):
+        """ Retrieve all UGE resource quota sets, host groups and access lists (one qconf call each), and compile resource quota rules for offline matching of (user, project, pe, queue, host) requests.
+
+        :param hgrp_index: Host group index; if not provided, host groups are retrieved.
+        :type hgrp_index: HostGroupIndex
+
+        :param include_disabled: If True, disabled resource quota sets are also compiled.
+        :type include_disabled: bool
+
+        :returns: ResourceQuotaMatcher object.
+
+        :raises InvalidArgument: in case a resource quota rule cannot be parsed.
+        :raises QmasterUnreachable: in case UGE Qmaster cannot be reached.
+        :raises QconfException: for any other errors.
+
+        >>> matcher = api.get_rqs_matcher()
+        >>> matcher.get_limits('slots', user='bob', queue='all.q', host='node7')
+        [(ResourceQuotaRule(max_slots/1: users {*} to slots=10), '10')]
+        """
+        if hgrp_index is None:
+            hgrp_index = self.host_group_manager.get_index()
+        try:
+            acl_list = list(self.access_list_manager.iter_objects())
+        except ObjectNotFound:
+            acl_list = []
+        return self.resource_quota_set_manager.get_matcher(
+            hgrp_index=hgrp_index, acls=acl_list, include_disabled=include_disabled)
+
     @api_call
     def delete_rqs(self, name):
         """ Delete UGE resource quota set configuration.
@@ -3986,6 +4423,44 @@ class QconfApi(object):
         """
         return self.share_tree_manager.delete_stnode(path)
 
+    @api_call
+    def get_stree_model(self):
+        """ Retrieve UGE share tree and build its tree model, indexed by node id and path. Node changes are staged in the model, and applied with commit_stree_model().
+
+        :returns: ShareTreeModel object; if share tree does not exist, model contains only root node.
+
+        :raises InvalidArgument: in case share tree data does not describe a tree.
+        :raises QmasterUnreachable: in case UGE Qmaster cannot be reached.
+        :raises QconfException: for any other errors.
+
+        >>> model = api.get_stree_model()
+        >>> model.get_node('/P1').shares
+        10
+        """
+        return self.share_tree_manager.get_model()
+
+    @api_call
+    def commit_stree_model(self, model):
+        """ Apply all changes staged in share tree model (node additions, deletions, moves and share changes) with a single qconf command.
+
+        :param model: Share tree model.
+        :type model: ShareTreeModel
+
+        :returns: Modified ShareTree object.
+
+        :raises InvalidRequest: in case share tree refers to unknown users or projects.
+        :raises AuthorizationError: if user is not authorized to make changes to UGE configuration.
+        :raises QmasterUnreachable: in case UGE Qmaster cannot be reached.
+        :raises QconfException: for any other errors.
+
+        >>> model = api.get_stree_model()
+        >>> model.add_node('/P3', 25, node_type=model.PROJECT_NODE)
+        >>> model.set_shares('/P1', 50)
+        >>> model.delete_node('/P2')
+        >>> stree = api.commit_stree_model(model)
+        """
+        return self.share_tree_manager.commit_model(model)
+
 
 #############################################################################
 # Testing.
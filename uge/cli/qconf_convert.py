@@ -19,47 +19,143 @@
 #######################################################################################
 # ___INFO__MARK_END__
 #
+from __future__ import print_function
+import glob
+import json
+import multiprocessing
+import os
+import sys
+
 from uge.cli.qconf_cli import QconfCli
 from uge.api.qconf_api import QconfApi
+from uge.objects.qconf_object_factory import QconfObjectFactory
 from uge.exceptions.invalid_request import InvalidRequest
 
+# Objects are handed out to conversion processes in chunks of this size
+CONVERSION_CHUNK_SIZE = 64
+
+
+def convert_object(json_string, target_uge_version, output_format='json'):
+    """
+    Convert object with a given JSON representation to the target UGE version.
+    This function does not require access to qmaster.
+
+    :returns: Converted object in the requested output format.
+    """
+    qconf_object = QconfObjectFactory.generate_object(json_string, target_uge_version)
+    if output_format == 'uge':
+        return qconf_object.to_uge()
+    return qconf_object.to_json()
+
+
+def convert_object_task(task):
+    """ Process pool entry point; task is (source, json_string, target_uge_version, output_format) tuple. """
+    (source, json_string, target_uge_version, output_format) = task
+    try:
+        return convert_object(json_string, target_uge_version, output_format)
+    except Exception as ex:
+        raise InvalidRequest('Cannot convert object from %s: %s' % (source, ex))
+
 
 class QconfConvert(QconfCli):
     """ Qconf upgrade command. """
 
     def __init__(self):
         QconfCli.__init__(self)
-        self.api = QconfApi()
-        self.add_option('', '--input-file', dest='input_file',
-                        help='Input file containing object\'s JSON representation.')
-        self.add_option('', '--to-uge', dest='target_uge_version', default=self.api.get_uge_version(),
-                        help='Target UGE version (default: %s).' % self.api.get_uge_version())
+        self.add_option('', '--input-file', dest='input_file_list', action='append', default=[],
+                        help='Input file containing object\'s JSON representation, or JSON lines stream with '
+                             'one object per line; directory or glob pattern may also be given, as well as '
+                             '\'-\' for standard input. This option may be repeated.')
+        self.add_option('', '--to-uge', dest='target_uge_version', default=None,
+                        help='Target UGE version (default: version of the running cluster); if specified, '
+                             'conversion does not contact qmaster.')
         self.add_option('', '--output-format', dest='output_format', default='json',
                         help='Output format, either json or uge (default: json).')
+        self.add_option('', '--processes', dest='n_processes', type='int', default=1,
+                        help='Number of conversion processes (default: 1).')
 
     def check_input_args(self):
-        if not self.options.input_file:
+        if not self.options.input_file_list:
             raise InvalidRequest('Missing input file.')
         if self.options.output_format not in ['json', 'uge']:
             raise InvalidRequest('Output format may be either json or uge.')
+        if self.options.n_processes < 1:
+            raise InvalidRequest('Number of processes must be a positive integer.')
+
+    def get_target_uge_version(self):
+        """ :returns: Target UGE version; qmaster is contacted only if version was not given. """
+        if self.options.target_uge_version:
+            return self.options.target_uge_version
+        return QconfApi().get_uge_version()
+
+    def get_input_file_list(self):
+        """ :returns: List of input files with directories and glob patterns expanded. """
+        input_file_list = []
+        for input_file in self.options.input_file_list:
+            if input_file == '-' or os.path.isfile(input_file):
+                input_file_list.append(input_file)
+            elif os.path.isdir(input_file):
+                for (dir_path, dir_names, file_names) in os.walk(input_file):
+                    dir_names.sort()
+                    input_file_list.extend([os.path.join(dir_path, f) for f in sorted(file_names)])
+            else:
+                file_list = sorted([f for f in glob.glob(input_file) if os.path.isfile(f)])
+                if not file_list:
+                    raise InvalidRequest('Input file %s does not exist.' % input_file)
+                input_file_list.extend(file_list)
+        return input_file_list
+
+    def iter_json_strings(self, input_file):
+        """
+        Generate (source, json_string) tuples from a given input file, which may
+        contain either single (possibly multi-line) JSON document, or JSON lines.
+        """
+        if input_file == '-':
+            content = sys.stdin.read()
+        else:
+            with open(input_file) as f:
+                content = f.read()
+        lines = [line for line in content.split('\n') if line.strip()]
+        if len(lines) > 1:
+            try:
+                json.loads(lines[0])
+            except ValueError:
+                lines = [content]
+        for (i, line) in enumerate(lines):
+            yield ('%s:%s' % (input_file, i + 1), line)
+
+    def iter_tasks(self, target_uge_version):
+        output_format = self.options.output_format
+        for input_file in self.get_input_file_list():
+            for (source, json_string) in self.iter_json_strings(input_file):
+                yield (source, json_string, target_uge_version, output_format)
 
     def run_command(self):
         self.parse_args("""
-    qconf-convert --input-file=INPUT_FILE
+    qconf-convert --input-file=INPUT_FILE [--input-file=INPUT_FILE ...]
         [--to-uge=TARGET_UGE_VERSION]
         [--output-format=OUTPUT_FORMAT]
+        [--processes=N_PROCESSES]
 
 Description:
-    Converts Qconf object with a given JSON representation to equivalent object corresponding to the specified target UGE version. 
+    Converts Qconf objects with given JSON representations to equivalent objects corresponding to the specified target UGE version. 
+    Input may be a file, directory, glob pattern, or JSON lines stream with one object per line. In the json output format
+    each converted object is printed on a single line.
 """)
-        input_file = self.options.input_file
-        target_uge_version = self.options.target_uge_version
-        json_string = open(input_file).read()
-        qconf_object = self.api.generate_object(json_string, target_uge_version)
-        if self.options.output_format == 'json':
-            print(qconf_object.to_json())
-        else:
-            print(qconf_object.to_uge())
+        target_uge_version = self.get_target_uge_version()
+        tasks = self.iter_tasks(target_uge_version)
+        n_processes = self.options.n_processes
+        if n_processes == 1:
+            for task in tasks:
+                print(convert_object_task(task))
+            return
+        pool = multiprocessing.Pool(n_processes)
+        try:
+            for output in pool.imap(convert_object_task, tasks, CONVERSION_CHUNK_SIZE):
+                print(output)
+        finally:
+            pool.terminate()
+            pool.join()
 
 
 #############################################################################
@@ -21,8 +21,6 @@
 #
 
 import os
-import pwd
-import socket
 from uge import __version__
 
 try:
@@ -59,6 +57,7 @@ class ConfigManager(UserDict.UserDict, object):
         UGE_LOG_FILE
         UGE_CONSOLE_LOG_LEVEL
         UGE_FILE_LOG_LEVEL
+        UGE_VERSION_CACHE_FILE
 
     Usage:
         from uge.config import config_manager
@@ -98,6 +97,7 @@ class ConfigManager(UserDict.UserDict, object):
         self['defaultFileLogLevel'] = DEFAULT_UGE_FILE_LOG_LEVEL
         self['defaultLogRecordFormat'] = DEFAULT_UGE_LOG_RECORD_FORMAT
         self['defaultLogDateFormat'] = DEFAULT_UGE_LOG_DATE_FORMAT
+        self['defaultVersionCacheFile'] = None
 
         # Settings that might come from environment variables.
         self.__set_from_env_variable('root', 'UGE_ROOT')
@@ -105,14 +105,28 @@ class ConfigManager(UserDict.UserDict, object):
         self.__set_from_env_variable('configFile', 'UGE_CONFIG_FILE')
         self.__set_from_env_variable('consoleLogLevel', 'UGE_CONSOLE_LOG_LEVEL')
         self.__set_from_env_variable('fileLogLevel', 'UGE_FILE_LOG_LEVEL')
+        self.__set_from_env_variable('versionCacheFile', 'UGE_VERSION_CACHE_FILE')
 
         # Variables affected by UGE_ROOT
         self['binDir'] = os.path.join(self.get_root(), 'bin')
         self['etcDir'] = os.path.join(self.get_root(), 'etc')
 
-        # System info.
-        self['host'] = socket.getfqdn()
-        self['user'] = pwd.getpwuid(os.getuid())[0]
+        # System info ('host' and 'user' keys) is resolved on first access.
+
+    def __missing__(self, key):
+        """
+        Resolve system info on first access; getfqdn() may block on DNS,
+        so it is called only if hostname is actually needed.
+        """
+        if key == 'host':
+            import socket
+            self['host'] = socket.getfqdn()
+        elif key == 'user':
+            import pwd
+            self['user'] = pwd.getpwuid(os.getuid())[0]
+        else:
+            raise KeyError(key)
+        return self.data[key]
 
     # This function will ignore errors if environment variable is not set.
     def __set_from_env_variable(self, key, env_var):
@@ -265,6 +279,20 @@ class ConfigManager(UserDict.UserDict, object):
         """
         return self.__get_key_value('logDateFormat', default)
 
+    def set_version_cache_file(self, version_cache_file):
+        """ Set file used for persisting UGE versions and resolved settings.sh environments; None disables persistence. """
+        self['versionCacheFile'] = version_cache_file
+
+    def get_version_cache_file(self, default='__internal__'):
+        """
+        Get file used for persisting UGE versions and resolved settings.sh
+        environments. If the file has not
+        been set, the function will return the specified default value.
+        If the default value is not specified, internal (predefined)
+        default (None) will be returned.
+        """
+        return self.__get_key_value('versionCacheFile', default)
+
     def set_config_defaults(self, defaults=None):
         """ Set configuration defaults. """
         if defaults is None:
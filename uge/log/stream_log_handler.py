@@ -37,12 +37,16 @@ class StreamLogHandler(StreamHandler):
     def __init__(self, *args):
         """ Initialize log handler. """
         StreamHandler.__init__(self, *args)
-        cm = config_manager.ConfigManager.get_instance()
-        self.user = cm.get_user()
-        self.host = cm.get_host()
+        # Identity is resolved when the first record is emitted
+        self.user = None
+        self.host = None
 
     def emit(self, record):
         """ Emit the log record. """
+        if self.host is None:
+            cm = config_manager.ConfigManager.get_instance()
+            self.user = cm.get_user()
+            self.host = cm.get_host()
         record.__dict__['user'] = self.user
         record.__dict__['host'] = self.host
         return StreamHandler.emit(self, record)
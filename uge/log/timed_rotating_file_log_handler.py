@@ -39,12 +39,16 @@ class TimedRotatingFileLogHandler(TimedRotatingFileHandler):
         """ Initialize log handler. """
         TimedRotatingFileHandler.__init__(
             self, filename, when, interval, backupCount, encoding)
-        cm = config_manager.ConfigManager.get_instance()
-        self.user = cm.get_user()
-        self.host = cm.get_host()
+        # Identity is resolved when the first record is emitted
+        self.user = None
+        self.host = None
 
     def emit(self, record):
         """ Emit the log record. """
+        if self.host is None:
+            cm = config_manager.ConfigManager.get_instance()
+            self.user = cm.get_user()
+            self.host = cm.get_host()
         record.__dict__['user'] = self.user
         record.__dict__['host'] = self.host
         return TimedRotatingFileHandler.emit(self, record)
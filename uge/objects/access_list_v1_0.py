@@ -25,6 +25,8 @@ from .qconf_object import QconfObject
 class AccessList(QconfObject):
     """ This class encapsulates UGE access list object. """
 
+    __slots__ = ()
+
     #: Object version.
     VERSION = '1.0'
 
@@ -25,6 +25,8 @@ from .qconf_object import QconfObject
 class AdvanceReservation(QconfObject):
     """ This class encapsulates UGE project object. """
 
+    __slots__ = ()
+
     #: Object version.
     VERSION = '1.0'
 
@@ -19,7 +19,7 @@
 #######################################################################################
 # ___INFO__MARK_END__
 #
-import imp
+import importlib
 import json
 import re
 
@@ -30,6 +30,13 @@ from .uge_release_object_map import UGE_RELEASE_OBJECT_MAP
 
 class AdvanceReservationObjectFactory(object):
 
+    UGE_VERSION_REGEX = re.compile(r'\d+.\d+.\d+')
+
+    # Resolved object classes, keyed by (class name, object version)
+    __object_version_class_dict = {}
+    # Resolved object classes, keyed by (UGE version, class name)
+    __uge_version_class_dict = {}
+
     @classmethod
     def __get_object_base_module_name(cls, class_name):
         # This method relies on convention:
@@ -44,27 +51,37 @@ class AdvanceReservationObjectFactory(object):
 
     @classmethod
     def __get_object_class_from_uge_version(cls, uge_version, class_name, base_module_name=None):
+        object_class = cls.__uge_version_class_dict.get((uge_version, class_name))
+        if object_class is not None:
+            return object_class
         if not uge_version:
             raise InvalidRequest('Cannot generate %s object: UGE version must be specified.' % class_name)
-        uge_version = re.search(r'\d+.\d+.\d+', uge_version).group(0)
-        if uge_version not in UGE_RELEASE_OBJECT_MAP:
-            raise AdvanceReservationException('Unsupported UGE version: %s.' % uge_version)
-        release_map = UGE_RELEASE_OBJECT_MAP.get(uge_version)
+        release = cls.UGE_VERSION_REGEX.search(uge_version).group(0)
+        if release not in UGE_RELEASE_OBJECT_MAP:
+            raise AdvanceReservationException('Unsupported UGE version: %s.' % release)
+        release_map = UGE_RELEASE_OBJECT_MAP.get(release)
         object_version = release_map.get(class_name)
-        return cls.__get_object_class_from_object_version(object_version, class_name, base_module_name)
+        object_class = cls.__get_object_class_from_object_version(object_version, class_name, base_module_name)
+        cls.__uge_version_class_dict[(uge_version, class_name)] = object_class
+        return object_class
 
     @classmethod
     def __get_object_class_from_object_version(cls, object_version, class_name, base_module_name=None):
         if not object_version:
             raise InvalidRequest('Object version not supplied for class %s.' % (class_name))
 
+        object_class = cls.__object_version_class_dict.get((class_name, object_version))
+        if object_class is not None:
+            return object_class
+
         if base_module_name is None:
             base_module_name = cls.__get_object_base_module_name(class_name)
 
+        # Regular import: module is loaded (and byte-compiled) only once
         module_name = ('%s_v%s' % (base_module_name, object_version)).replace('.', '_')
-        module_file = '%s/%s.py' % ('/'.join(__file__.split('/')[:-1]), module_name)
-        module = imp.load_source('uge.objects.%s' % module_name, module_file)
+        module = importlib.import_module('uge.objects.%s' % module_name)
         object_class = getattr(module, class_name)
+        cls.__object_version_class_dict[(class_name, object_version)] = object_class
         return object_class
 
     @classmethod
@@ -103,9 +120,7 @@ class AdvanceReservationObjectFactory(object):
 # Testing.
 if __name__ == '__main__':
     print(__file__)
-    module_file = '%s/%s.py' % ('/'.join(__file__.split('/')[:-1]), 'advance_reservation_v1_0')
-    print(module_file)
-    module = imp.load_source('uge.objects.advance_reservation_v1_0', module_file)
+    module = importlib.import_module('uge.objects.advance_reservation_v1_0')
     print(module)
     print(getattr(module, 'AdvanceReservation'))
     ar = AdvanceReservationObjectFactory.generate_advance_reservation('8.6.0')
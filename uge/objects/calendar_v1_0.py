@@ -25,6 +25,8 @@ from .qconf_object import QconfObject
 class Calendar(QconfObject):
     """ This class encapsulates UGE calendar object. """
 
+    __slots__ = ()
+
     #: Object version.
     VERSION = '1.0'
 
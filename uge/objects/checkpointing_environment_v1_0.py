@@ -25,6 +25,8 @@ from .qconf_object import QconfObject
 class CheckpointingEnvironment(QconfObject):
     """ This class encapsulates UGE checkpointing environment object. """
 
+    __slots__ = ()
+
     #: Object version.
     VERSION = '1.0'
 
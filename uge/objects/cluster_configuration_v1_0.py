@@ -27,6 +27,8 @@ from .qconf_object import QconfObject
 class ClusterConfiguration(QconfObject):
     """ This class encapsulates UGE cluster configuration object. """
 
+    __slots__ = ()
+
     #: Object version.
     VERSION = '1.0'
 
@@ -25,6 +25,8 @@ from .qconf_object import QconfObject
 class ClusterQueue(QconfObject):
     """ This class encapsulates UGE cluster queue object. """
 
+    __slots__ = ()
+
     #: Object version.
     VERSION = '2.0'
 
@@ -26,6 +26,8 @@ from .qconf_object import QconfObject
 class ComplexConfigurationBase(QconfObject):
     """ This class serves as a base for UGE complex configuration objects. """
 
+    __slots__ = ()
+
     DEFAULT_DICT_DELIMITER = ' '
     DICT_KEY_MAP = {
     }
@@ -50,6 +52,14 @@ class ComplexConfigurationBase(QconfObject):
 
     OPTIONAL_KEYS_ALLOWED = True
 
+    #: Attribute property defaults used when migrating attributes that are
+    #: not part of the default configuration.
+    MIGRATED_ATTRIBUTE_DEFAULTS = {
+        'affinity': 0.0,
+        'do_report': False,
+        'is_static': False,
+    }
+
     def __init__(self, data=None, metadata=None, json_string=None):
         """ 
         Class constructor. 
@@ -68,22 +78,39 @@ class ComplexConfigurationBase(QconfObject):
 
         QconfObject.__init__(self, data=data, metadata=metadata, json_string=json_string)
 
-    def to_uge(self):
-        """ 
-        Converts object to string acceptable as input for UGE qconf command.
-
-        :returns: Object's UGE-formatted string.
+    def migrate_data(self, source_object):
+        """
+        In addition to the standard key migration, adds attribute properties
+        introduced by this object version (e.g. affinity, introduced in
+        object version 3.0) to all attributes.
         """
-        lines = ''
-        lines += '#name               shortcut   type        relop requestable consumable default  urgency aapre affinity do_report is_static\n'
-        lines += '#------------------------------------------------------------------------------------------------------\n'
+        QconfObject.migrate_data(self, source_object)
+        required_data_defaults = self.get_required_data_defaults()
+        property_keys = set()
+        for attribute_defaults in list(required_data_defaults.values()):
+            property_keys.update(attribute_defaults)
+        migrated_keys = [key for key in self.MIGRATED_ATTRIBUTE_DEFAULTS if key in property_keys]
+        for (name, attribute) in list(self.data.items()):
+            missing_keys = [key for key in migrated_keys if key not in attribute]
+            if not missing_keys:
+                continue
+            attribute_defaults = required_data_defaults.get(name, self.MIGRATED_ATTRIBUTE_DEFAULTS)
+            # Attribute dictionary may be shared with class defaults, so it is copied
+            attribute = dict(attribute)
+            for key in missing_keys:
+                attribute[key] = attribute_defaults.get(key, self.MIGRATED_ATTRIBUTE_DEFAULTS[key])
+            self.data[name] = attribute
+
+    def iter_uge_lines(self):
+        yield '#name               shortcut   type        relop requestable consumable default  urgency aapre affinity do_report is_static\n'
+        yield '#------------------------------------------------------------------------------------------------------\n'
         for (key, value_dict) in list(self.data.items()):
-            lines += '%s' % (key)
+            default_is_bool = value_dict.get('default_is_bool', False)
+            tokens = [key]
             for key2 in ['shortcut', 'type', 'relop', 'requestable', 'consumable', 'default', 'urgency', 'aapre',
                          'affinity', 'do_report', 'is_static']:
-                lines += ' %s' % (self.py_to_uge(key2, value_dict[key2], value_dict.get('default_is_bool', False)))
-            lines += '\n'
-        return lines
+                tokens.append('%s' % (self.py_to_uge(key2, value_dict[key2], default_is_bool)))
+            yield '%s\n' % ' '.join(tokens)
 
     def convert_data_to_uge_keywords(self, data):
         for (_, value_dict) in list(data.items()):
@@ -25,6 +25,8 @@ from uge.objects.complex_configuration_base import ComplexConfigurationBase
 class ComplexConfiguration(ComplexConfigurationBase):
     """ This class encapsulates UGE complex configuration object. """
 
+    __slots__ = ()
+
     #: Object version.
     VERSION = '1.0'
 
@@ -25,6 +25,8 @@ from .qconf_object import QconfObject
 class ExecutionHost(QconfObject):
     """ This class encapsulates UGE execution host object. """
 
+    __slots__ = ()
+
     #: Object version.
     VERSION = '1.0'
 
@@ -25,6 +25,8 @@ from .qconf_object import QconfObject
 class HostGroup(QconfObject):
     """ This class encapsulates UGE host group object. """
 
+    __slots__ = ()
+
     #: Object version.
     VERSION = '1.0'
 
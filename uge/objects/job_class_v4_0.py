@@ -25,6 +25,8 @@ from .qconf_object import QconfObject
 class JobClass(QconfObject):
     """ This class encapsulates UGE job class object. """
 
+    __slots__ = ()
+
     #: Object version.
     VERSION = '4.0'
 
@@ -25,6 +25,8 @@ from .qconf_object import QconfObject
 class ParallelEnvironment(QconfObject):
     """ This class encapsulates UGE parallel environment object. """
 
+    __slots__ = ()
+
     #: Object version.
     VERSION = '2.0'
 
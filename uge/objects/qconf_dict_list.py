@@ -92,17 +92,10 @@ class QconfDictList(QconfObject, UserList.UserList):
                 if not d.get(key):
                     raise InvalidRequest('Input data %s is missing required object key: %s.' % (str(d), str(key)))
 
-    def to_uge(self):
-        """ 
-        Converts object to string acceptable as input for UGE qconf command.
-
-        :returns: Object's UGE-formatted string.
-        """
-        lines = ''
+    def iter_uge_lines(self):
         for d in self.data:
             for (key, value) in list(d.items()):
-                lines += '%s%s%s\n' % (key, self.KEY_VALUE_DELIMITER, self.py_to_uge(key, value))
-        return lines
+                yield '%s%s%s\n' % (key, self.KEY_VALUE_DELIMITER, self.py_to_uge(key, value))
 
     def convert_data_to_uge_keywords(self, data):
         for d in data:
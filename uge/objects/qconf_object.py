@@ -21,10 +21,16 @@
 #
 import copy
 import datetime
+import hashlib
 import json
 import os
 import tempfile
 
+try:
+    from sys import intern
+except ImportError:
+    pass
+
 from uge.config.config_manager import ConfigManager
 from uge.exceptions.invalid_argument import InvalidArgument
 from uge.exceptions.invalid_request import InvalidRequest
@@ -33,6 +39,9 @@ from uge.exceptions.invalid_request import InvalidRequest
 class QconfObject(object):
     """ This class encapsulates data and functionality common to all Qconf API objects. """
 
+    # Objects have no per-instance dictionary; subclasses declare empty slots
+    __slots__ = ('name', 'data', '_metadata')
+
     VERSION = '1.0'
     NAME_KEY = None
     UGE_PYTHON_OBJECT_MAP = {
@@ -53,6 +62,7 @@ class QconfObject(object):
     DEFAULT_DICT_DELIMITER = ','
     DICT_VALUE_DELIMITER = '='
     OPTIONAL_KEYS_ALLOWED = False
+    RENAMED_KEY_MAP = {}
 
     def __init__(self, name=None, data=None, metadata=None, json_string=None):
         """ 
@@ -73,7 +83,7 @@ class QconfObject(object):
         :raises: **InvalidArgument** - in case metadata is not a dictionary, JSON string is not valid, or it does not contain dictionary representing a Qconf object.
         """
         self.name = name
-        self.metadata = {}
+        self._metadata = None
         if not hasattr(self, 'data'):
             self.data = {}
 
@@ -83,7 +93,7 @@ class QconfObject(object):
             if 'data' in json_dict:
                 self.data = json_dict.get('data')
                 del json_dict['data']
-            self.metadata = json_dict
+            self._metadata = json_dict
 
         # Merge json entries with provided metadata
         if metadata:
@@ -105,9 +115,21 @@ class QconfObject(object):
         self.convert_list_keys()
         self.convert_dict_keys()
 
-        # Add standard metadata
-        self.metadata['object_version'] = self.VERSION
-        self.metadata['object_class'] = self.__class__.__name__
+        # Add standard metadata; default metadata is created on first access
+        if self._metadata is not None:
+            self._metadata['object_version'] = self.VERSION
+            self._metadata['object_class'] = self.__class__.__name__
+
+    @property
+    def metadata(self):
+        """ Object metadata dictionary (object class and version, creation user and time, etc.). """
+        if self._metadata is None:
+            self._metadata = {'object_version': self.VERSION, 'object_class': self.__class__.__name__}
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, metadata):
+        self._metadata = metadata
 
     def unpack_input_json(self, json_string):
         if not json_string:
@@ -185,6 +207,61 @@ class QconfObject(object):
     def get_required_data_defaults(self):
         return self.REQUIRED_DATA_DEFAULTS
 
+    @classmethod
+    def get_version_tuple(cls, version=None):
+        """
+        :param version: Object version (default: class version).
+        :type version: str
+
+        :returns: Object version as a tuple of integers, suitable for comparison.
+        """
+        return tuple([int(token) for token in (version or cls.VERSION).split('.')])
+
+    def migrate_data(self, source_object):
+        """
+        Takes over data of an adjacent (previous or next) version of this
+        object, and maps it in place to this object version: renamed keys
+        are moved, and keys not used by this version are dropped. Defaults for
+        keys introduced by this version are added by
+        update_with_required_data_defaults().
+
+        :param source_object: Object of the adjacent version.
+        :type source_object: QconfObject
+        """
+        data = source_object.data
+        if type(data) == dict:
+            if source_object.get_version_tuple() < self.get_version_tuple():
+                renamed_key_map = self.RENAMED_KEY_MAP
+            else:
+                renamed_key_map = dict([(new_key, old_key) for (old_key, new_key) in
+                                        list(source_object.RENAMED_KEY_MAP.items())])
+            for (old_key, new_key) in list(renamed_key_map.items()):
+                if old_key in data and new_key not in data:
+                    data[new_key] = data.pop(old_key)
+            if not self.OPTIONAL_KEYS_ALLOWED:
+                required_data_defaults = self.get_required_data_defaults()
+                for key in source_object.get_required_data_defaults():
+                    if key not in required_data_defaults and key not in self.USER_PROVIDED_KEYS:
+                        data.pop(key, None)
+        self.data = data
+
+    def get_fingerprint(self, ignored_key_list=None):
+        """
+        Computes canonical fingerprint of object's data. Fingerprint does not
+        depend on the order of dictionary keys, and does not include object
+        metadata, so that equal data always results in equal fingerprints.
+
+        :param ignored_key_list: Keys excluded from fingerprint (e.g., frequently changing load values).
+        :type ignored_key_list: list
+
+        :returns: Fingerprint string.
+        """
+        data = self.data
+        if ignored_key_list and type(data) == dict:
+            data = dict([(key, value) for (key, value) in list(data.items()) if key not in ignored_key_list])
+        data_string = json.dumps(data, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha1(data_string.encode('utf-8')).hexdigest()
+
     def convert_list_keys(self):
         for key in list(self.LIST_KEY_MAP.keys()):
             value = self.data.get(key)
@@ -205,7 +282,7 @@ class QconfObject(object):
                 raise InvalidArgument(
                     'Cannot parse dictionary value: Unexpected format of item %s for key %s.' % (item, key))
             item_tokens = item.split(self.DICT_VALUE_DELIMITER)
-            item_key = item_tokens[0]
+            item_key = intern(item_tokens[0])
             item_value = self.DICT_VALUE_DELIMITER.join(item_tokens[1:])
             value_dict[item_key] = self.uge_to_py(item_key, item_value)
         return value_dict
@@ -272,54 +349,118 @@ class QconfObject(object):
                 list_key_map[key] = value
         return list_key_map
 
-    def uge_to_py(self, key, value):
-        uppercase_value = value.upper()
-        for (uge_value, py_value) in list(self.UGE_PYTHON_OBJECT_MAP.items()):
-            if uge_value == uppercase_value:
-                return py_value
-        if key in self.LIST_KEY_MAP:
-            # Key is designated as list key.
-            # Try to split by corresponding delimiter.
-            delimiter = self.LIST_KEY_MAP.get(key)
-            if value.find(delimiter) > 0:
-                return value.split(delimiter)
-            return [value]
-        elif key in self.DICT_KEY_MAP:
+    @classmethod
+    def compile_converters(cls):
+        """
+        Compiles class key maps into per-key converter table.
+
+        Each converter is a pair of (parse, format) functions, invoked as
+        function(qconf_object, key, value). Converters are compiled once per
+        class, the first time an object value is converted.
+        """
+        def parse_list(delimiter):
+            def parse(qconf_object, key, value):
+                # Key is designated as list key.
+                # Try to split by corresponding delimiter.
+                if value.find(delimiter) > 0:
+                    # Names (hosts, users, etc.) repeat across objects
+                    return [intern(item) for item in value.split(delimiter)]
+                return [intern(value)]
+            return parse
+
+        def parse_dict_value(qconf_object, key, value):
             # Key is designated as dict key.
             # Try to split by corresponding delimiter.
-            return self.parse_value_as_dict(key, value)
-        elif key in self.INT_KEY_MAP:
-            try:
-                return int(value)
-            except:
-                # We cannot convert this string to int
-                pass
-        elif key in self.FLOAT_KEY_MAP:
-            try:
-                return float(value)
-            except:
-                # We cannot convert this string to float
-                pass
-        elif value.find(self.DEFAULT_LIST_DELIMITER) > 0:
-            return value.split(self.DEFAULT_LIST_DELIMITER)
-        return value
+            return qconf_object.parse_value_as_dict(key, value)
+
+        def parse_number(number_type):
+            def parse(qconf_object, key, value):
+                try:
+                    return number_type(value)
+                except:
+                    # We cannot convert this string to number
+                    return value
+            return parse
+
+        def parse_default(qconf_object, key, value):
+            if value.find(default_list_delimiter) > 0:
+                return value.split(default_list_delimiter)
+            return value
+
+        def format_value(list_delimiter, dict_delimiter):
+            def format(qconf_object, key, value):
+                value_type = type(value)
+                if value_type == list:
+                    return list_delimiter.join(value)
+                elif value_type == dict:
+                    dict_tokens = []
+                    for (item_key, item_value) in list(value.items()):
+                        dict_tokens.append('%s%s%s' % (item_key, qconf_object.DICT_VALUE_DELIMITER, item_value))
+                    return dict_delimiter.join(dict_tokens)
+                return value
+            return format
+
+        default_list_delimiter = cls.DEFAULT_LIST_DELIMITER
+        default_format = format_value(cls.DEFAULT_LIST_DELIMITER, cls.DEFAULT_DICT_DELIMITER)
+        parse_dict = {}
+        # Lower priority maps first, so that higher priority maps override them
+        for key in cls.FLOAT_KEY_MAP:
+            parse_dict[key] = parse_number(float)
+        for key in cls.INT_KEY_MAP:
+            parse_dict[key] = parse_number(int)
+        for key in cls.DICT_KEY_MAP:
+            parse_dict[key] = parse_dict_value
+        for (key, delimiter) in list(cls.LIST_KEY_MAP.items()):
+            parse_dict[key] = parse_list(delimiter)
+        converter_dict = {}
+        for (key, parse) in list(parse_dict.items()):
+            if key in cls.LIST_KEY_MAP or key in cls.DICT_KEY_MAP:
+                converter_dict[key] = (parse, format_value(cls.LIST_KEY_MAP.get(key, cls.DEFAULT_LIST_DELIMITER),
+                                                           cls.DICT_KEY_MAP.get(key, cls.DEFAULT_DICT_DELIMITER)))
+            else:
+                converter_dict[key] = (parse, default_format)
+        cls._default_converter = (parse_default, default_format)
+
+        # UGE keywords, keyed by python value type and value
+        cls._py_uge_keyword_dict = {}
+        for (uge_value, py_value) in list(cls.UGE_PYTHON_OBJECT_MAP.items()):
+            cls._py_uge_keyword_dict[(type(py_value), py_value)] = uge_value
+        cls._py_keyword_types = set([py_type for (py_type, _) in cls._py_uge_keyword_dict])
+
+        # Parsed values equal to immutable defaults share default value objects
+        cls._shared_value_dict = {}
+        for (key, value) in list(cls.REQUIRED_DATA_DEFAULTS.items()):
+            if type(value) in (str, int, float, bool):
+                cls._shared_value_dict[key] = value
+        cls._converter_dict = converter_dict
+
+    def get_converter(self, key):
+        if '_converter_dict' not in self.__class__.__dict__:
+            self.compile_converters()
+        return self._converter_dict.get(key, self._default_converter)
+
+    def uge_to_py(self, key, value):
+        uppercase_value = value.upper()
+        if uppercase_value in self.UGE_PYTHON_OBJECT_MAP:
+            return self.UGE_PYTHON_OBJECT_MAP[uppercase_value]
+        py_value = self.get_converter(key)[0](self, key, value)
+        shared_value = self._shared_value_dict.get(key)
+        if shared_value is not None and py_value == shared_value and type(py_value) == type(shared_value):
+            return shared_value
+        return py_value
 
     def py_to_uge(self, key, value):
-        for (uge_value, py_value) in list(self.UGE_PYTHON_OBJECT_MAP.items()):
-            if value == py_value and type(value) == type(py_value):
+        converter = self.get_converter(key)
+        value_type = type(value)
+        if value_type in self._py_keyword_types:
+            uge_value = self._py_uge_keyword_dict.get((value_type, value))
+            if uge_value is not None:
                 if key in self.UGE_CASE_SENSITIVE_KEYS:
                     return self.UGE_CASE_SENSITIVE_KEYS[key](uge_value)
                 return uge_value
-        if type(value) == list:
-            delimiter = self.LIST_KEY_MAP.get(key, self.DEFAULT_LIST_DELIMITER)
-            return delimiter.join(value)
-        elif type(value) == dict:
-            delimiter = self.DICT_KEY_MAP.get(key, self.DEFAULT_DICT_DELIMITER)
-            dict_tokens = []
-            for (item_key, item_value) in list(value.items()):
-                dict_tokens.append('%s%s%s' % (item_key, self.DICT_VALUE_DELIMITER, item_value))
-            return delimiter.join(dict_tokens)
-        return value
+        elif value_type == str:
+            return value
+        return converter[1](self, key, value)
 
     def to_uge(self):
         """ 
@@ -327,10 +468,21 @@ class QconfObject(object):
 
         :returns: Object's UGE-formatted string.
         """
-        lines = ''
+        return ''.join(self.iter_uge_lines())
+
+    def write_uge(self, writer):
+        """
+        Writes object in the format acceptable as input for UGE qconf command.
+
+        :param writer: File-like object (e.g., open file).
+        :type writer: object with write() method
+        """
+        for line in self.iter_uge_lines():
+            writer.write(line)
+
+    def iter_uge_lines(self):
         for (key, value) in list(self.data.items()):
-            lines += '%s %s\n' % (key, self.py_to_uge(key, value))
-        return lines
+            yield '%s %s\n' % (key, self.py_to_uge(key, value))
 
     def convert_data_to_uge_keywords(self, data):
         for (key, value) in list(data.items()):
@@ -359,7 +511,7 @@ class QconfObject(object):
             if not line:
                 continue
             key_value = line.split(' ')
-            key = key_value[0]
+            key = intern(key_value[0])
             value = line.replace(key, '', 1).strip()
             object_data[key] = self.uge_to_py(key, value)
         return object_data
@@ -369,7 +521,7 @@ class QconfObject(object):
         Sets default object metadata (user/timestamp) for API get operations.
         """
         cm = ConfigManager.get_instance()
-        retrieved_by = '%s@%s' % (cm['user'], cm['host'])
+        retrieved_by = '%s@%s' % (cm.get_user(), cm.get_host())
         self.metadata['retrieved_by'] = retrieved_by
         self.metadata['retrieved_on'] = datetime.datetime.now().isoformat()
 
@@ -378,7 +530,7 @@ class QconfObject(object):
         Sets default object metadata (user/timestamp) for API modify operations.
         """
         cm = ConfigManager.get_instance()
-        modified_by = '%s@%s' % (cm['user'], cm['host'])
+        modified_by = '%s@%s' % (cm.get_user(), cm.get_host())
         self.metadata['modified_by'] = modified_by
         self.metadata['modified_on'] = datetime.datetime.now().isoformat()
 
@@ -387,6 +539,6 @@ class QconfObject(object):
         Sets default object metadata (user/timestamp) for API add operations.
         """
         cm = ConfigManager.get_instance()
-        created_by = '%s@%s' % (cm['user'], cm['host'])
+        created_by = '%s@%s' % (cm.get_user(), cm.get_host())
         self.metadata['created_by'] = created_by
         self.metadata['created_on'] = datetime.datetime.now().isoformat()
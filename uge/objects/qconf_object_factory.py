@@ -19,16 +19,27 @@
 #######################################################################################
 # ___INFO__MARK_END__
 #
-import imp
+import importlib
 import json
 import re
 from uge.exceptions.qconf_exception import QconfException
 from uge.exceptions.invalid_request import InvalidRequest
+from uge.exceptions.invalid_argument import InvalidArgument
+from .qconf_object import QconfObject
 from .uge_release_object_map import UGE_RELEASE_OBJECT_MAP
 
 
 class QconfObjectFactory(object):
 
+    UGE_VERSION_REGEX = re.compile(r'\d+.\d+.\d+')
+
+    # Resolved object classes, keyed by (class name, object version)
+    __object_version_class_dict = {}
+    # Resolved object classes, keyed by (UGE version, class name)
+    __uge_version_class_dict = {}
+    # Object classes to migrate through, keyed by (class name, source version, target version)
+    __migration_path_dict = {}
+
     @classmethod
     def __get_object_base_module_name(cls, class_name):
         # This method relies on convention:
@@ -43,27 +54,37 @@ class QconfObjectFactory(object):
 
     @classmethod
     def __get_object_class_from_uge_version(cls, uge_version, class_name, base_module_name=None):
+        object_class = cls.__uge_version_class_dict.get((uge_version, class_name))
+        if object_class is not None:
+            return object_class
         if not uge_version:
             raise InvalidRequest('Cannot generate %s object: UGE version must be specified.' % class_name)
-        uge_version = re.search(r'\d+.\d+.\d+', uge_version).group(0)
-        if uge_version not in UGE_RELEASE_OBJECT_MAP:
-            raise QconfException('Unsupported UGE version: %s.' % uge_version)
-        release_map = UGE_RELEASE_OBJECT_MAP.get(uge_version)
+        release = cls.UGE_VERSION_REGEX.search(uge_version).group(0)
+        if release not in UGE_RELEASE_OBJECT_MAP:
+            raise QconfException('Unsupported UGE version: %s.' % release)
+        release_map = UGE_RELEASE_OBJECT_MAP.get(release)
         object_version = release_map.get(class_name)
-        return cls.__get_object_class_from_object_version(object_version, class_name, base_module_name)
+        object_class = cls.__get_object_class_from_object_version(object_version, class_name, base_module_name)
+        cls.__uge_version_class_dict[(uge_version, class_name)] = object_class
+        return object_class
 
     @classmethod
     def __get_object_class_from_object_version(cls, object_version, class_name, base_module_name=None):
         if not object_version:
             raise InvalidRequest('Object version not supplied for class %s.' % (class_name))
 
+        object_class = cls.__object_version_class_dict.get((class_name, object_version))
+        if object_class is not None:
+            return object_class
+
         if base_module_name is None:
             base_module_name = cls.__get_object_base_module_name(class_name)
 
+        # Regular import: module is loaded (and byte-compiled) only once
         module_name = ('%s_v%s' % (base_module_name, object_version)).replace('.', '_')
-        module_file = '%s/%s.py' % ('/'.join(__file__.split('/')[:-1]), module_name)
-        module = imp.load_source('uge.objects.%s' % module_name, module_file)
+        module = importlib.import_module('uge.objects.%s' % module_name)
         object_class = getattr(module, class_name)
+        cls.__object_version_class_dict[(class_name, object_version)] = object_class
         return object_class
 
     @classmethod
@@ -74,19 +95,100 @@ class QconfObjectFactory(object):
         return generated_object
 
     @classmethod
-    def generate_object(cls, json_string, target_uge_version=None):
-        object_dict = json.loads(json_string)
+    def __get_migration_path(cls, class_name, source_version, target_version):
+        key = (class_name, source_version, target_version)
+        migration_path = cls.__migration_path_dict.get(key)
+        if migration_path is not None:
+            return migration_path
+        version_set = set([source_version, target_version])
+        for release_map in list(UGE_RELEASE_OBJECT_MAP.values()):
+            if class_name in release_map:
+                version_set.add(release_map[class_name])
+        version_list = sorted(version_set, key=QconfObject.get_version_tuple)
+        source_index = version_list.index(source_version)
+        target_index = version_list.index(target_version)
+        if source_index <= target_index:
+            version_list = version_list[source_index + 1:target_index + 1]
+        else:
+            version_list = list(reversed(version_list[target_index:source_index]))
+        migration_path = [cls.__get_object_class_from_object_version(v, class_name) for v in version_list]
+        cls.__migration_path_dict[key] = migration_path
+        return migration_path
+
+    @classmethod
+    def migrate_object(cls, qconf_object, target_uge_version):
+        """
+        Migrates object to the object version used by the target UGE version.
+        Object data is mapped in place through all intermediate object versions,
+        without serializing it, and is shared with the returned object.
+
+        :param qconf_object: Object to migrate.
+        :type qconf_object: QconfObject
+
+        :param target_uge_version: Target UGE version.
+        :type target_uge_version: str
+
+        :returns: Object of the class corresponding to the target UGE version.
+        """
+        class_name = qconf_object.__class__.__name__
+        target_class = cls.__get_object_class_from_uge_version(target_uge_version, class_name)
+        for object_class in cls.__get_migration_path(class_name, qconf_object.VERSION, target_class.VERSION):
+            migrated_object = object_class(metadata=qconf_object.metadata)
+            migrated_object.name = qconf_object.name
+            migrated_object.migrate_data(qconf_object)
+            qconf_object = migrated_object
+        qconf_object.update_with_required_data_defaults()
+        return qconf_object
+
+    @classmethod
+    def migrate_objects(cls, object_iterable, target_uge_version):
+        """
+        Migrates stream of objects (e.g. cluster snapshot) to object versions
+        used by the target UGE version.
+
+        :param object_iterable: Objects to migrate; each item may be an object, its JSON string, or dictionary with object's JSON structure.
+        :type object_iterable: iterable
+
+        :param target_uge_version: Target UGE version.
+        :type target_uge_version: str
+
+        :returns: Generator of migrated objects.
+        """
+        for item in object_iterable:
+            if isinstance(item, dict):
+                item = cls.generate_object_from_dict(item)
+            elif not isinstance(item, QconfObject):
+                item = cls.generate_object(item)
+            yield cls.migrate_object(item, target_uge_version)
+
+    @classmethod
+    def generate_object_from_dict(cls, object_dict, target_uge_version=None, add_required_data=True):
+        """
+        Generates object from dictionary with object's JSON structure; the
+        dictionary is consumed in the process. Unless add_required_data is
+        False, missing required keys are set to their default values.
+        """
         class_name = object_dict['object_class']
         object_version = object_dict['object_version']
         object_class = cls.__get_object_class_from_object_version(object_version, class_name)
-        generated_object = object_class(json_string=json_string)
-        generated_object.update_with_required_data_defaults()
-        if target_uge_version:
-            object_class = cls.__get_object_class_from_uge_version(target_uge_version, class_name)
-            generated_object = object_class(json_string=generated_object.to_json())
+        data = object_dict.pop('data', None)
+        generated_object = object_class(data=data, metadata=object_dict)
+        if add_required_data:
             generated_object.update_with_required_data_defaults()
+        if target_uge_version:
+            generated_object = cls.migrate_object(generated_object, target_uge_version)
         return generated_object
 
+    @classmethod
+    def generate_object(cls, json_string, target_uge_version=None):
+        try:
+            object_dict = json.loads(json_string)
+        except Exception as ex:
+            raise InvalidArgument('Input is not a valid json string: %s (error: %s).' % (str(json_string), ex))
+        if type(object_dict) != dict:
+            raise InvalidArgument('Input json string does not contain dictionary: %s.' % str(json_string))
+        return cls.generate_object_from_dict(object_dict, target_uge_version)
+
     @classmethod
     def generate_cluster_queue(cls, uge_version, name=None, data=None, metadata=None, json_string=None,
                                add_required_data=True):
@@ -221,9 +323,7 @@ class QconfObjectFactory(object):
 # Testing.
 if __name__ == '__main__':
     print(__file__)
-    module_file = '%s/%s.py' % ('/'.join(__file__.split('/')[:-1]), 'share_tree_v1_0')
-    print(module_file)
-    module = imp.load_source('uge.objects.share_tree_v1_0', module_file)
+    module = importlib.import_module('uge.objects.share_tree_v1_0')
     print(module)
     print(getattr(module, 'ShareTree'))
     sconf = QconfObjectFactory.generate_share_tree('8.4.0')
@@ -25,6 +25,8 @@ from .qconf_object import QconfObject
 class ResourceQuotaSet(QconfObject):
     """ This class encapsulates UGE resource quota set object. """
 
+    __slots__ = ()
+
     #: Object version.
     VERSION = '1.0'
 
@@ -67,21 +69,15 @@ class ResourceQuotaSet(QconfObject):
         """
         QconfObject.__init__(self, name=name, data=data, metadata=metadata, json_string=json_string)
 
-    def to_uge(self):
-        """ 
-        Converts object to string acceptable as input for UGE qconf command.
-
-        :returns: Object's UGE-formatted string.
-        """
-        lines = '{\n'
+    def iter_uge_lines(self):
+        yield '{\n'
         for key in ['name', 'description', 'enabled']:
             value = self.data.get(key)
-            lines += '%s %s\n' % (key, self.py_to_uge(key, value))
+            yield '%s %s\n' % (key, self.py_to_uge(key, value))
         limits = self.data.get('limit')
         for limit in limits:
-            lines += 'limit %s\n' % limit
-        lines += '}\n'
-        return lines
+            yield 'limit %s\n' % limit
+        yield '}\n'
 
     def py_to_uge(self, key, value):
         for (uge_value, py_value) in list(self.UGE_PYTHON_OBJECT_MAP.items()):
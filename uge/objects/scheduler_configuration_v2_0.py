@@ -25,6 +25,8 @@ from uge.objects.qconf_object import QconfObject
 class SchedulerConfiguration(QconfObject):
     """ This class encapsulates UGE scheduler configuration object. """
 
+    __slots__ = ()
+
     #: Object version.
     VERSION = '2.0'
 
@@ -102,6 +104,11 @@ class SchedulerConfiguration(QconfObject):
         'schedd_job_info': str.lower,
     }
 
+    #: Keys renamed since the previous object version.
+    RENAMED_KEY_MAP = {
+        'load_formula': 'host_sort_formula',
+    }
+
     def __init__(self, data=None, metadata=None, json_string=None):
         """ 
         Class constructor. 
@@ -25,6 +25,8 @@ from uge.objects.qconf_object import QconfObject
 class SchedulerConfiguration(QconfObject):
     """ This class encapsulates UGE scheduler configuration object. """
 
+    __slots__ = ()
+
     #: Object version.
     VERSION = '3.0'
 
@@ -70,18 +70,11 @@ class ShareTree(QconfDictList):
         """
         QconfDictList.__init__(self, data=data, metadata=metadata, json_string=json_string)
 
-    def to_uge(self):
-        """ 
-        Converts object to string acceptable as input for UGE qconf command.
-
-        :returns: Object's UGE-formatted string.
-        """
-        lines = ''
+    def iter_uge_lines(self):
         for d in self.data:
             for key in ['id', 'name', 'type', 'shares', 'childnodes']:
                 value = d.get(key)
-                lines += '%s%s%s\n' % (key, self.KEY_VALUE_DELIMITER, self.py_to_uge(key, value))
-        return lines
+                yield '%s%s%s\n' % (key, self.KEY_VALUE_DELIMITER, self.py_to_uge(key, value))
 
 
 #############################################################################
@@ -25,6 +25,8 @@ from .qconf_object import QconfObject
 class User(QconfObject):
     """ This class encapsulates UGE user object. """
 
+    __slots__ = ()
+
     #: Object version.
     VERSION = '1.0'
 
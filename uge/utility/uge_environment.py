@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+#
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+#
+import os
+import shlex
+import threading
+
+from uge.log.log_manager import LogManager
+from uge.utility.uge_subprocess import UgeSubprocess
+from uge.exceptions.command_failed import CommandFailed
+from uge.exceptions.configuration_error import ConfigurationError
+
+
+class UgeEnvironment(object):
+    """
+    Resolves the environment established by UGE settings.sh file.
+
+    The settings file is sourced only once per (SGE_ROOT, SGE_CELL) pair;
+    the resulting variables (PATH, LD_LIBRARY_PATH, ARCH, etc.) and the
+    locations of UGE commands are cached and shared by all executors, so
+    that UGE commands can be run directly, without a shell. If version
+    cache file is configured (see UgeVersionCache), resolved variables are
+    also persisted across processes, keyed by identity of the settings file.
+
+    Usage:
+        env = UgeEnvironment.get_command_env({'SGE_ROOT': '/opt/uge', 'SGE_CELL': 'default'})
+        argv = UgeEnvironment.get_command_argv('/opt/uge', 'default', 'qconf', '-sq all.q')
+    """
+
+    # Shell bookkeeping variables that are not part of UGE environment
+    IGNORED_VARIABLES = ['PWD', 'OLDPWD', 'SHLVL', '_']
+
+    __resolved_env_dict = {}
+    __command_path_dict = {}
+    __lock = threading.Lock()
+
+    @classmethod
+    def get_settings_file(cls, sge_root, sge_cell):
+        return '%s/%s/common/settings.sh' % (sge_root, sge_cell)
+
+    @classmethod
+    def resolve(cls, sge_root, sge_cell):
+        """
+        Source settings.sh for a given cell (once) and return variables it defines.
+
+        :returns: Dictionary of environment variables set by settings.sh.
+
+        :raises ConfigurationError: in case settings file cannot be sourced.
+        """
+        key = (sge_root, sge_cell)
+        with cls.__lock:
+            resolved_env = cls.__resolved_env_dict.get(key)
+            if resolved_env is None:
+                resolved_env = cls.__get_persisted_env(sge_root, sge_cell)
+                cls.__resolved_env_dict[key] = resolved_env
+        return resolved_env
+
+    @classmethod
+    def get_persistence_key(cls, sge_root, sge_cell):
+        """
+        :returns: Key for persisting environment resolved from settings file, or None if settings file does not exist.
+        """
+        try:
+            settings_stat = os.stat(cls.get_settings_file(sge_root, sge_cell))
+        except OSError:
+            return None
+        return 'settings|%s|%s|%s|%s' % (sge_root, sge_cell, settings_stat.st_mtime, settings_stat.st_ino)
+
+    @classmethod
+    def __get_persisted_env(cls, sge_root, sge_cell):
+        # Imported here, as version cache itself relies on resolved environment
+        from uge.utility.uge_version_cache import UgeVersionCache
+        persistence_key = cls.get_persistence_key(sge_root, sge_cell)
+        if persistence_key is not None:
+            resolved_env = UgeVersionCache.get_persisted_value(persistence_key)
+            if type(resolved_env) == dict:
+                return resolved_env
+        resolved_env = cls.__source_settings_file(sge_root, sge_cell)
+        if persistence_key is not None:
+            UgeVersionCache.persist_value(persistence_key, resolved_env)
+        return resolved_env
+
+    @classmethod
+    def __source_settings_file(cls, sge_root, sge_cell):
+        logger = LogManager.get_instance().get_logger(cls.__name__)
+        settings_file = cls.get_settings_file(sge_root, sge_cell)
+        logger.debug('Resolving environment from %s' % settings_file)
+        command = '. %s >/dev/null 2>&1 && env' % settings_file
+        try:
+            p = UgeSubprocess(command, env={'SGE_ROOT': sge_root, 'SGE_CELL': sge_cell})
+            p.run()
+        except CommandFailed as ex:
+            raise ConfigurationError('Cannot source UGE settings file %s.' % settings_file, exception=ex)
+        resolved_env = {}
+        for line in p.get_stdout().split('\n'):
+            if line.find('=') <= 0:
+                continue
+            (name, value) = line.split('=', 1)
+            if name in cls.IGNORED_VARIABLES:
+                continue
+            resolved_env[name] = value
+        logger.debug('Resolved environment: %s' % resolved_env)
+        return resolved_env
+
+    @classmethod
+    def get_command_env(cls, env_dict):
+        """
+        :param env_dict: Base environment; must contain SGE_ROOT and SGE_CELL.
+        :type env_dict: dict
+
+        :returns: Copy of the base environment, updated with variables set by settings.sh.
+        """
+        command_env = dict(env_dict)
+        command_env.update(cls.resolve(env_dict['SGE_ROOT'], env_dict['SGE_CELL']))
+        return command_env
+
+    @classmethod
+    def get_command_path(cls, sge_root, sge_cell, command):
+        """
+        :returns: Full path of a UGE command, looked up in the PATH set by settings.sh.
+
+        :raises ConfigurationError: in case command cannot be found.
+        """
+        key = (sge_root, sge_cell, command)
+        command_path = cls.__command_path_dict.get(key)
+        if command_path is None:
+            path = cls.resolve(sge_root, sge_cell).get('PATH', '')
+            for dir_name in path.split(os.pathsep):
+                candidate = os.path.join(dir_name or '.', command)
+                if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+                    command_path = os.path.abspath(candidate)
+                    break
+            else:
+                raise ConfigurationError('Cannot find %s command in PATH: %s' % (command, path))
+            with cls.__lock:
+                cls.__command_path_dict[key] = command_path
+        return command_path
+
+    @classmethod
+    def split_args(cls, args):
+        """
+        :param args: Command arguments, either as a list, or as a string using shell quoting rules.
+        :type args: list or str
+
+        :returns: List of command arguments.
+        """
+        if isinstance(args, (list, tuple)):
+            return list(args)
+        return shlex.split(args)
+
+    @classmethod
+    def get_command_argv(cls, sge_root, sge_cell, command, args):
+        """
+        :returns: Command argument vector suitable for running command without a shell.
+        """
+        return [cls.get_command_path(sge_root, sge_cell, command)] + cls.split_args(args)
+
+    @classmethod
+    def clear_cache(cls):
+        """ Forget all resolved environments, e.g. after settings.sh was changed. """
+        with cls.__lock:
+            cls.__resolved_env_dict.clear()
+            cls.__command_path_dict.clear()
+
+
+#############################################################################
+# Testing.
+if __name__ == '__main__':
+    sge_root = os.environ['SGE_ROOT']
+    sge_cell = os.environ.get('SGE_CELL', 'default')
+    print(UgeEnvironment.resolve(sge_root, sge_cell))
+    print(UgeEnvironment.get_command_argv(sge_root, sge_cell, 'qconf', '-sq all.q'))
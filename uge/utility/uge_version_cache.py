@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+#
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+#
+import json
+import os
+import tempfile
+import threading
+
+from uge.log.log_manager import LogManager
+from uge.config.config_manager import ConfigManager
+from uge.utility.uge_environment import UgeEnvironment
+
+
+class UgeVersionCache(object):
+    """
+    Caches UGE versions determined from '<command> -help' output.
+
+    Versions are keyed by SGE_ROOT, SGE_CELL and identity (path, mtime
+    and inode) of the probed command, so that an upgraded binary is probed
+    again. Cached versions are shared by all executors in a process and,
+    if version cache file is configured (see
+    ConfigManager.set_version_cache_file(), or environment variable
+    UGE_VERSION_CACHE_FILE), persisted across processes. The same file
+    also stores environments resolved from settings.sh (see UgeEnvironment),
+    so that a new process needs no subprocess to construct an executor.
+
+    Usage:
+        version = UgeVersionCache.get_uge_version('/opt/uge', 'default', 'qconf', probe_function)
+    """
+
+    __version_dict = {}
+    __lock = threading.Lock()
+
+    @classmethod
+    def get_key(cls, sge_root, sge_cell, command):
+        """
+        :returns: Cache key for a given command, or None if command identity cannot be determined.
+        """
+        command_path = UgeEnvironment.get_command_path(sge_root, sge_cell, command)
+        try:
+            command_stat = os.stat(command_path)
+        except OSError:
+            return None
+        return '%s|%s|%s|%s|%s' % (sge_root, sge_cell, command_path, command_stat.st_mtime, command_stat.st_ino)
+
+    @classmethod
+    def get_uge_version(cls, sge_root, sge_cell, command, probe):
+        """
+        :param probe: Function that runs the command and returns UGE version; invoked only on cache miss.
+        :type probe: callable
+
+        :returns: UGE version string.
+        """
+        key = cls.get_key(sge_root, sge_cell, command)
+        if key is None:
+            return probe()
+        uge_version = cls.__version_dict.get(key)
+        if uge_version is not None:
+            return uge_version
+        uge_version = cls.get_persisted_value(key)
+        if uge_version is None:
+            uge_version = probe()
+            cls.persist_value(key, uge_version)
+        with cls.__lock:
+            cls.__version_dict[key] = uge_version
+        return uge_version
+
+    @classmethod
+    def get_persisted_value(cls, key):
+        """
+        :returns: Value stored in version cache file under a given key, or None if value is not stored, or version cache file is not configured.
+        """
+        version_cache_file = ConfigManager.get_instance().get_version_cache_file()
+        if not version_cache_file:
+            return None
+        return cls.__read_cache_file(version_cache_file).get(key)
+
+    @classmethod
+    def persist_value(cls, key, value):
+        """ Store JSON-serializable value in version cache file, if one is configured. """
+        version_cache_file = ConfigManager.get_instance().get_version_cache_file()
+        if version_cache_file:
+            cls.__update_cache_file(version_cache_file, key, value)
+
+    @classmethod
+    def __read_cache_file(cls, version_cache_file):
+        if not os.path.exists(version_cache_file):
+            return {}
+        try:
+            with open(version_cache_file) as f:
+                version_dict = json.load(f)
+            if type(version_dict) == dict:
+                return version_dict
+        except Exception as ex:
+            cls.__get_logger().warning('Ignoring invalid version cache file %s: %s' % (version_cache_file, ex))
+        return {}
+
+    @classmethod
+    def __update_cache_file(cls, version_cache_file, key, value):
+        # Merge with entries written by other processes, and replace file atomically
+        try:
+            version_dict = cls.__read_cache_file(version_cache_file)
+            version_dict[key] = value
+            fd, tmp_file_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(version_cache_file)))
+            with os.fdopen(fd, 'w') as f:
+                json.dump(version_dict, f)
+            os.rename(tmp_file_path, version_cache_file)
+        except Exception as ex:
+            cls.__get_logger().warning('Cannot update version cache file %s: %s' % (version_cache_file, ex))
+
+    @classmethod
+    def __get_logger(cls):
+        return LogManager.get_instance().get_logger(cls.__name__)
+
+    @classmethod
+    def clear_cache(cls):
+        """ Forget all versions cached in memory; version cache file is not modified. """
+        with cls.__lock:
+            cls.__version_dict.clear()
+
+
+#############################################################################
+# Testing.
+if __name__ == '__main__':
+    sge_root = os.environ['SGE_ROOT']
+    sge_cell = os.environ.get('SGE_CELL', 'default')
+    print(UgeVersionCache.get_key(sge_root, sge_cell, 'qconf'))
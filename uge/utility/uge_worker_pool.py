@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+#
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2016-2024 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+#
+import atexit
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import weakref
+
+from uge.log.log_manager import LogManager
+from uge.exceptions.command_failed import CommandFailed
+from uge.exceptions.qconf_exception import QconfException
+
+
+# Pools that have not been closed yet; they are closed at interpreter exit,
+# without keeping them alive until then
+_open_pools = weakref.WeakSet()
+
+
+def _close_open_pools():
+    for pool in list(_open_pools):
+        pool.close()
+
+
+atexit.register(_close_open_pools)
+
+
+class UgeShellWorker(object):
+    """
+    Long-lived shell process that executes commands sent over its stdin.
+
+    Each command runs in a subshell, with its stdout and stderr redirected
+    into worker-private files; the exit status is reported back on the
+    worker's stdout, framed by a token unique to this worker.
+    """
+
+    def __init__(self, env=None, init_command=None, shell='/bin/sh'):
+        # Imported here, as workers are not used by most scripts
+        import uuid
+        self.logger = LogManager.get_instance().get_logger(self.__class__.__name__)
+        self.token = '__UGE_WORKER_%s__' % uuid.uuid4().hex
+        self.tmp_dir = tempfile.mkdtemp(prefix='uge_worker_')
+        self.stdout_file = os.path.join(self.tmp_dir, 'stdout')
+        self.stderr_file = os.path.join(self.tmp_dir, 'stderr')
+        self.devnull = open(os.devnull, 'w')
+        self.process = subprocess.Popen([shell], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        stderr=self.devnull, close_fds=True, env=env)
+        self.alive = True
+        if init_command:
+            # Initialization command must run in the worker shell itself,
+            # so that any environment changes are kept for later commands.
+            exit_status = self.__send('%s >/dev/null 2>&1' % init_command)
+            if exit_status != 0:
+                self.close()
+                raise QconfException('Worker initialization command failed with exit status %s: %s' % (
+                    exit_status, init_command))
+
+    @classmethod
+    def quote(cls, command):
+        return "'%s'" % command.replace("'", "'\\''")
+
+    def __send(self, script):
+        try:
+            self.process.stdin.write(('%s\nprintf \'%%s %%d\\n\' %s $?\n' % (script, self.token)).encode())
+            self.process.stdin.flush()
+            while True:
+                line = self.process.stdout.readline()
+                if not line:
+                    raise QconfException('Worker shell (pid %s) exited unexpectedly.' % self.process.pid)
+                line = line.decode()
+                if line.startswith(self.token):
+                    return int(line.split()[-1])
+        except (IOError, OSError, ValueError) as ex:
+            self.alive = False
+            raise QconfException(exception=ex)
+        except QconfException:
+            self.alive = False
+            raise
+
+    def execute(self, command):
+        """
+        Execute command in the worker shell.
+
+        :returns: Tuple (stdout, stderr, exit_status), with stdout/stderr as bytes.
+        """
+        exit_status = self.__send('( eval %s ) >%s 2>%s </dev/null' % (
+            self.quote(command), self.quote(self.stdout_file), self.quote(self.stderr_file)))
+        with open(self.stdout_file, 'rb') as f:
+            stdout = f.read()
+        with open(self.stderr_file, 'rb') as f:
+            stderr = f.read()
+        return stdout, stderr, exit_status
+
+    def is_alive(self):
+        return self.alive and self.process.poll() is None
+
+    def close(self):
+        self.alive = False
+        try:
+            if self.process.poll() is None:
+                self.process.stdin.close()
+                self.process.wait()
+        except (IOError, OSError):
+            pass
+        self.process.stdout.close()
+        self.devnull.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+
+class UgeWorkerProcess(object):
+    """
+    Command executed by a worker pool. Provides the same result interface
+    as UgeSubprocess, so that executors can use either of them.
+    """
+
+    def __init__(self, args, worker_pool, use_exceptions=True):
+        self.logger = LogManager.get_instance().get_logger(self.__class__.__name__)
+        self.stdout_ = None
+        self.stderr_ = None
+        self.returncode = None
+        self.args_ = args
+        self.worker_pool = worker_pool
+        self.use_exceptions = use_exceptions
+
+    def run(self, input=None):
+        self.logger.debug('Invoking via worker pool: [%s]' % self.args_)
+        (self.stdout_, self.stderr_, self.returncode) = self.worker_pool.execute(self.args_)
+        self.logger.debug('Exit status: %s' % self.returncode)
+        if self.returncode != 0 and self.use_exceptions:
+            self.logger.debug('StdOut: %s' % self.stdout_.decode())
+            self.logger.debug('StdErr: %s' % self.stderr_.decode())
+            raise CommandFailed(self.stderr_.decode(), self.stdout_.decode(), self.stderr_.decode(), self.returncode)
+        return self.stdout_.decode(), self.stderr_.decode()
+
+    def get_logger(self):
+        return self.logger
+
+    def get_args(self):
+        return self.args_
+
+    def get_stdout(self):
+        return self.stdout_.decode()
+
+    def get_stderr(self):
+        return self.stderr_.decode()
+
+    def get_exit_status(self):
+        return self.returncode
+
+
+class UgeWorkerPool(object):
+    """
+    Bounded pool of UgeShellWorker processes. Workers are started on demand,
+    up to the pool size, and are reused for subsequent commands. The pool
+    can be safely shared between threads.
+
+    Usage:
+        pool = UgeWorkerPool(4, env=env_dict, init_command='. /opt/uge/default/common/settings.sh')
+        p = pool.create_process('qconf -sql')
+        p.run()
+        print(p.get_stdout())
+        pool.close()
+    """
+
+    DEFAULT_SIZE = 4
+
+    def __init__(self, size=DEFAULT_SIZE, env=None, init_command=None):
+        self.logger = LogManager.get_instance().get_logger(self.__class__.__name__)
+        if size < 1:
+            raise QconfException('Worker pool size must be a positive number.')
+        self.size = size
+        self.env = env
+        self.init_command = init_command
+        self.condition = threading.Condition()
+        self.idle_workers = []
+        self.n_workers = 0
+        self.closed = False
+        _open_pools.add(self)
+
+    def __acquire(self):
+        with self.condition:
+            while True:
+                if self.closed:
+                    raise QconfException('Worker pool is closed.')
+                if self.idle_workers:
+                    return self.idle_workers.pop()
+                if self.n_workers < self.size:
+                    self.n_workers += 1
+                    break
+                self.condition.wait()
+        try:
+            self.logger.debug('Starting worker %s of %s' % (self.n_workers, self.size))
+            return UgeShellWorker(env=self.env, init_command=self.init_command)
+        except Exception:
+            with self.condition:
+                self.n_workers -= 1
+                self.condition.notify()
+            raise
+
+    def __release(self, worker):
+        with self.condition:
+            if worker.is_alive() and not self.closed:
+                self.idle_workers.append(worker)
+                worker = None
+            else:
+                self.n_workers -= 1
+            self.condition.notify()
+        if worker is not None:
+            worker.close()
+
+    def execute(self, command):
+        """
+        Execute command using one of the pool workers.
+
+        :returns: Tuple (stdout, stderr, exit_status), with stdout/stderr as bytes.
+        """
+        worker = self.__acquire()
+        try:
+            return worker.execute(command)
+        finally:
+            self.__release(worker)
+
+    def create_process(self, command, use_exceptions=True):
+        return UgeWorkerProcess(command, self, use_exceptions=use_exceptions)
+
+    def close(self):
+        """ Terminate all idle workers; busy workers are terminated when released. """
+        with self.condition:
+            self.closed = True
+            _open_pools.discard(self)
+            workers = self.idle_workers
+            self.idle_workers = []
+            self.n_workers -= len(workers)
+            self.condition.notify_all()
+        for worker in workers:
+            worker.close()
+
+
+#############################################################################
+# Testing.
+if __name__ == '__main__':
+    pool = UgeWorkerPool(2)
+    p = pool.create_process('ls -l', use_exceptions=False)
+    p.run()
+    print(p.get_stdout())
+    print(p.get_stderr())
+    print(p.get_exit_status())
+    pool.close()